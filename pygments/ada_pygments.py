@@ -4,7 +4,7 @@
 """Alternate Ada and Project Files parsers for Sphinx/Rest."""
 
 import re
-from pygments.lexer import RegexLexer, bygroups
+from pygments.lexer import RegexLexer, ExtendedRegexLexer, bygroups
 from pygments.token import (
     Text,
     Comment,
@@ -16,8 +16,200 @@ from pygments.token import (
     Punctuation,
 )
 
+# Ada standard attributes, GNAT specific ones and SPARK ones ('Update,
+# 'Loop_Entry, 'Initialized). Attributes are matched as a prefix of the
+# word following the tick and the first one in this list wins (reversed
+# order to avoid having for example Max before
+# Max_Alignment_For_Allocation).
+ATTRIBUTES = (
+    "Write", "Word_Size", "Width", "Wide_Width", "Wide_Wide_Width",
+    "Wide_Wide_Value", "Wide_Wide_Image", "Wide_Value", "Wide_Image",
+    "Wchar_T_Size", "Version", "Variable_Indexing", "Value_Size", "Value",
+    "Valid_Value", "Valid_Scalars", "VADS_Size", "Valid", "Val", "Update",
+    "Unrestricted_Access", "Universal_Literal_String", "Unconstrained_Array",
+    "Unchecked_Access", "Unbiased_Rounding", "UET_Address", "TypeCode",
+    "Truncation", "Type_Key", "Type_Class", "To_Any", "To_Address", "Tick",
+    "Terminated", "Target_Name", "Tag", "System_Allocator_Alignment", "Succ",
+    "Super", "Stub_Type", "Stream_Size", "Storage_Unit", "Storage_Size",
+    "Storage_Pool", "Small_Numerator", "Small_Denominator", "Small", "Size",
+    "Simple_Storage_Pool", "Signed_Zeros", "Scaling", "Scale",
+    "Scalar_Storage_Order", "Safe_Small", "Safe_Last", "Safe_Large",
+    "Safe_First", "Safe_Emax", "Rounding", "Round", "Result",
+    "Restriction_Set", "Remainder", "Ref", "Reduce", "Read", "Range_Length",
+    "Range", "Put_Image", "Priority", "Pred", "Preelaborable_Initialization",
+    "Position", "Pos", "Pool_Address", "Passed_By_Reference", "Partition_Id",
+    "Overlaps_Storage", "Output", "Old", "Object_Size", "Null_Parameter",
+    "Modulus", "Model_Small", "Model_Mantissa", "Model_Epsilon", "Model_Emin",
+    "Model", "Mod", "Min", "Mechanism_Code", "Maximum_Alignment",
+    "Max_Size_In_Storage_Elements", "Max_Priority", "Max_Interrupt_Priority",
+    "Max_Integer_Size", "Max_Alignment_For_Allocation", "Max", "Mantissa",
+    "Machine_Size", "Machine_Rounds", "Machine_Rounding", "Machine_Radix",
+    "Machine_Overflows", "Machine_Mantissa", "Machine_Emin", "Machine_Emax",
+    "Machine", "Loop_Entry", "Library_Level", "Length", "Leading_Part",
+    "Last_Valid", "Last_Bit", "Last", "Large", "Iterator_Element", "Iterable",
+    "Invalid_Value", "Integer_Value", "Input", "Initialized",
+    "Implicit_Dereference", "Img", "Image", "Identity", "Has_Tagged_Values",
+    "Has_Same_Storage", "Has_Discriminants", "Has_Access_Values", "From_Any",
+    "Fraction", "Fore", "Floor", "Fixed_Value", "First_Valid", "First_Bit",
+    "First", "Finalization_Size", "Fast_Math", "External_Tag", "Exponent",
+    "Epsilon", "Enum_Val", "Enum_Rep", "Enabled", "Emax", "Elaborated",
+    "Elab_Subp_Body", "Elab_Spec", "Elab_Body", "Digits", "Descriptor_Size",
+    "Deref", "Denorm", "Delta", "Definite", "Default_Scalar_Storage_Order",
+    "Default_Iterator", "Default_Bit_Order", "Count", "Copy_Sign",
+    "Constrained", "Constant_Indexing", "Compose", "Component_Size",
+    "Compiler_Version", "Code_Address", "Class", "Ceiling", "Caller",
+    "Callable", "Body_Version", "Bit_Order", "Bit_Position", "Bit", "Base",
+    "Atomic_Always_Lock_Free", "Asm_Output", "Asm_Input", "Alignment", "Aft",
+    "Adjacent", "Address_Size", "Address", "Access", "Abort_Signal",
+    "AST_Entry",
+)
+
+# All Ada reserved words
+RESERVED_WORDS = (
+    "abort", "abstract", "abs", "accept", "access", "aliased", "all", "and",
+    "array", "at", "begin", "body", "case", "constant", "declare", "delay",
+    "delta", "digits", "do", "else", "elsif", "end", "entry", "exception",
+    "exit", "for", "function", "generic", "goto", "if", "interface", "in",
+    "is", "limited", "loop", "mod", "new", "not", "null", "of", "or",
+    "others", "out", "overriding", "package", "pragma", "private",
+    "procedure", "protected", "raise", "range", "record", "rem", "renames",
+    "requeue", "return", "reverse", "select", "separate", "some", "subtype",
+    "synchronized", "tagged", "task", "terminate", "then", "type", "until",
+    "use", "when", "while", "with", "xor",
+)
+
+# Additional reserved words of project files
+PROJECT_RESERVED_WORDS = (
+    "aggregate", "extends", "external", "external_as_list", "library",
+    "project",
+)
+
+# Words that can start a declaration
+DECLARATION_WORDS = frozenset(("end", "function", "package", "procedure", "project"))
+
+# The flags of the lexers below, needed to compile the fallback rules
+FLAGS = re.MULTILINE | re.I  # Ignore case
 
-def get_lexer_tokens(tag_highlighting=False, project_support=False):
+
+def attribute_callback(pattern):
+    """Return a callback classifying the word following a tick.
+
+    This is equivalent to the alternation of all ATTRIBUTES followed by
+    the one character operator rule, but looks up the prefixes of the
+    word in a table instead of trying each attribute in turn.
+
+    :param pattern: the alternation, used for words that are not ASCII
+    :type pattern: str
+
+    :return: a callback for ExtendedRegexLexer
+    :rtype: function
+    """
+    fallback = re.compile(pattern, FLAGS)
+    index = {}
+    for position, name in enumerate(ATTRIBUTES):
+        index.setdefault(name.lower(), position)
+    longest = max(len(name) for name in index)
+
+    def callback(lexer, match, ctx):
+        start = match.start()
+        word = match.group(1)
+        length = None
+        if word.isascii():
+            word = word[:longest].lower()
+            best = len(ATTRIBUTES)
+            for end in range(1, len(word) + 1):
+                position = index.get(word[:end], best)
+                if position < best:
+                    best, length = position, end
+        else:
+            # Case folding of other letters follows rules of its own,
+            # leave these to the regular expression.
+            attribute = fallback.match(ctx.text, start)
+            if attribute:
+                length = len(attribute.group(1))
+
+        if length is None:
+            ctx.pos = start + 1
+            yield start, Operator, "'"
+        else:
+            ctx.pos = start + 1 + length
+            yield start, Name.Attribute, ctx.text[start : ctx.pos]
+
+    return callback
+
+
+def word_callback(reserved_words, declarations, rules):
+    """Return a callback classifying a word.
+
+    This is equivalent to trying the declarations, reserved words,
+    builtin values and identifiers rules in turn, but looks up the word
+    in a table instead of trying each reserved word in turn.
+
+    :param reserved_words: the reserved words
+    :type reserved_words: tuple
+    :param declarations: the (pattern, action) rules for declarations,
+        only tried for words that can start one
+    :type declarations: list
+    :param rules: the (pattern, action) rules replaced, used for words
+        that are not ASCII
+    :type rules: list
+
+    :return: a callback for ExtendedRegexLexer
+    :rtype: function
+    """
+    reserved = frozenset(reserved_words)
+    declarations = [
+        (re.compile(pattern, FLAGS), action) for pattern, action in declarations
+    ]
+    fallback = [(re.compile(pattern, FLAGS), action) for pattern, action in rules]
+    separator = re.compile(r"[\s;,]")
+    identifier = re.compile(r"[\w\.]+")
+
+    def apply(lexer, ctx, start, rules):
+        for regex, action in rules:
+            m = regex.match(ctx.text, start)
+            if m:
+                if callable(action):
+                    yield from action(lexer, m, ctx)
+                else:
+                    ctx.pos = m.end()
+                    yield start, action, m.group()
+                return
+
+    def callback(lexer, match, ctx):
+        start = match.start()
+        word = match.group()
+        if not word.isascii():
+            # Case folding of other letters follows rules of its own,
+            # leave these to the regular expressions.
+            yield from apply(lexer, ctx, start, fallback)
+            return
+
+        lowered = word.lower()
+        if lowered in DECLARATION_WORDS:
+            yield from apply(lexer, ctx, start, declarations)
+            if ctx.pos != start:
+                return
+
+        end = match.end()
+        if lowered in reserved and separator.match(ctx.text, end):
+            ctx.pos = end + 1
+            yield start, Keyword.Reserved, word
+            yield end, Punctuation, ctx.text[end]
+        elif lowered.startswith("false") or lowered.startswith("true"):
+            length = 5 if lowered[0] == "f" else 4
+            ctx.pos = start + length
+            yield start, Keyword.Constant, word[:length]
+        else:
+            ctx.pos = identifier.match(ctx.text, start).end()
+            yield start, Name, ctx.text[start : ctx.pos]
+
+    return callback
+
+
+def get_lexer_tokens(
+    tag_highlighting=False, project_support=False, keyword_tables=False
+):
     """Return the tokens needed for RegexLexer.
 
     :param tag_highlighting: if True we support tag highlighting. See
@@ -26,133 +218,122 @@ def get_lexer_tokens(tag_highlighting=False, project_support=False):
     :param project_support: if True support additional keywords associated
         with project files.
     :type project_support:  bool
+    :param keyword_tables: if True classify attributes and words through
+        tables instead of alternations. The token stream is the same but
+        the tokens are for ExtendedRegexLexer.
+    :type keyword_tables: bool
 
     :return: a dictionary following the structure required by RegexLexer
     :rtype: dict
     """
     if project_support:
         project_pattern = r"project\s+|"
-        project_pattern2 = (
-            r"aggregate|extends|external|external_as_list|library|project|"
-        )
+        reserved_words = RESERVED_WORDS + PROJECT_RESERVED_WORDS
     else:
         project_pattern = r""
-        project_pattern2 = r""
-
-    result = {
-        "root": [
-            # Comments
-            (r"--.*$", Comment),
-            # Character literal
-            (r"'.'", String.Char),
-            # Strings
-            (r'"[^"]*"', String),
-            # Numeric
-            # Based literal
-            (r"[0-9][0-9_]*#[0-9a-f][0-9a-f_]*#(E[\+-]?[0-9][0-9_]*)?", Number.Integer),
-            (
-                r"[0-9][0-9_]*#[0-9a-f][0-9a-f_]*"
-                r"\.[0-9a-f][0-9a-f_]*#(E[\+-]?[0-9][0-9_]*)?",
-                Number.Float,
-            ),
-            # Decimal literal
-            (r"[0-9][0-9_]*\.[0-9][0-9_](E[\+-]?[0-9][0-9_]*)?", Number.Float),
-            (r"[0-9][0-9_]*(E[\+-]?[0-9][0-9_]*)?", Number.Integer),
-            # Match use and with statements
-            # The first part of the pattern is be sure we don't match
-            # for/use constructs.
-            (
-                r"(\n\s*|;\s*)(with|use)(\s+[\w\.]+\s*;)",
-                bygroups(Punctuation, Keyword.Reserved, Name.Namespace),
-            ),
-            # Match procedure, package and function declarations
-            (r"end\s+(if|loop|record)", Keyword),
-            (
-                r"(package(?:\s+body)?\s+|"
-                + project_pattern
-                + r"function\s+|end\s+|procedure\s+)([\w\.]+)",
-                bygroups(Keyword, Name.Function),
-            ),
-            # Ada standard attributes, GNAT specific ones and
-            # SPARK ones ('Update, 'Loop_Entry, 'Initialized)
-            # (reversed order to avoid having for
-            #  example Max before Max_Alignment_For_Allocation).
+        reserved_words = RESERVED_WORDS
+
+    comments = [
+        # Comments
+        (r"--.*$", Comment),
+    ]
+    literals = [
+        # Character literal
+        (r"'.'", String.Char),
+        # Strings
+        (r'"[^"]*"', String),
+        # Numeric
+        # Based literal
+        (r"[0-9][0-9_]*#[0-9a-f][0-9a-f_]*#(E[\+-]?[0-9][0-9_]*)?", Number.Integer),
+        (
+            r"[0-9][0-9_]*#[0-9a-f][0-9a-f_]*"
+            r"\.[0-9a-f][0-9a-f_]*#(E[\+-]?[0-9][0-9_]*)?",
+            Number.Float,
+        ),
+        # Decimal literal
+        (r"[0-9][0-9_]*\.[0-9][0-9_](E[\+-]?[0-9][0-9_]*)?", Number.Float),
+        (r"[0-9][0-9_]*(E[\+-]?[0-9][0-9_]*)?", Number.Integer),
+    ]
+    with_use = [
+        # Match use and with statements
+        # The first part of the pattern is be sure we don't match
+        # for/use constructs.
+        (
+            r"(\n\s*|;\s*)(with|use)(\s+[\w\.]+\s*;)",
+            bygroups(Punctuation, Keyword.Reserved, Name.Namespace),
+        ),
+    ]
+    declarations = [
+        # Match procedure, package and function declarations
+        (r"end\s+(if|loop|record)", Keyword),
+        (
+            r"(package(?:\s+body)?\s+|"
+            + project_pattern
+            + r"function\s+|end\s+|procedure\s+)([\w\.]+)",
+            bygroups(Keyword, Name.Function),
+        ),
+    ]
+    attributes = [
+        # Ada standard attributes, GNAT specific ones and
+        # SPARK ones
+        (r"\'(" + "|".join(ATTRIBUTES) + r")", Name.Attribute),
+    ]
+    reserved = [
+        # All Ada reserved words
+        (
+            r"(" + "|".join(reserved_words) + r")([\s;,])",
+            bygroups(Keyword.Reserved, Punctuation),
+        ),
+    ]
+    operators = [
+        # Two characters operators
+        (r"=>|\.\.|\*\*|:=|/=|>=|<=|<<|>>|<>", Operator),
+        # One character operators
+        (r"&|\'|\(|\)|\*|\+|-|\.|/|:|<|=|>|\|", Operator),
+        (r",|;", Punctuation),
+    ]
+    spaces = [
+        # Spaces
+        (r"\s+", Text),
+    ]
+    names = [
+        # Builtin values
+        (r"False|True", Keyword.Constant),
+        # Identifiers
+        (r"[\w\.]+", Name),
+    ]
+
+    if keyword_tables:
+        # Only the declarations, reserved words and names rules can
+        # match at the start of a word, so a single rule classifying
+        # words comes first. Likewise spaces can only be the start of a
+        # use or with statement.
+        words = [
             (
-                r"\'(Write|Word_Size|Width|Wide_Width|Wide_Wide_Width|"
-                r"Wide_Wide_Value|Wide_Wide_Image|Wide_Value|Wide_Image|"
-                r"Word_Size|Wchar_T_Size|Version|Variable_Indexing|Value_Size|"
-                r"Value|Valid_Value|Valid_Scalars|VADS_Size|Valid|Val|"
-                r"Update|Unrestricted_Access|Universal_Literal_String|"
-                r"Unconstrained_Array|Unchecked_Access|Unbiased_Rounding|"
-                r"UET_Address|TypeCode|Truncation|Type_Key|Type_Class|To_Any|"
-                r"To_Address|Tick|Terminated|Target_Name|Tag|"
-                r"System_Allocator_Alignment|Succ|Super|"
-                r"Stub_Type|Stream_Size|Storage_Unit|Storage_Size|Storage_Pool|"
-                r"Small_Numerator|Small_Denominator|Small|Size|"
-                r"Simple_Storage_Pool|Signed_Zeros|Scaling|Scale|"
-                r"Scalar_Storage_Order|Safe_Small|Safe_Last|Safe_Large|"
-                r"Safe_First|Safe_Emax|Rounding|Round|Result|Restriction_Set|"
-                r"Remainder|Ref|Reduce|Read|Range_Length|Range|"
-                r"Put_Image|Priority|Pred|Preelaborable_Initialization|"
-                r"Position|Pos|Pool_Address|Passed_By_Reference|Partition_Id|"
-                r"Overlaps_Storage|Output|Old|Object_Size|Null_Parameter|Modulus|"
-                r"Model_Small|Model_Mantissa|Model_Epsilon|Model_Emin|Model|Mod|"
-                r"Min|Mechanism_Code|Maximum_Alignment|"
-                r"Max_Size_In_Storage_Elements|Max_Priority|"
-                r"Max_Interrupt_Priority|"
-                r"Max_Integer_Size|Max_Alignment_For_Allocation|"
-                r"Max|Mantissa|Machine_Size|Machine_Rounds|Machine_Rounding|"
-                r"Machine_Radix|Machine_Overflows|Machine_Mantissa|Machine_Emin|"
-                r"Machine_Emax|Machine|Loop_Entry|Library_Level|Length|"
-                r"Leading_Part|Last_Valid|Last_Bit|"
-                r"Last|Large|Iterator_Element|Iterable|Invalid_Value|"
-                r"Integer_Value|Input|Initialized|Implicit_Dereference|Img|Image|"
-                r"Identity|Has_Tagged_Values|Has_Same_Storage|Has_Discriminants|"
-                r"Has_Access_Values|From_Any|Fraction|Fore|Floor|Fixed_Value|"
-                r"First_Valid|"
-                r"First_Bit|First|Finalization_Size|Fast_Math|External_Tag|"
-                r"Exponent|Epsilon|Enum_Val|"
-                r"Enum_Rep|Enabled|Emax|Elaborated|Elab_Subp_Body|Elab_Spec|"
-                r"Elab_Body|Digits|Descriptor_Size|Digits|Deref|Denorm|Delta|"
-                r"Definite|Default_Scalar_Storage_Order|Default_Iterator|"
-                r"Default_Bit_Order|Count|Copy_Sign|Constrained|"
-                r"Constant_Indexing|"
-                r"Compose|Component_Size|Compiler_Version|Code_Address|Class|"
-                r"Ceiling|Caller|Callable|Body_Version|Bit_Order|Bit_Position|"
-                r"Bit|Base|Atomic_Always_Lock_Free|"
-                r"Asm_Output|Asm_Input|Alignment|Aft|Adjacent|"
-                r"Address_Size|Address|Access|Abort_Signal|AST_Entry)",
-                Name.Attribute,
+                r"(?![0-9])\w+",
+                word_callback(
+                    reserved_words, declarations, declarations + reserved + names
+                ),
             ),
-            # All Ada reserved words
-            (
-                r"(abort|abstract|abs|accept|access|aliased|all|and|array|at|"
-                r"begin|body|case|constant|declare|delay|delta|digits|do|"
-                r"else|elsif|end|entry|exception|exit|for|function|generic|goto|"
-                r"if|interface|in|is|limited|loop|mod|new|not|null|"
-                r"of|or|others|out|overriding|"
-                + project_pattern2
-                + r"package|pragma|private|procedure|protected|"
-                r"raise|range|record|rem|renames|requeue|return|reverse|"
-                r"select|separate|some|subtype|synchronized|"
-                r"tagged|task|terminate|then|type|until|use|when|while|with|xor"
-                r")([\s;,])",
-                bygroups(Keyword.Reserved, Punctuation),
-            ),
-            # Two characters operators
-            (r"=>|\.\.|\*\*|:=|/=|>=|<=|<<|>>|<>", Operator),
-            # One character operators
-            (r"&|\'|\(|\)|\*|\+|-|\.|/|:|<|=|>|\|", Operator),
-            (r",|;", Punctuation),
-            # Spaces
-            (r"\s+", Text),
-            # Builtin values
-            (r"False|True", Keyword.Constant),
-            # Identifiers
-            (r"[\w\.]+", Name),
-            (r".", Text),
         ]
-    }
+        attributes = [(r"\'(\w+)", attribute_callback(attributes[0][0]))]
+        rules = (
+            words + comments + literals + with_use + spaces + attributes + operators
+        )
+    else:
+        rules = (
+            comments
+            + literals
+            + with_use
+            + declarations
+            + attributes
+            + reserved
+            + operators
+            + spaces
+            + names
+        )
+
+    result = {"root": rules + [(r".", Text)]}
 
     # Insert tag highlighting before identifiers
     if tag_highlighting:
@@ -161,7 +342,7 @@ def get_lexer_tokens(tag_highlighting=False, project_support=False):
     return result
 
 
-class AdaLexer(RegexLexer):
+class AdaLexer(ExtendedRegexLexer):
     """Alternate Pygments lexer for Ada source code and project files.
 
     The default pygments lexer always fails causing disabling of syntax
@@ -184,9 +365,9 @@ class AdaLexer(RegexLexer):
     filenames = ["*.adb", "*.ads", "*.ada"]
     mimetypes = ["text/x-ada"]
 
-    flags = re.MULTILINE | re.I  # Ignore case
+    flags = FLAGS
 
-    tokens = get_lexer_tokens()
+    tokens = get_lexer_tokens(keyword_tables=True)
 
 
 class TaggedAdaLexer(AdaLexer):
@@ -202,10 +383,10 @@ class TaggedAdaLexer(AdaLexer):
 
     name = "TaggedAda"
     aliases = ["tagged_ada"]
-    tokens = get_lexer_tokens(True)
+    tokens = get_lexer_tokens(True, keyword_tables=True)
 
 
-class GNATProjectLexer(RegexLexer):
+class GNATProjectLexer(ExtendedRegexLexer):
     """Pygment lexer for project files.
 
     This is the same as the AdaLexer but with support of ``project``
@@ -217,6 +398,6 @@ class GNATProjectLexer(RegexLexer):
     filenames = ["*.gpr"]
     mimetypes = ["text/x-gpr"]
 
-    flags = re.MULTILINE | re.I  # Ignore case
+    flags = FLAGS
 
-    tokens = get_lexer_tokens(project_support=True)
+    tokens = get_lexer_tokens(project_support=True, keyword_tables=True)
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+#
+# Ada/SPARK ISO 26262 Process Tools
+# Copyright (C) 2026 NVIDIA CORPORATION & AFFILIATES
+#
+# This file is part of the NVIDIA SPARK ISO 26262 Process.
+#
+# The NVIDIA SPARK ISO 26262 Process Tools are free software: you can
+# redistribute them and/or modify them under the terms of the GNU
+# General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later
+# version.
+#
+# The NVIDIA SPARK ISO 26262 Process Tools are distributed in the hope
+# that they will be useful, but WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with the NVIDIA SPARK ISO 26262 Process Tools. If not, see
+# <https://www.gnu.org/licenses/>.
+
+
+
+# Check that the lexers of ada_pygments, which classify words through
+# keyword tables, produce exactly the same tokens as reference lexers
+# built from the plain regular expressions (get_lexer_tokens without
+# keyword_tables). The inputs are the code blocks of the documentation
+# and random snippets of Ada-like text.
+
+import os
+import sys
+import random
+import argparse
+import itertools
+
+from pygments.lexer import RegexLexer
+
+import ada_pygments
+
+TOP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The lexers to check, and the language of their code blocks
+LEXERS = (
+    ("AdaLexer",         "ada"),
+    ("TaggedAdaLexer",   "ada"),
+    ("GNATProjectLexer", "gpr"),
+)
+
+# What the random snippets are made of
+FRAGMENTS = (
+    ada_pygments.RESERVED_WORDS +
+    ada_pygments.PROJECT_RESERVED_WORDS +
+    tuple("'" + attribute for attribute in ada_pygments.ATTRIBUTES) +
+    ("X", "Foo_Bar", "Ends", "Packaged", "Record_1", "Ada.Text_IO",
+     "Interfaces.C", "Typed", "loop_2", "Is_Valid", "x'Old",
+     "0", "42", "1_000", "3.14", "1.5E-3", "16#FF#", "2#1010#", "8#777#E2",
+     '"text"', '""', '"with ""quotes"""', '"--"', "'a'", "'''", "' '",
+     "T'(1)", "A'Range", "B'First (2)",
+     "-- comment", "--  with Ada;", "[TAG]", "[two words]",
+     "<<Label>>", "=>", ":=", "..", "**", "/=", "<=", ">=", "<>", "&",
+     "(", ")", ";", ",", ".", "|", "+", "-", "*", "/", "@",
+     "#", "$", "%", "?", "~", "\\", "{", "}"))
+SEPARATORS = ("", " ", " ", " ", "  ", "\n", "\n   ", "\t")
+
+
+def mk_lexer(lexer_name, reference):
+    # The lexer of ada_pygments, or its reference lexer using the
+    # alternations instead of the keyword tables
+    lexer = getattr(ada_pygments, lexer_name)
+    if not reference:
+        return lexer()
+    return type("Reference" + lexer_name,
+                (RegexLexer,),
+                {"name"   : lexer.name,
+                 "flags"  : lexer.flags,
+                 "tokens" : ada_pygments.get_lexer_tokens(
+                     tag_highlighting = lexer_name == "TaggedAdaLexer",
+                     project_support  = lexer_name == "GNATProjectLexer")})()
+
+
+def code_blocks(language):
+    # The code blocks of the documentation in the given language
+    blocks = []
+    for path, _, files in os.walk(os.path.join(TOP_DIR, "source")):
+        for file_name in sorted(files):
+            if not file_name.endswith(".rst"):
+                continue
+            with open(os.path.join(path, file_name),
+                      "r",
+                      encoding="UTF-8") as fd:
+                lines = fd.read().splitlines()
+            for n, line in enumerate(lines):
+                if line.strip() != ".. code-block:: %s" % language:
+                    continue
+                indent = len(line) - len(line.lstrip()) + 1
+                block  = []
+                for line in lines[n + 1:]:
+                    if line.strip() and not line[:indent].isspace():
+                        break
+                    block.append(line[indent:])
+                blocks.append("\n".join(block).strip("\n") + "\n")
+    return blocks
+
+
+def snippet(rng):
+    # Some random fragments, in random case, with or without space
+    # between them
+    parts = []
+    for _ in range(rng.randint(1, 40)):
+        fragment = rng.choice(FRAGMENTS)
+        case     = rng.random()
+        if case < 0.2:
+            fragment = fragment.upper()
+        elif case < 0.3:
+            fragment = fragment.swapcase()
+        parts.append(fragment)
+        parts.append(rng.choice(SEPARATORS))
+    return "".join(parts)
+
+
+def compare(lexer_name, inputs):
+    # The first difference between the lexer and its reference lexer
+    # on the inputs, as (input, actual, expected), or None
+    lexer     = mk_lexer(lexer_name, False)
+    reference = mk_lexer(lexer_name, True)
+    for content in inputs:
+        for actual, expected in itertools.zip_longest(
+                lexer.get_tokens(content),
+                reference.get_tokens(content)):
+            if actual != expected:
+                return content, actual, expected
+    return None
+
+
+def main():
+    ap = argparse.ArgumentParser(
+        description=("check that the Ada lexers produce the same tokens as"
+                     " their reference lexers"))
+    ap.add_argument("--count",
+                    type=int,
+                    default=2000,
+                    help="number of random snippets (default: %(default)s)")
+    ap.add_argument("--seed",
+                    type=int,
+                    default=42)
+    options = ap.parse_args()
+
+    ok = True
+    for lexer_name, language in LEXERS:
+        rng    = random.Random("%s %u" % (lexer_name, options.seed))
+        inputs = itertools.chain(code_blocks(language),
+                                 (snippet(rng)
+                                  for _ in range(options.count)))
+        mismatch = compare(lexer_name, inputs)
+        if mismatch is None:
+            print("%s: ok" % lexer_name)
+        else:
+            content, actual, expected = mismatch
+            print("%s: got %s, expected %s, on:\n%s" % (lexer_name,
+                                                        actual,
+                                                        expected,
+                                                        content))
+            ok = False
+
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
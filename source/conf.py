@@ -17,9 +17,20 @@ sys.path.insert(
 )
 import ada_pygments
 
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                 "..",
+                 "util"),
+)
+import profiling
+import highlight_cache
+
 def setup(app):
     app.add_lexer("ada", ada_pygments.AdaLexer)
     app.add_lexer("gpr", ada_pygments.GNATProjectLexer)
+    profiling.setup_sphinx(app)
+    highlight_cache.setup_sphinx(app, ("ada", "gpr"))
 
 
 project = 'SPARK Process'
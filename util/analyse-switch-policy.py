@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+#
+# Ada/SPARK ISO 26262 Process Tools
+# Copyright (C) 2026 NVIDIA CORPORATION & AFFILIATES
+#
+# This file is part of the NVIDIA SPARK ISO 26262 Process.
+#
+# The NVIDIA SPARK ISO 26262 Process Tools are free software: you can
+# redistribute them and/or modify them under the terms of the GNU
+# General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later
+# version.
+#
+# The NVIDIA SPARK ISO 26262 Process Tools are distributed in the hope
+# that they will be useful, but WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with the NVIDIA SPARK ISO 26262 Process Tools. If not, see
+# <https://www.gnu.org/licenses/>.
+
+
+
+# Find contradictions in the switch policy: the same switch listed
+# with different statuses (or twice with the same), Required switches
+# falling under a Banned prefix, and other patterns overlapping with a
+# more general pattern. Besides the switch tables themselves this can
+# read generated Switches TRLC files, so that merged extensions can be
+# checked as well.
+#
+# All patterns of a tool go into one trie, so each pattern is only
+# compared with the patterns ending at the same node and at the
+# nearest node above it, which is also the pattern check-switches.py
+# would apply.
+
+import os
+import re
+import sys
+import argparse
+
+import switches
+
+RECORD_START = re.compile(r"^(\w+)\s+(\w+)\s*\{")
+RECORD_FIELD = re.compile(r"^\s*(tool|status)\s*=\s*(?:\w+\.(\w+))?")
+FIELD_VALUE  = re.compile(r"^\s*\w+\.(\w+)")
+RECORD_RULE  = re.compile(r"^\s*rule\s*=\s*\"((?:[^\"\\]|\\.)*)\"")
+PATTERN      = re.compile(r"Pattern\.(Prefix|Verbatim)\s*:\s*"
+                          r"\"((?:[^\"\\]|\\.)*)\"")
+
+# The tool of the record types that do not say
+RECORD_TOOLS = {
+    "Compiler_Switch_Constraint" : "GNAT_Compiler",
+    "Rule_Constraint"            : "GNAT_Check",
+}
+
+# What we can analyse
+VALID = {
+    "tool"   : switches.TOOLS,
+    "status" : ("Required", "Allowed", "Banned"),
+}
+
+
+class Entry:
+    # One pattern of one constraint
+    def __init__(self, tool, status, is_switch, pattern, verbatim,
+                 location):
+        assert tool in switches.TOOLS
+        assert status in ("Required", "Allowed", "Banned")
+        assert isinstance(is_switch, bool)
+        assert isinstance(pattern, str)
+        assert isinstance(verbatim, bool)
+        assert isinstance(location, str)
+
+        self.tool      = tool
+        self.status    = status
+        self.is_switch = is_switch
+        self.pattern   = pattern
+        self.verbatim  = verbatim
+        self.location  = location
+
+    def describe(self):
+        if not self.is_switch:
+            kind = "rule"
+        elif self.verbatim:
+            kind = "verbatim"
+        else:
+            kind = "prefix"
+        return "%s %s %s %s" % (self.tool, self.status, kind, self.pattern)
+
+    def __str__(self):
+        return "%s (%s)" % (self.describe(), self.location)
+
+
+def csv_entries(directory):
+    entries = []
+    for constraint in switches.load_constraints(directory):
+        for pattern in constraint.patterns():
+            entries.append(Entry(constraint.tool,
+                                 constraint.status,
+                                 constraint.is_switch,
+                                 pattern,
+                                 not constraint.is_switch,
+                                 constraint.location()))
+    return entries
+
+
+def trlc_entries(file_name):
+    # The constraints of a TRLC file generated by convert-switches.py or
+    # convert_csv_switches.py, and whether all records were understood.
+    # We only need a few fields, so this reads them line by line
+    # instead of requiring the Switches schema.
+    entries = []
+    ok      = True
+    record  = None
+    field   = None
+    in_text = False
+    with open(file_name, "r", encoding="UTF-8") as fd:
+        for line_id, line in enumerate(fd, 1):
+            if line.count("'''") % 2 == 1:
+                in_text = not in_text
+                continue
+            if in_text or line.lstrip().startswith("//"):
+                continue
+
+            match = RECORD_START.match(line)
+            if match:
+                record = {
+                    "name"     : match.group(2),
+                    "where"    : "%s:%u" % (file_name, line_id),
+                    "location" : "%s:%u: %s" % (file_name,
+                                                line_id,
+                                                match.group(2)),
+                    "tool"     : RECORD_TOOLS.get(match.group(1)),
+                    "status"   : None,
+                    "rule"     : match.group(1) == "Rule_Constraint",
+                    "patterns" : [],
+                }
+                continue
+            if record is None:
+                continue
+
+            # The value of a field may be on the next line
+            if field is not None and line.strip():
+                match = FIELD_VALUE.match(line)
+                if match:
+                    record[field] = match.group(1)
+                field = None
+            match = RECORD_FIELD.match(line)
+            if match:
+                if match.group(2):
+                    record[match.group(1)] = match.group(2)
+                else:
+                    field = match.group(1)
+            match = RECORD_RULE.match(line)
+            if match:
+                record["patterns"].append((match.group(1), True))
+            for kind, pattern in PATTERN.findall(line):
+                record["patterns"].append((pattern, kind == "Verbatim"))
+
+            if line.startswith("}"):
+                for key in ("tool", "status"):
+                    if record[key] not in VALID[key]:
+                        print("%s: error: cannot determine the %s of"
+                              " record %s" % (record["where"],
+                                              key,
+                                              record["name"]))
+                        ok = False
+                        record["patterns"] = []
+                field = None
+                for pattern, verbatim in record["patterns"]:
+                    entries.append(Entry(record["tool"],
+                                         record["status"],
+                                         not record["rule"],
+                                         pattern,
+                                         verbatim,
+                                         record["location"]))
+                record = None
+    return entries, ok
+
+
+def analyse(entries):
+    # Returns a list of (severity, entry, message)
+    findings = []
+
+    tries = {tool: {} for tool in switches.TOOLS}
+    rules = {}
+    for entry in entries:
+        if entry.is_switch:
+            switches.insert(tries[entry.tool], entry.pattern, entry)
+        else:
+            rules.setdefault((entry.tool, entry.pattern.lower()),
+                             []).append(entry)
+
+    def compare_same(same):
+        # The first entry for each status stands for all others
+        first = {}
+        for entry in same:
+            if entry.status in first:
+                findings.append(("warning", entry,
+                                 "duplicate of %s" % first[entry.status]))
+            else:
+                for other in first.values():
+                    findings.append(("error", entry,
+                                     "conflicts with %s" % other))
+                first[entry.status] = entry
+
+    def compare_nested(entry, covering):
+        for other in covering:
+            if other.status == entry.status:
+                # Rows often list variants of a switch, such as -gnato
+                # and -gnaton, which is fine.
+                if other.location == entry.location:
+                    continue
+                findings.append(("warning", entry,
+                                 "redundant, covered by %s" % other))
+            elif entry.status == "Required" and other.status == "Banned":
+                findings.append(("error", entry,
+                                 "shadowed by %s" % other))
+            else:
+                findings.append(("note", entry,
+                                 "overrides %s" % other))
+
+    def walk(node, covering):
+        # covering are the prefix entries at the nearest node above
+        # that has any
+        here = node.get(None, [])
+        if here:
+            compare_same(here)
+            for entry in here:
+                compare_nested(entry, covering)
+            prefixes = [entry for entry in here if not entry.verbatim]
+            if prefixes:
+                covering = prefixes
+        for char, child in node.items():
+            if char is not None:
+                walk(child, covering)
+
+    sys.setrecursionlimit(max(sys.getrecursionlimit(),
+                              2 * max((len(entry.pattern)
+                                       for entry in entries),
+                                      default=0) + 100))
+    for tool in switches.TOOLS:
+        walk(tries[tool], [])
+    for same in rules.values():
+        compare_same(same)
+
+    return findings
+
+
+def main():
+    ap = argparse.ArgumentParser(
+        description="find contradictions in the switch policy")
+    ap.add_argument("trlc_files",
+                    nargs="*",
+                    metavar="FILENAME",
+                    help=("generated Switches TRLC files to analyse"
+                          " together with the switch tables"))
+    ap.add_argument("--switch-dir",
+                    default=switches.SWITCH_DIR,
+                    help=("directory with the switch tables (empty to"
+                          " only analyse the given TRLC files)"))
+    ap.add_argument("--notes",
+                    action="store_true",
+                    default=False,
+                    help="also list patterns overriding a general one")
+    ap.add_argument("--strict",
+                    action="store_true",
+                    default=False,
+                    help="fail on warnings as well as on errors")
+    options = ap.parse_args()
+
+    entries = []
+    ok      = True
+    if options.switch_dir:
+        entries += csv_entries(options.switch_dir)
+    for file_name in options.trlc_files:
+        file_entries, file_ok = trlc_entries(file_name)
+        entries += file_entries
+        ok      &= file_ok
+
+    failed = ("error", "warning") if options.strict else ("error",)
+    for severity, entry, message in analyse(entries):
+        if severity == "note" and not options.notes:
+            continue
+        print("%s: %s: %s %s" % (entry.location,
+                                 severity,
+                                 entry.describe(),
+                                 message))
+        if severity in failed:
+            ok = False
+
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
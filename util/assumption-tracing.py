@@ -26,10 +26,10 @@ import re
 import argparse
 import typing
 
-from trlc.trlc import Source_Manager
-from trlc.errors import Message_Handler
+from trlc.errors import Message_Handler, TRLC_Error
 
 import common
+import profiling
 
 def oxford_comma_and(strings):
     assert isinstance(strings, typing.Iterable)
@@ -52,21 +52,21 @@ def link_gp_assumption(gnatprove_assumption):
 
 
 def main():
+    profiling.profile_script()
+
     ap = argparse.ArgumentParser()
     ap.add_argument("--source-dir")
     options = ap.parse_args()
 
-    mh = Message_Handler()
-    sm = Source_Manager(mh)
-
-    sm.register_file(os.path.join(options.source_dir,
-                                  "steps.rsl"))
-    sm.register_file("spark-assumptions.rsl")
-    sm.register_file("spark-assumptions.trlc")
-    sm.register_file("tracing.rsl")
-    sm.register_file("tracing.trlc")
-
-    stab = sm.process()
+    mh   = Message_Handler()
+    stab = common.process_trlc_files(mh,
+                                     [os.path.join(options.source_dir,
+                                                   "steps.rsl"),
+                                      "spark-assumptions.rsl",
+                                      "spark-assumptions.trlc",
+                                      "tracing.rsl",
+                                      "tracing.trlc"],
+                                     verify=True)
 
     if stab is None:
         sys.exit(1)
@@ -75,70 +75,95 @@ def main():
     pkg_arg    = stab.lookup_assuming(mh, "Tracing")
     t_asm_kind = pkg_asm.symbols.lookup_assuming(mh, "Kind")
 
+    # Index everything once: kind -> assumptions, and assumption ->
+    # the arguments tracing it.
+    assumptions = {kind.name: []
+                   for kind in t_asm_kind.literals.values()}
+    arguments   = {}
+    for assumption in pkg_asm.symbols.iter_record_objects():
+        assumptions[assumption.field["kind"].value.name].append(
+            (assumption, assumption.to_python_dict()))
+        arguments[assumption.name] = []
+    for arg in pkg_arg.symbols.iter_record_objects():
+        arguments[arg.field["assumption"].target.name].append(
+            (arg, arg.to_python_dict()))
+
     ok = True
-    for assumption_kind in t_asm_kind.literals.values():
-        with open("tracing-%s.inc" % assumption_kind.name.lower(),
-                  "w",
-                  encoding="UTF-8") as fd:
-            for assumption in pkg_asm.symbols.iter_record_objects():
-                data = assumption.to_python_dict()
-                if assumption.field["kind"].value is not assumption_kind:
-                    continue
-
-                fd.write(".. _%s:\n\n" %
-                         assumption.name.lower().replace("_", "-"))
-                fd.write(assumption.name + "\n")
-                fd.write("^" * len(assumption.name) + "\n\n")
-                fd.write("Description:\n\n")
-                for line in data["text"].splitlines():
-                    line = re.sub(r"\[\[(.*?)\]\]",
-                                  lambda m: link_gp_assumption(m.group(1)),
-                                  line)
-                    fd.write("  %s" % line + "\n")
-
-                fd.write("\n\n")
-
-                found_tracing = False
-
-                for arg in pkg_arg.symbols.iter_record_objects():
-                    if arg.field["assumption"].target is not assumption:
-                        continue
-
-                    found_tracing = True
-                    t_data = arg.to_python_dict()
-
-                    if t_data["deferred_to"]:
-                        fd.write("See entries for: %s\n\n" %
-                                 oxford_comma_and(
-                                     link_gp_assumption(item)
-                                     for item in t_data["deferred_to"]))
-                    else:
-                        items = []
-                        if t_data["via_process_assumptions"]:
-                            items.append("(Process Assumptions)")
-                        if t_data["process"]:
-                            items += [common.fmt_step_link(item)
-                                      for item in t_data["process"]]
-
-                        if len(items) == 1:
-                            fd.write("Applicable process step: %s\n\n" %
-                                     items[0])
+    for kind in assumptions:
+        for assumption, _ in assumptions[kind]:
+            traces = arguments[assumption.name]
+            if not traces:
+                mh.warning(assumption.location,
+                           "not traced in process")
+                ok = False
+            for arg, _ in traces[1:]:
+                mh.warning(arg.location,
+                           "%s is traced more than once, previous trace"
+                           " is at %s" %
+                           (assumption.name,
+                            mh.cross_file_reference(traces[0][0].location)))
+                ok = False
+
+    for kind in assumptions:
+        rendered = True
+        try:
+            with common.open_output("tracing-%s.inc" % kind.lower()) as fd:
+                for assumption, data in assumptions[kind]:
+                    fd.write(".. _%s:\n\n" %
+                             assumption.name.lower().replace("_", "-"))
+                    fd.write(assumption.name + "\n")
+                    fd.write("^" * len(assumption.name) + "\n\n")
+                    fd.write("Description:\n\n")
+                    for line in data["text"].splitlines():
+                        line = re.sub(r"\[\[(.*?)\]\]",
+                                      lambda m: link_gp_assumption(m.group(1)),
+                                      line)
+                        fd.write("  %s" % line + "\n")
+
+                    fd.write("\n\n")
+
+                    for arg, t_data in arguments[assumption.name]:
+                        if t_data["deferred_to"]:
+                            fd.write("See entries for: %s\n\n" %
+                                     oxford_comma_and(
+                                         link_gp_assumption(item)
+                                         for item in t_data["deferred_to"]))
                         else:
-                            assert len(items) > 1
-                            fd.write("Applicable process steps:\n\n")
-                            for step in items:
-                                fd.write("  * %s\n" % step)
-                            fd.write("\n")
-
-                    if t_data["text"] is not None:
-                        fd.write(t_data["text"] + "\n\n")
-
-                if not found_tracing:
-                    mh.warning(assumption.location,
-                               "not traced in process")
-                    fd.write(".. warning::\n\n")
-                    fd.write("   Assumption not traced in process.\n\n")
-                    ok = False
+                            items = []
+                            if t_data["via_process_assumptions"]:
+                                items.append("(Process Assumptions)")
+                            if t_data["process"]:
+                                location = arg.field["process"].location
+                                try:
+                                    items += [common.fmt_step_link(mh,
+                                                                   location,
+                                                                   item)
+                                              for item in t_data["process"]]
+                                except TRLC_Error:
+                                    ok       = False
+                                    rendered = False
+                                    items   += t_data["process"]
+
+                            if len(items) == 1:
+                                fd.write("Applicable process step: %s\n\n" %
+                                         items[0])
+                            else:
+                                assert len(items) > 1
+                                fd.write("Applicable process steps:\n\n")
+                                for step in items:
+                                    fd.write("  * %s\n" % step)
+                                fd.write("\n")
+
+                        if t_data["text"] is not None:
+                            fd.write(t_data["text"] + "\n\n")
+
+                    if not arguments[assumption.name]:
+                        fd.write(".. warning::\n\n")
+                        fd.write("   Assumption not traced in process.\n\n")
+                if not rendered:
+                    raise common.Discard_Output()
+        except common.Discard_Output:
+            pass
 
     sys.exit(0 if ok else 1)
 
@@ -0,0 +1,647 @@
+#!/usr/bin/env python3
+#
+# Ada/SPARK ISO 26262 Process Tools
+# Copyright (C) 2026 NVIDIA CORPORATION & AFFILIATES
+#
+# This file is part of the NVIDIA SPARK ISO 26262 Process.
+#
+# The NVIDIA SPARK ISO 26262 Process Tools are free software: you can
+# redistribute them and/or modify them under the terms of the GNU
+# General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later
+# version.
+#
+# The NVIDIA SPARK ISO 26262 Process Tools are distributed in the hope
+# that they will be useful, but WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with the NVIDIA SPARK ISO 26262 Process Tools. If not, see
+# <https://www.gnu.org/licenses/>.
+
+
+# Benchmarks for the util generators and the Ada lexer, run on
+# synthetic inputs of configurable size. Results can be saved as a
+# baseline and later runs compared against it.
+
+import os
+import sys
+import glob
+import json
+import time
+import shutil
+import random
+import argparse
+import platform
+import tempfile
+import subprocess
+
+UTIL_DIR = os.path.dirname(os.path.abspath(__file__))
+TOP_DIR  = os.path.dirname(UTIL_DIR)
+PROCESS  = os.path.join(TOP_DIR, "source", "process")
+
+sys.path.insert(0, os.path.join(TOP_DIR, "pygments"))
+import check_lexers
+
+WORDS = ("the software unit shall be verified by the process and each"
+         " requirement is traced to a proof or a test case with evidence"
+         " that the analysis is complete").split()
+
+
+def text(rng, words, indent=""):
+    # Some random prose, wrapped to 60 columns
+    lines = [indent]
+    for _ in range(words):
+        if len(lines[-1]) > 60:
+            lines.append(indent)
+        lines[-1] += rng.choice(WORDS) + " "
+    return "\n".join(line.rstrip() for line in lines)
+
+
+def write(file_name, content):
+    os.makedirs(os.path.dirname(file_name), exist_ok=True)
+    with open(file_name, "w", encoding="UTF-8") as fd:
+        fd.write(content)
+
+
+def copy_schema(root, *path):
+    dst = os.path.join(root, *path)
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    shutil.copy(os.path.join(TOP_DIR, "source", *path), dst)
+
+
+##############################################################################
+# Corpus generation
+##############################################################################
+
+def mk_steps(root):
+    # Use the real process steps, so that step links can be checked
+    # against the real step index.
+    os.makedirs(os.path.join(root, "process"), exist_ok=True)
+    subprocess.run([sys.executable,
+                    os.path.join(UTIL_DIR, "build-step-index.py"),
+                    "--rsl", os.path.join(root, "process", "steps.rsl"),
+                    "--index", os.path.join(root, "process", "steps.json")] +
+                   [os.path.join(path, file_name)
+                    for path, _, files in os.walk(PROCESS)
+                    for file_name in sorted(files)
+                    if file_name.endswith(".rst") and
+                       "checklist" not in path],
+                   check=True)
+    with open(os.path.join(root, "process", "steps.json"),
+              "r",
+              encoding="UTF-8") as fd:
+        return sorted(json.load(fd))
+
+
+def mk_checklist(root, rng, steps, scale):
+    copy_schema(root, "process", "checklist", "checklist.rsl")
+    copy_schema(root, "process", "checklist", "worksheet.rsl")
+
+    items = []
+    for n in range(int(20000 * scale)):
+        items.append("Item item_%u_%u_%u {" % (n // 1000 + 1,
+                                              n // 10 % 100 + 1,
+                                              n % 10 + 1))
+        items.append("  automatable = %s" % rng.choice(("true", "false")))
+        items.append("  step        = Steps.ID.%s" % rng.choice(steps))
+        if n % 3 == 0:
+            items.append("  step_to     = Steps.ID.%s" % rng.choice(steps))
+        items.append("  scope       = Scope.%s" %
+                     rng.choice(("All", "Not_Platinum", "Ada")))
+        items.append("  text = '''")
+        items.append(text(rng, 40, "    "))
+        items.append("  '''")
+        items.append("}")
+    write(os.path.join(root, "process", "checklist", "bench.trlc"),
+          "package Checklist\nimport Steps\n\n" + "\n".join(items) + "\n")
+
+    items = []
+    for n in range(int(2000 * scale)):
+        if n % 20 == 0:
+            if n:
+                items.append("}")
+            items.append('section "Section %u" {' % (n // 20))
+        items.append("  Item ws_item_%u {" % n)
+        items.append("    scope = Checklist.Scope.Ada")
+        items.append("    text = '''")
+        items.append(text(rng, 30, "      "))
+        items.append("    '''")
+        items.append("  }")
+    items.append("}")
+    write(os.path.join(root, "process", "checklist", "ws-bench.trlc"),
+          "package Worksheet\nimport Checklist\n\n" +
+          "\n".join(items) + "\n")
+
+
+def mk_iso_tracing(root, rng, steps, scale):
+    copy_schema(root, "process", "tracing", "iso_26262", "tracing.rsl")
+
+    for chapter in range(1, 11):
+        records = []
+        for n in range(int(500 * scale)):
+            name = "p9_c%u_%u" % (chapter, n)
+            records.append("Tracing %s {" % name)
+            records.append("  ref = 9 @ %u:%u:%u" % (chapter,
+                                                     n // 50 + 1,
+                                                     n % 50 + 1))
+            records.append('  text = """')
+            records.append(text(rng, 30, "    "))
+            records.append('  """')
+            if n % 4 == 3:
+                # A chain of same_as references
+                records.append("  same_as = p9_c%u_%u" % (chapter, n - 1))
+            else:
+                records.append("  steps = [%s]" %
+                               ", ".join("Steps.ID.%s" % step
+                                         for step in rng.sample(steps, 3)))
+                if n >= 10:
+                    records.append("  ref_steps = [p9_c%u_%u, p9_c%u_%u]" %
+                                   (chapter, n - 10,
+                                    chapter, n - 5))
+                records.append('  just = """')
+                records.append(text(rng, 20, "    "))
+                records.append('  """')
+            records.append("}")
+        write(os.path.join(root, "process", "tracing", "iso_26262",
+                           "part9-chapter%u.trlc" % chapter),
+              "package ISO_26262_Tracing\nimport Steps\n\n" +
+              "\n".join(records) + "\n")
+
+
+def mk_assumptions(root, rng, steps, scale):
+    copy_schema(root, "process", "tracing", "spark_assumptions",
+                "spark-assumptions.rsl")
+    copy_schema(root, "process", "tracing", "spark_assumptions",
+                "tracing.rsl")
+
+    assumptions = []
+    arguments   = []
+    for n in range(int(2000 * scale)):
+        assumptions.append("Gnatprove_Assumption A_%u {" % n)
+        assumptions.append("  kind = Kind.%s" %
+                           rng.choice(("All", "Part", "Modular", "Compiler")))
+        assumptions.append("  text = '''")
+        assumptions.append(text(rng, 40, "    "))
+        assumptions.append("  '''")
+        assumptions.append("}")
+
+        arguments.append("Argument A_%u {" % n)
+        arguments.append("  assumption = Gnatprove_Assumptions.A_%u" % n)
+        arguments.append("  process = [%s]" %
+                         ", ".join("Steps.ID.%s" % step
+                                   for step in rng.sample(steps, 2)))
+        arguments.append("  text = '''")
+        arguments.append(text(rng, 30, "    "))
+        arguments.append("  '''")
+        arguments.append("}")
+
+    write(os.path.join(root, "process", "tracing", "spark_assumptions",
+                       "spark-assumptions.trlc"),
+          "package Gnatprove_Assumptions\n\n" +
+          "\n".join(assumptions) + "\n")
+    write(os.path.join(root, "process", "tracing", "spark_assumptions",
+                       "tracing.trlc"),
+          "package Tracing\nimport Gnatprove_Assumptions\nimport Steps\n\n" +
+          "\n".join(arguments) + "\n")
+
+
+def mk_switches(root, rng, steps, scale):
+    os.makedirs(os.path.join(root, "process", "switches"), exist_ok=True)
+    for base in ("compiler_warning_required",
+                 "compiler_banned",
+                 "gnatcheck_optional",
+                 "gnatprove_required"):
+        rows = []
+        for n in range(int(2000 * scale)):
+            if n % 10 == 0:
+                switches = "\n".join("-gnat%s%u" % (base[:3], n + i)
+                                     for i in range(3))
+            else:
+                switches = "-%s-%u" % (base[:5], n)
+            justification = "%s %s %s" % (text(rng, 10),
+                                          rng.choice(steps),
+                                          text(rng, 10))
+            rows.append('"%s","%s"' % (switches,
+                                       justification.replace("\n", " ")))
+        write(os.path.join(root, "process", base + ".csv"),
+              "\n".join(rows) + "\n")
+
+
+def mk_rst(root, rng, steps, scale):
+    # A large document with some linked, unlinked, and misspelled
+    # steps in it, and plenty of non-ascii punctuation.
+    lines = ["Step ID: %s" % step for step in steps]
+    size  = 0
+    while size < 2 * 2**20 * scale:
+        line = text(rng, 12).replace("\n", " ")
+        if rng.random() < 0.05:
+            line += " " + rng.choice(steps)
+        if rng.random() < 0.05:
+            line += " " + rng.choice(steps)[:-1] + "x"
+        if rng.random() < 0.2:
+            line = "“%s” – %s…" % (line, rng.choice(WORDS))
+        lines.append(line)
+        size += len(line)
+    write(os.path.join(root, "rst", "corpus.rst"), "\n".join(lines) + "\n")
+
+
+ADA_UNIT = '''\
+--  Synthetic unit %(n)u
+with Interfaces; use Interfaces;
+
+package body Bench_%(n)u with SPARK_Mode is
+
+   type Buffer is array (Positive range 1 .. 16#FF#) of Unsigned_8;
+
+   procedure Fill (B : in out Buffer; V : Unsigned_8)
+   with Post => (for all I in B'Range => B (I) = V)
+   is
+   begin
+      for I in B'Range loop
+         B (I) := V;
+         pragma Loop_Invariant (for all J in B'First .. I => B (J) = V);
+      end loop;
+   end Fill;
+
+   function Checksum (B : Buffer) return Unsigned_32 is
+      Sum : Unsigned_32 := 0;
+   begin
+      for E of B loop
+         Sum := Sum xor Unsigned_32 (E) * 16#0100_0193#;
+      end loop;
+      if Sum'Valid and then Sum /= 0 then
+         return Sum + 1.5E2'Length;
+      end if;
+      return Sum'Old;
+   end Checksum;
+
+   Name : constant String := "bench %(n)u";
+   Char : constant Character := 'x';
+end Bench_%(n)u;
+
+'''
+
+GPR_UNIT = '''\
+project Bench_%(n)u extends "base.gpr" is
+   for Source_Dirs use ("src", "gen/" & "extra");
+   for Object_Dir use "obj";
+
+   package Compiler is
+      for Default_Switches ("Ada") use ("-gnatwa", "-gnatyr", "-O2");
+   end Compiler;
+
+   package Prove is
+      for Proof_Switches ("Ada") use ("--level=2");
+   end Prove;
+end Bench_%(n)u;
+
+'''
+
+
+def mk_ada(root, rng, steps, scale):
+    n_ada = int(2 * 2**20 * scale) // len(ADA_UNIT)
+    n_gpr = int(2**20 * scale) // len(GPR_UNIT)
+    write(os.path.join(root, "ada", "bench.adb"),
+          "".join(ADA_UNIT % {"n": n} for n in range(n_ada)))
+    write(os.path.join(root, "ada", "bench.gpr"),
+          "".join(GPR_UNIT % {"n": n} for n in range(n_gpr)))
+
+
+CORPUS = (mk_checklist,
+          mk_iso_tracing,
+          mk_assumptions,
+          mk_switches,
+          mk_rst,
+          mk_ada)
+
+
+##############################################################################
+# Benchmarks
+##############################################################################
+
+def run_script(script, *args, cwd):
+    env = dict(os.environ,
+               TRLC_CACHE_DIR = "")
+    env.pop("SPARK_PROCESS_PROFILE", None)
+    subprocess.run([sys.executable, os.path.join(UTIL_DIR, script)] +
+                   list(args),
+                   cwd=cwd,
+                   env=env,
+                   check=True,
+                   stdout=subprocess.DEVNULL)
+
+
+def bench_checklist(root):
+    run_script("checklist-generator.py", "bench.trlc", "ws-bench.trlc",
+               cwd=os.path.join(root, "process", "checklist"))
+
+
+def bench_iso_tracing(root):
+    cwd = os.path.join(root, "process", "tracing", "iso_26262")
+    run_script("iso-tracing.py",
+               *(sorted(file_name
+                        for file_name in os.listdir(cwd)
+                        if file_name.endswith(".trlc")) +
+                 ["tracing.rsl",
+                  "../../steps.rsl",
+                  "--all-sections", "all_sections.txt"]),
+               cwd=cwd)
+
+
+def bench_assumptions(root):
+    run_script("assumption-tracing.py", "--source-dir=../../",
+               cwd=os.path.join(root, "process", "tracing",
+                                "spark_assumptions"))
+
+
+def bench_switches(root):
+    run_script("convert_csv_switches.py",
+               cwd=os.path.join(root, "process", "switches"))
+
+
+def bench_find_unlinked_steps(root):
+    run_script("find-unlinked-steps.py", "-j1",
+               cwd=os.path.join(root, "work"))
+
+
+def bench_unicode_fix(root):
+    run_script("unicode_fix.py", "-j1", ".",
+               cwd=os.path.join(root, "work"))
+
+
+def prepare_work(root):
+    # These benchmarks modify their input, so they get a fresh copy
+    # every time.
+    shutil.rmtree(os.path.join(root, "work"), ignore_errors=True)
+    shutil.copytree(os.path.join(root, "rst"), os.path.join(root, "work"))
+
+
+CHECKED = set()
+
+
+def check_lexer(lexer_name, file_name, language):
+    # Make sure the lexer produces the same tokens as the reference
+    # lexer, on the corpus and on the code blocks of the documentation
+    def check(root):
+        if lexer_name in CHECKED:
+            return
+        CHECKED.add(lexer_name)
+        with open(os.path.join(root, "ada", file_name),
+                  "r",
+                  encoding="UTF-8") as fd:
+            inputs = [fd.read()] + check_lexers.code_blocks(language)
+        mismatch = check_lexers.compare(lexer_name, inputs)
+        if mismatch is not None:
+            _, actual, expected = mismatch
+            print("%s: got %s, expected %s" % (lexer_name, actual, expected))
+            sys.exit(1)
+    return check
+
+
+def bench_lexer(lexer_name, file_name, reference=False):
+    def bench(root):
+        lexer = check_lexers.mk_lexer(lexer_name, reference)
+        with open(os.path.join(root, "ada", file_name),
+                  "r",
+                  encoding="UTF-8") as fd:
+            content = fd.read()
+        for _ in lexer.get_tokens(content):
+            pass
+    return bench
+
+
+# name -> (function to prepare, function to time)
+BENCHMARKS = {
+    "checklist-generator"  : (None, bench_checklist),
+    "iso-tracing"          : (None, bench_iso_tracing),
+    "assumption-tracing"   : (None, bench_assumptions),
+    "convert_csv_switches" : (None, bench_switches),
+    "find-unlinked-steps"  : (prepare_work, bench_find_unlinked_steps),
+    "unicode_fix"          : (prepare_work, bench_unicode_fix),
+    "AdaLexer"             : (check_lexer("AdaLexer",
+                                          "bench.adb",
+                                          "ada"),
+                              bench_lexer("AdaLexer",
+                                          "bench.adb")),
+    "TaggedAdaLexer"       : (check_lexer("TaggedAdaLexer",
+                                          "bench.adb",
+                                          "ada"),
+                              bench_lexer("TaggedAdaLexer",
+                                          "bench.adb")),
+    "GNATProjectLexer"     : (check_lexer("GNATProjectLexer",
+                                          "bench.gpr",
+                                          "gpr"),
+                              bench_lexer("GNATProjectLexer",
+                                          "bench.gpr")),
+    "AdaLexer-reference"   : (None, bench_lexer("AdaLexer",
+                                                "bench.adb",
+                                                True)),
+    "GPRLexer-reference"   : (None, bench_lexer("GNATProjectLexer",
+                                                "bench.gpr",
+                                                True)),
+}
+
+# name -> (function generating its input, the files it reads)
+INPUTS = {
+    "checklist-generator"  : (mk_checklist, "process/checklist/*.trlc"),
+    "iso-tracing"          : (mk_iso_tracing,
+                              "process/tracing/iso_26262/*.trlc"),
+    "assumption-tracing"   : (mk_assumptions,
+                              "process/tracing/spark_assumptions/*.trlc"),
+    "convert_csv_switches" : (mk_switches, "process/*.csv"),
+    "find-unlinked-steps"  : (mk_rst, "rst/*.rst"),
+    "unicode_fix"          : (mk_rst, "rst/*.rst"),
+    "AdaLexer"             : (mk_ada, "ada/bench.adb"),
+    "TaggedAdaLexer"       : (mk_ada, "ada/bench.adb"),
+    "GNATProjectLexer"     : (mk_ada, "ada/bench.gpr"),
+    "AdaLexer-reference"   : (mk_ada, "ada/bench.adb"),
+    "GPRLexer-reference"   : (mk_ada, "ada/bench.gpr"),
+}
+
+
+def best_time(root, name, repeat):
+    prepare, bench = BENCHMARKS[name]
+    timings = []
+    for _ in range(repeat):
+        if prepare:
+            prepare(root)
+        start = time.perf_counter()
+        bench(root)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def input_size(root, name):
+    # The size of what the benchmark reads, in MB
+    return sum(os.path.getsize(file_name)
+               for file_name in glob.glob(os.path.join(root,
+                                                       INPUTS[name][1]))) \
+        / 2**20
+
+
+def sweep(names, scales, options):
+    # Run the benchmarks on ever larger inputs and report the time per
+    # MB, which stays flat for a linear algorithm (or drops, as the
+    # start-up time is spread over more input). Returns False if it
+    # grew by more than the tolerance.
+    ok     = True
+    per_mb = {name: [] for name in names}
+    needed = set(INPUTS[name][0] for name in names)
+    for scale in scales:
+        root = tempfile.mkdtemp(prefix="spark-process-bench-")
+        try:
+            rng   = random.Random(options.seed)
+            steps = mk_steps(root)
+            for generator in CORPUS:
+                if generator in needed:
+                    generator(root, rng, steps, scale)
+
+            for name in names:
+                size    = input_size(root, name)
+                elapsed = best_time(root, name, options.repeat)
+                rate    = elapsed / size
+                print("%-22s %7.2f MB %8.3fs %8.3fs/MB" % (name,
+                                                          size,
+                                                          elapsed,
+                                                          rate), end="")
+                if per_mb[name] and \
+                   rate > min(per_mb[name]) * (1 + options.tolerance):
+                    print("  NONLINEAR", end="")
+                    ok = False
+                per_mb[name].append(rate)
+                print()
+        finally:
+            shutil.rmtree(root)
+    return ok
+
+
+def scale_list(value):
+    # e.g. 1,5,25
+    try:
+        scales = sorted(float(scale) for scale in value.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError("not a list of scales: %s" % value)
+    if scales[0] <= 0:
+        raise argparse.ArgumentTypeError("scales must be positive")
+    return scales
+
+
+def main():
+    ap = argparse.ArgumentParser(
+        description="benchmark the util generators and the Ada lexer")
+    ap.add_argument("benchmarks",
+                    nargs="*",
+                    metavar="benchmark",
+                    help=("benchmarks to run (default: all of %s)" %
+                          ", ".join(BENCHMARKS)))
+    ap.add_argument("--scale",
+                    type=float,
+                    default=1.0,
+                    help="size of the synthetic inputs (default: 1.0)")
+    ap.add_argument("--repeat",
+                    type=int,
+                    default=3,
+                    help="runs per benchmark, the best one counts"
+                    " (default: 3)")
+    ap.add_argument("--seed",
+                    type=int,
+                    default=42)
+    ap.add_argument("--save",
+                    metavar="FILENAME",
+                    help="write the results as json")
+    ap.add_argument("--compare",
+                    metavar="FILENAME",
+                    help="compare against results saved earlier")
+    ap.add_argument("--tolerance",
+                    type=float,
+                    default=0.2,
+                    help=("relative slowdown against --compare that is"
+                          " reported as a regression (default: 0.2)"))
+    ap.add_argument("--keep",
+                    metavar="DIRECTORY",
+                    help="generate the inputs here and keep them")
+    ap.add_argument("--sweep",
+                    type=scale_list,
+                    metavar="SCALES",
+                    help=("instead of --scale, run at each of these"
+                          " comma-separated scales and check that the"
+                          " time per MB of input does not grow by more"
+                          " than the tolerance"))
+    options = ap.parse_args()
+
+    for name in options.benchmarks:
+        if name not in BENCHMARKS:
+            ap.error("unknown benchmark %s" % name)
+    if options.repeat < 1:
+        ap.error("--repeat must be at least 1")
+
+    if options.sweep:
+        if options.save or options.compare or options.keep:
+            ap.error("--sweep cannot be combined with --save, --compare"
+                     " or --keep")
+        if not sweep(options.benchmarks or list(BENCHMARKS),
+                     options.sweep,
+                     options):
+            sys.exit(1)
+        return
+
+    baseline = None
+    if options.compare:
+        with open(options.compare, "r", encoding="UTF-8") as fd:
+            baseline = json.load(fd)
+        if baseline["scale"] != options.scale:
+            ap.error("baseline was measured with --scale=%s" %
+                     baseline["scale"])
+
+    if options.keep:
+        root = os.path.abspath(options.keep)
+        os.makedirs(root, exist_ok=True)
+    else:
+        root = tempfile.mkdtemp(prefix="spark-process-bench-")
+
+    try:
+        rng   = random.Random(options.seed)
+        steps = mk_steps(root)
+        for generator in CORPUS:
+            generator(root, rng, steps, options.scale)
+
+        results = {}
+        for name in options.benchmarks or BENCHMARKS:
+            results[name] = best_time(root, name, options.repeat)
+            print("%-22s %8.3fs" % (name, results[name]), end="")
+
+            if baseline and name in baseline["results"]:
+                ratio = results[name] / baseline["results"][name]
+                print("  %5.2fx%s" % (ratio,
+                                      "  REGRESSION"
+                                      if ratio > 1 + options.tolerance
+                                      else ""), end="")
+            print()
+
+    finally:
+        if not options.keep:
+            shutil.rmtree(root)
+
+    if options.save:
+        with open(options.save, "w", encoding="UTF-8") as fd:
+            json.dump({"scale"    : options.scale,
+                       "seed"     : options.seed,
+                       "python"   : platform.python_version(),
+                       "platform" : platform.platform(),
+                       "results"  : results},
+                      fd,
+                      indent=2,
+                      sort_keys=True)
+            fd.write("\n")
+
+    if baseline and any(results[name] / baseline["results"][name] >
+                        1 + options.tolerance
+                        for name in results
+                        if name in baseline["results"]):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+#
+# Ada/SPARK ISO 26262 Process Tools
+# Copyright (C) 2026 NVIDIA CORPORATION & AFFILIATES
+#
+# This file is part of the NVIDIA SPARK ISO 26262 Process.
+#
+# The NVIDIA SPARK ISO 26262 Process Tools are free software: you can
+# redistribute them and/or modify them under the terms of the GNU
+# General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later
+# version.
+#
+# The NVIDIA SPARK ISO 26262 Process Tools are distributed in the hope
+# that they will be useful, but WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with the NVIDIA SPARK ISO 26262 Process Tools. If not, see
+# <https://www.gnu.org/licenses/>.
+
+
+import os
+import re
+import sys
+import json
+import argparse
+
+import common
+import profiling
+
+STEP_LABEL = re.compile(r"^\.\. _(step-[a-z0-9-]+):\s*$")
+
+
+def scan(filename, index):
+    ok    = True
+    label = None
+    with open(filename, "r", encoding="UTF-8") as fd:
+        for line_no, raw_line in enumerate(fd, 1):
+            match = STEP_LABEL.match(raw_line)
+            if match:
+                label = match.group(1)
+                continue
+            if not raw_line.startswith("Step ID:"):
+                continue
+
+            step = raw_line[8:].strip()
+            if step in index:
+                print("%s:%u: error: duplicate step %s (previous definition"
+                      " at %s:%u)" % (filename,
+                                      line_no,
+                                      step,
+                                      index[step]["file"],
+                                      index[step]["line"]))
+                ok = False
+            elif label != common.step_label(step):
+                print("%s:%u: error: step %s is not in a section labelled"
+                      " %s" % (filename,
+                               line_no,
+                               step,
+                               common.step_label(step)))
+                ok = False
+            index[step] = {"file"  : filename,
+                           "line"  : line_no,
+                           "label" : label}
+
+    return ok
+
+
+def main():
+    profiling.profile_script()
+
+    ap = argparse.ArgumentParser(
+        description="collect the process steps from the rst sources")
+    ap.add_argument("inputs",
+                    nargs="+",
+                    metavar="input",
+                    help="rst files to scan for 'Step ID:' lines")
+    ap.add_argument("--rsl",
+                    required=True,
+                    metavar="FILENAME",
+                    help="write the Steps package to this file")
+    ap.add_argument("--index",
+                    required=True,
+                    metavar="FILENAME",
+                    help="write the step index (json) to this file")
+    options = ap.parse_args()
+
+    ok    = True
+    index = {}
+    for filename in options.inputs:
+        if not os.path.isfile(filename):
+            ap.error("%s is not a file" % filename)
+        ok &= scan(filename, index)
+
+    if not ok:
+        sys.exit(1)
+
+    with common.open_output(options.rsl) as fd:
+        fd.write("package Steps\n")
+        fd.write("\n")
+        fd.write("enum ID {\n")
+        for step in sorted(index):
+            fd.write("   %s\n" % step)
+        fd.write("   ALL\n")
+        fd.write("   VARIOUS\n")
+        fd.write("}\n")
+
+    with common.open_output(options.index) as fd:
+        json.dump(index, fd, indent=2, sort_keys=True)
+        fd.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+#
+# Ada/SPARK ISO 26262 Process Tools
+# Copyright (C) 2026 NVIDIA CORPORATION & AFFILIATES
+#
+# This file is part of the NVIDIA SPARK ISO 26262 Process.
+#
+# The NVIDIA SPARK ISO 26262 Process Tools are free software: you can
+# redistribute them and/or modify them under the terms of the GNU
+# General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later
+# version.
+#
+# The NVIDIA SPARK ISO 26262 Process Tools are distributed in the hope
+# that they will be useful, but WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with the NVIDIA SPARK ISO 26262 Process Tools. If not, see
+# <https://www.gnu.org/licenses/>.
+
+
+# Check the compiler, gnatprove and gnatcheck invocations found in
+# build logs (or compile_commands.json files) against the switch
+# policy: report banned switches, and required switches and rules that
+# are missing.
+
+import os
+import re
+import sys
+import json
+import shlex
+import argparse
+import itertools
+import collections
+import multiprocessing
+
+import switches
+
+# Lines are handed to the workers in batches of this size
+BATCH_SIZE = 5000
+
+# Each worker remembers how it classified this many arguments
+MEMO_ENTRIES = 100000
+
+# The commands we check, and the tool they are
+COMMANDS = (
+    (re.compile(r"(.*-)?gcc(-[0-9.]+)?(\.exe)?$"), "GNAT_Compiler"),
+    (re.compile(r"gnatprove(\.exe)?$"),            "SPARK"),
+    (re.compile(r"gnatcheck(\.exe)?$"),            "GNAT_Check"),
+)
+CANDIDATE = re.compile(r"gcc|gnatprove|gnatcheck")
+
+# Shell operators after which a new command starts, and the variable
+# assignments that may precede a command
+SEPARATORS = ("&&", "||", ";", "|", "(", "{")
+ASSIGNMENT = re.compile(r"[A-Za-z_][A-Za-z_0-9]*=")
+
+# Compiler invocations are only checked when they compile Ada
+ADA_SOURCES = (".adb", ".ads", ".ada")
+
+# Switches that gprbuild adds to every compiler invocation; the policy
+# only bans them from the Compiler package of project files.
+BUILDER_SWITCHES = ("-c", "-o", "-I", "-x")
+
+# Switches starting a section of switches for another tool
+SECTIONS = ("-cargs", "-bargs", "-largs", "-margs", "-gargs", "-rules")
+
+
+def find_command(args):
+    # The tool and the arguments of the first command on this line
+    # that is one of ours, if any. Only the command word counts: the
+    # first word, or the first one after a shell operator, after any
+    # variable assignments; gnatprove in an argument such as
+    # obj/gnatprove/main.ali is not an invocation.
+    command_word = True
+    for n, arg in enumerate(args):
+        if arg in SEPARATORS:
+            command_word = True
+            continue
+        if not command_word:
+            # cd /some/dir; gcc ...
+            command_word = arg.endswith(";")
+            continue
+        if ASSIGNMENT.match(arg):
+            continue
+        command_word = arg.endswith(";")
+        for regex, tool in COMMANDS:
+            if regex.match(os.path.basename(arg)):
+                end = n + 1
+                while end < len(args) and args[end] not in SEPARATORS:
+                    end += 1
+                return tool, args[n + 1:end]
+    return None, None
+
+
+def check(location, args, tries, required, rules, ignored, memo):
+    messages = []
+
+    tool, args = find_command(args)
+    if tool is None:
+        return messages
+    if tool == "GNAT_Compiler" and not any(arg.endswith(ADA_SOURCES)
+                                           for arg in args):
+        return messages
+
+    seen       = set()
+    rule_args  = []
+    section    = None
+    rule_files = False
+    for arg in args:
+        if arg in SECTIONS:
+            # The switch starting the section may be a switch of the
+            # tool itself (e.g. gnatcheck -rules)
+            seen.update(pattern
+                        for pattern, _ in switches.lookup(tries[tool], arg))
+            section = arg
+            continue
+        if section == "-rules":
+            if arg.startswith("+R"):
+                rule_args.append(arg[2:].lower())
+            elif arg.startswith("-from="):
+                rule_files = True
+            continue
+        if section is not None or not arg.startswith("-"):
+            continue
+        if tool == "GNAT_Compiler" and arg.startswith(BUILDER_SWITCHES):
+            continue
+        if arg.startswith(ignored):
+            continue
+
+        # The same switches occur over and over again in a build log
+        key = (tool, arg)
+        if key not in memo:
+            if len(memo) >= MEMO_ENTRIES:
+                memo.clear()
+            memo[key] = switches.classify(tries[tool], tool, arg)
+        arg_seen, banned = memo[key]
+        seen |= arg_seen
+        for switch, constraint in banned:
+            messages.append("%s: %s: banned switch %s (%s)" %
+                            (location,
+                             tool,
+                             switch,
+                             constraint.location()))
+
+    for pattern, constraint in required[tool]:
+        if pattern not in seen:
+            messages.append("%s: %s: missing required switch %s (%s)" %
+                            (location,
+                             tool,
+                             pattern,
+                             constraint.location()))
+
+    # Rules given in a rules file cannot be checked from here
+    if tool == "GNAT_Check" and not rule_files:
+        for rule, constraint in rules:
+            if rule.lower() not in rule_args:
+                messages.append("%s: %s: missing required rule %s (%s)" %
+                                (location,
+                                 tool,
+                                 rule,
+                                 constraint.location()))
+
+    return messages
+
+
+def split_command(command):
+    if not any(char in command for char in "'\"\\"):
+        return command.split()
+    try:
+        return shlex.split(command)
+    except ValueError:
+        # Unbalanced quotes, e.g. a truncated log line
+        return command.split()
+
+
+def read_log(file_name):
+    # Yields (location, command) for each line that may be an
+    # invocation of one of our tools
+    with open(file_name, "r", encoding="UTF-8", errors="replace") as fd:
+        for line_id, line in enumerate(fd, 1):
+            if CANDIDATE.search(line):
+                yield "%s:%u" % (file_name, line_id), line
+
+
+def read_compile_commands(file_name):
+    # Yields (location, command) for each entry of a compile_commands
+    # style JSON array, without loading the whole file.
+    decoder = json.JSONDecoder()
+    buf     = ""
+    pos     = 0
+    entry   = 0
+    with open(file_name, "r", encoding="UTF-8") as fd:
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,[]":
+                pos += 1
+            try:
+                obj, end = decoder.raw_decode(buf, pos)
+            except ValueError:
+                chunk = fd.read(1 << 20)
+                if not chunk:
+                    if buf[pos:].strip():
+                        raise
+                    break
+                buf = buf[pos:] + chunk
+                pos = 0
+                continue
+            entry += 1
+            pos = end
+            if "arguments" in obj:
+                command = obj["arguments"]
+            else:
+                command = obj.get("command", "")
+            yield "%s:entry %u" % (file_name, entry), command
+
+
+def init_worker(constraints, ignored):
+    global worker_state
+    worker_state = switches.mk_tries(constraints) + (ignored, {})
+
+
+def check_batch(batch):
+    messages = []
+    for location, command in batch:
+        if isinstance(command, str):
+            command = split_command(command)
+        messages += check(location, command, *worker_state)
+    return messages
+
+
+def batches(iterator):
+    while True:
+        batch = list(itertools.islice(iterator, BATCH_SIZE))
+        if not batch:
+            return
+        yield batch
+
+
+def imap_bounded(pool, function, iterable, depth):
+    # Like pool.imap, but without reading arbitrarily far ahead of the
+    # workers, so that huge logs are streamed instead of loaded.
+    pending = collections.deque()
+    for item in iterable:
+        pending.append(pool.apply_async(function, (item,)))
+        if len(pending) >= depth:
+            yield pending.popleft().get()
+    while pending:
+        yield pending.popleft().get()
+
+
+def report(results):
+    ok = True
+    for messages in results:
+        for message in messages:
+            print(message)
+            ok = False
+    return ok
+
+
+def main():
+    ap = argparse.ArgumentParser(
+        description="check build logs against the switch policy")
+    ap.add_argument("logs",
+                    nargs="+",
+                    metavar="FILENAME",
+                    help=("build logs, or compile_commands style json"
+                          " files (ending in .json)"))
+    ap.add_argument("--switch-dir",
+                    default=switches.SWITCH_DIR,
+                    help="directory with the switch tables")
+    ap.add_argument("--ignore",
+                    action="append",
+                    default=[],
+                    metavar="SWITCH",
+                    help="do not check switches starting with this")
+    ap.add_argument("-j", "--jobs",
+                    type=int,
+                    default=os.cpu_count(),
+                    help="number of worker processes (default: %(default)s)")
+    options = ap.parse_args()
+
+    if options.jobs < 1:
+        ap.error("--jobs must be at least 1")
+
+    constraints = switches.load_constraints(options.switch_dir)
+    ignored     = tuple(options.ignore)
+
+    def commands():
+        for file_name in options.logs:
+            if file_name.endswith(".json"):
+                yield from read_compile_commands(file_name)
+            else:
+                yield from read_log(file_name)
+
+    if options.jobs == 1:
+        init_worker(constraints, ignored)
+        ok = report(map(check_batch, batches(commands())))
+    else:
+        with multiprocessing.Pool(options.jobs,
+                                  init_worker,
+                                  (constraints, ignored)) as pool:
+            ok = report(imap_bounded(pool,
+                                     check_batch,
+                                     batches(commands()),
+                                     2 * options.jobs))
+
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -24,10 +24,10 @@ import sys
 import os
 import argparse
 
-from trlc.trlc import Source_Manager
-from trlc.errors import Message_Handler
+from trlc.errors import Message_Handler, TRLC_Error
 
 import common
+import profiling
 
 def pp_scope(scope):
     assert isinstance(scope, str)
@@ -45,7 +45,7 @@ def pp_scope(scope):
         assert False, "unexpected scope: %s" % data["scope"]
 
 
-def process_checklist_item(fd, obj):
+def process_checklist_item(mh, fd, obj):
     ok   = True
     data = obj.to_python_dict()
 
@@ -69,11 +69,14 @@ def process_checklist_item(fd, obj):
     fd.write(".. list-table::\n")
     fd.write("   :widths: 1 1\n")
     fd.write("\n")
-    fd.write("   * - %s" % common.fmt_step_link(data["step"]))
+    def step_link(field):
+        return common.fmt_step_link(mh, obj.field[field].location, data[field])
+
+    fd.write("   * - %s" % step_link("step"))
     if data["step_to"]:
-        fd.write(" .. %s" % common.fmt_step_link(data["step_to"]))
+        fd.write(" .. %s" % step_link("step_to"))
     elif data["step_also"]:
-        fd.write(", %s" % common.fmt_step_link(data["step_also"]))
+        fd.write(", %s" % step_link("step_also"))
     fd.write("\n")
 
     fd.write("     - %s\n\n" % pp_scope(data["scope"]))
@@ -112,37 +115,71 @@ def process_worklist_item(fd, obj, context):
     return ok
 
 
+def is_worksheet(filename):
+    return os.path.basename(filename).startswith("ws-")
+
+
+def render(mh, filename, objects):
+    # The numbering context is local to each file, so the output of a
+    # file only depends on its own records.
+    ok      = True
+    context = {}
+    try:
+        with common.open_output(filename.replace(".trlc", ".rst")) as fd:
+            for obj in objects:
+                if is_worksheet(filename):
+                    ok &= process_worklist_item(fd, obj, context)
+                else:
+                    try:
+                        ok &= process_checklist_item(mh, fd, obj)
+                    except TRLC_Error:
+                        ok = False
+            if not ok:
+                raise common.Discard_Output()
+    except common.Discard_Output:
+        pass
+
+    return ok
+
+
 def main():
+    profiling.profile_script()
+
     ap = argparse.ArgumentParser()
-    ap.add_argument("filename")
+    ap.add_argument("filenames",
+                    nargs="+",
+                    metavar="filename",
+                    help="checklist and worksheet files to render")
 
     options = ap.parse_args()
 
     mh = Message_Handler()
-    sm = Source_Manager(mh)
 
-    is_worksheet = os.path.basename(options.filename).startswith("ws-")
-    if is_worksheet:
-        sm.register_file("worksheet.rsl")
-    sm.register_file(os.path.join("..", "steps.rsl"))
-    sm.register_file("checklist.rsl")
-    sm.register_file(options.filename)
+    # Shared schemas are only parsed once, no matter how many
+    # checklists we render.
+    files = []
+    if any(map(is_worksheet, options.filenames)):
+        files.append("worksheet.rsl")
+    files.append(os.path.join("..", "steps.rsl"))
+    files.append("checklist.rsl")
+    for filename in options.filenames:
+        if not os.path.isfile(filename):
+            ap.error("%s is not a file" % filename)
+        files.append(filename)
 
-    stab = sm.process()
+    stab = common.process_trlc_files(mh, files, verify=True)
 
     if stab is None:
         sys.exit(1)
 
+    objects = {filename: [] for filename in options.filenames}
+    for obj in stab.iter_record_objects():
+        if obj.location.file_name in objects:
+            objects[obj.location.file_name].append(obj)
+
     ok = True
-    context = {}
-    with open(options.filename.replace(".trlc", ".rst"),
-              "w",
-              encoding="UTF-8") as fd:
-        for obj in stab.iter_record_objects():
-            if is_worksheet:
-                ok &= process_worklist_item(fd, obj, context)
-            else:
-                ok &= process_checklist_item(fd, obj)
+    for filename in options.filenames:
+        ok &= render(mh, filename, objects[filename])
 
     sys.exit(0 if ok else 1)
 
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+#
+# Ada/SPARK ISO 26262 Process Tools
+# Copyright (C) 2026 NVIDIA CORPORATION & AFFILIATES
+#
+# This file is part of the NVIDIA SPARK ISO 26262 Process.
+#
+# The NVIDIA SPARK ISO 26262 Process Tools are free software: you can
+# redistribute them and/or modify them under the terms of the GNU
+# General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later
+# version.
+#
+# The NVIDIA SPARK ISO 26262 Process Tools are distributed in the hope
+# that they will be useful, but WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with the NVIDIA SPARK ISO 26262 Process Tools. If not, see
+# <https://www.gnu.org/licenses/>.
+
+
+# The checklists and worksheets (source/process/checklist) as plain
+# data, and the manifests listing the software units of a programme
+# with the checklist scopes that apply to them.
+
+import os
+import re
+import csv
+import json
+import hashlib
+
+import common
+
+CHECKLIST_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "..", "source", "process", "checklist")
+
+LEVELS = ("stone", "bronze", "silver", "gold", "platinum")
+
+SCOPES = ("All", "Not_Platinum", "Ada", "Automated")
+
+# Sphinx cross references, which mean nothing outside the process
+# document
+REFERENCE = re.compile(r":ref:`([^`<]*?)\s*(<[^`]*>)?`")
+
+
+def default_scopes(level):
+    # Items that are fully automated are still listed, so that the
+    # evidence for them can be recorded.
+    scopes = ["All", "Automated"]
+    if level != "platinum":
+        scopes.append("Not_Platinum")
+    return scopes
+
+
+def read_manifest(file_name):
+    # Returns a list of units, each a dict with name, level, and scopes
+    with open(file_name, "r", encoding="UTF-8") as fd:
+        if file_name.endswith(".json"):
+            entries = json.load(fd)
+        else:
+            entries = list(csv.DictReader(fd))
+
+    units = []
+    names = set()
+    for n, entry in enumerate(entries, 1):
+        where = "%s: unit %u" % (file_name, n)
+        name  = entry.get("name")
+        level = (entry.get("level") or "").lower()
+        if not name or "/" in name or name.startswith("."):
+            raise ValueError("%s: invalid name %r" % (where, name))
+        if name in names:
+            raise ValueError("%s: duplicate unit %s" % (where, name))
+        if level not in LEVELS:
+            raise ValueError("%s: level must be one of %s" %
+                             (where, ", ".join(LEVELS)))
+        scopes = entry.get("scopes") or default_scopes(level)
+        if isinstance(scopes, str):
+            scopes = scopes.split()
+        for scope in scopes:
+            if scope not in SCOPES:
+                raise ValueError("%s: scope must be one of %s" %
+                                 (where, ", ".join(SCOPES)))
+        names.add(name)
+        units.append({"name"   : name,
+                      "level"  : level,
+                      "scopes" : scopes})
+    return units
+
+
+def document_titles(checklist_dir):
+    # The title of each checklist is the heading of the section of
+    # checklist.rst including it.
+    titles  = {}
+    heading = None
+    with open(os.path.join(checklist_dir, "..", "checklist.rst"),
+              "r",
+              encoding="UTF-8") as fd:
+        lines = fd.read().splitlines()
+    for n, line in enumerate(lines):
+        if n + 1 < len(lines) and line.strip() and \
+           re.match(r"^([=\-^~\"'])\1*$", lines[n + 1]) and \
+           len(lines[n + 1]) >= len(line):
+            heading = line.strip()
+        match = re.match(r"^\.\. include:: checklist/(.*)\.rst", line)
+        if match and heading:
+            titles[match.group(1)] = heading
+    return titles
+
+
+def load_model(mh, checklist_dir, file_names):
+    # The checklists as plain data: a list of documents, each with a
+    # name, title and list of items.
+    files = [os.path.join(checklist_dir, "worksheet.rsl"),
+             os.path.join(checklist_dir, "..", "steps.rsl"),
+             os.path.join(checklist_dir, "checklist.rsl")]
+    files += file_names
+    stab = common.process_trlc_files(mh, files)
+    if stab is None:
+        return None
+
+    objects = {file_name: [] for file_name in file_names}
+    for obj in stab.iter_record_objects():
+        if obj.location.file_name in objects:
+            objects[obj.location.file_name].append(obj)
+
+    titles    = document_titles(checklist_dir)
+    documents = []
+    for file_name in file_names:
+        name      = os.path.splitext(os.path.basename(file_name))[0]
+        worksheet = name.startswith("ws-")
+        items     = []
+        section   = None
+        number    = [0, 0]
+        for obj in objects[file_name]:
+            data = obj.to_python_dict()
+            item = {
+                "kind"        : "worklist" if worksheet else "checklist",
+                "scope"       : data["scope"],
+                "automatable" : bool(data.get("automatable")),
+                "manual"      : bool(data.get("manual")),
+                "steps"       : [],
+                "range"       : False,
+                "section"     : None,
+                "text"        : REFERENCE.sub(r"\1", data["text"]),
+            }
+            if worksheet:
+                # Numbered as by checklist-generator.py
+                if section != obj.section[-1].name:
+                    section   = obj.section[-1].name
+                    number[0] += 1
+                    number[1]  = 0
+                number[1] += 1
+                item["number"]  = "%u.%u" % tuple(number)
+                item["section"] = section
+            else:
+                item["number"] = obj.name[5:].replace("_", ".")
+                item["steps"]  = [data["step"]]
+                if data["step_to"]:
+                    item["steps"].append(data["step_to"])
+                    item["range"] = True
+                elif data["step_also"]:
+                    item["steps"].append(data["step_also"])
+            item["id"]  = "%s/%s" % (name, item["number"])
+            item["key"] = hashlib.sha256(
+                json.dumps(item, sort_keys=True).encode("UTF-8")).hexdigest()
+            items.append(item)
+        documents.append({"name"  : name,
+                          "title" : titles.get(name, name),
+                          "items" : items})
+    return documents
+
+
+def checklist_files(checklist_dir=CHECKLIST_DIR):
+    # All checklist trlc files, in the order of checklist.rst
+    order = list(document_titles(checklist_dir))
+    return sorted(
+        (os.path.join(checklist_dir, file_name)
+         for file_name in os.listdir(checklist_dir)
+         if file_name.endswith(".trlc")),
+        key=lambda file_name: (
+            order.index(os.path.basename(file_name)[:-5])
+            if os.path.basename(file_name)[:-5] in order
+            else len(order),
+            file_name))
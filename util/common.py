@@ -20,11 +20,345 @@
 # along with the NVIDIA SPARK ISO 26262 Process Tools. If not, see
 # <https://www.gnu.org/licenses/>.
 
-def fmt_step_link(step):
+import io
+import os
+import sys
+import json
+import pickle
+import hashlib
+import tempfile
+import functools
+import contextlib
+
+from trlc.trlc import Source_Manager, VCG_API_AVAILABLE
+from trlc.errors import Message_Handler, TRLC_Error, Location
+from trlc.version import TRLC_VERSION
+
+# Processed symbol tables are cached here. Set TRLC_CACHE_DIR to an
+# empty string to disable the cache.
+TRLC_CACHE_DIR = os.environ.get(
+    "TRLC_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                 "..", "build", "trlc-cache"))
+
+# Index of all process steps, written by build-step-index.py
+STEP_INDEX = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                          "..", "source", "process", "steps.json")
+
+# Maximum number of symbol tables we keep, least recently used ones
+# are evicted first
+TRLC_CACHE_ENTRIES = 32
+
+
+def process_trlc_files(mh, file_names, verify=False):
+    # Register, parse, and check the given files, returning the symbol
+    # table (or None if there were errors), just like
+    # Source_Manager.process.
+    #
+    # A successful result is cached on disk. There is one cache entry
+    # per working directory and list of files, and it is only re-used
+    # if the trlc version and the content of every file are the
+    # same. A cache hit does not repeat any warnings.
+    #
+    # If verify is set, the files are also checked like trlc --verify
+    # does, and its messages and exit code are recorded in the cache,
+    # so that util/trlc-verify.py (run after the generator in each
+    # Makefile) can report them without parsing the files again. If
+    # they are already recorded, the messages are repeated here.
+    assert isinstance(mh, Message_Handler)
+    assert isinstance(file_names, list)
+    assert isinstance(verify, bool)
+
+    if not TRLC_CACHE_DIR:
+        return process_trlc_files_uncached(mh, file_names)
+
+    # Without the verification api, trlc --verify just fails, so there
+    # is nothing we can record
+    verify = verify and VCG_API_AVAILABLE
+
+    slot_key    = hashlib.sha256()
+    content_key = hashlib.sha256()
+    for item in (sys.version, TRLC_VERSION, os.getcwd()):
+        slot_key.update(item.encode("UTF-8") + b"\0")
+    for file_name in file_names:
+        slot_key.update(file_name.encode("UTF-8") + b"\0")
+        with open(file_name, "rb") as fd:
+            content_key.update(hashlib.sha256(fd.read()).digest())
+
+    cache_file = os.path.join(TRLC_CACHE_DIR,
+                              slot_key.hexdigest() + ".pickle")
+
+    try:
+        with open(cache_file, "rb") as fd:
+            if pickle.load(fd) == content_key.hexdigest():
+                stab = pickle.load(fd)
+                os.utime(cache_file)
+                if not verify:
+                    return stab
+                result = load_verify_result(file_names)
+                if result is not None:
+                    sys.stdout.write(result[0])
+                    return stab
+    except Exception:
+        # Missing, stale, or unreadable; in all cases we just parse
+        # again and overwrite it.
+        pass
+
+    if verify:
+        stab = process_trlc_files_verified(mh, file_names)
+    else:
+        stab = process_trlc_files_uncached(mh, file_names)
+    if stab is None:
+        return None
+
+    os.makedirs(TRLC_CACHE_DIR, exist_ok=True)
+    handle, tmp_file = tempfile.mkstemp(dir=TRLC_CACHE_DIR, suffix=".tmp")
+    with os.fdopen(handle, "wb") as fd:
+        pickle.dump(content_key.hexdigest(), fd)
+        pickle.dump(stab, fd, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_file, cache_file)
+
+    evict_trlc_cache()
+
+    return stab
+
+
+def process_trlc_files_uncached(mh, file_names):
+    assert isinstance(mh, Message_Handler)
+    assert isinstance(file_names, list)
+
+    sm = Source_Manager(mh)
+    for file_name in file_names:
+        sm.register_file(file_name)
+    return sm.process()
+
+
+class Tee:
+    # A text stream writing to another one, and remembering everything
+    # written
+    def __init__(self, fd):
+        self.fd     = fd
+        self.buffer = io.StringIO()
+
+    def write(self, text):
+        self.fd.write(text)
+        return self.buffer.write(text)
+
+    def flush(self):
+        self.fd.flush()
+
+
+def process_trlc_files_verified(mh, file_names):
+    # Like process_trlc_files, but always parses the files, in
+    # verification mode, and records the outcome.
+    assert isinstance(mh, Message_Handler)
+    assert isinstance(file_names, list)
+
+    tee = Tee(sys.stdout)
+    with contextlib.redirect_stdout(tee):
+        sm = Source_Manager(mh, verify_mode=True)
+        ok = True
+        for file_name in file_names:
+            try:
+                ok &= sm.register_file(file_name)
+            except TRLC_Error:
+                ok = False
+        stab = sm.process() if ok else None
+
+    save_verify_result(file_names,
+                       tee.buffer.getvalue(),
+                       trlc_summary(sm, mh),
+                       0 if stab is not None and not mh.errors else 1)
+
+    return stab
+
+
+def trlc_summary(sm, mh):
+    # The last line printed by trlc
+    assert isinstance(sm, Source_Manager)
+    assert isinstance(mh, Message_Handler)
+
+    def count(parsed, total, what):
+        rv = str(parsed)
+        if parsed < total:
+            rv += " (of %u)" % total
+        rv += " " + what
+        if total == 0 or total > 1:
+            rv += "s"
+        return rv
+
+    def parsed(files):
+        return len([item
+                    for item in files.values()
+                    if item.primary or item.secondary])
+
+    summary = "Processed %s and %s and found" % (
+        count(parsed(sm.rsl_files), len(sm.rsl_files), "model"),
+        count(parsed(sm.trlc_files), len(sm.trlc_files), "requirement file"))
+    if mh.errors and mh.warnings:
+        summary += " %s" % count(mh.warnings, mh.warnings, "warning")
+        summary += " and %s" % count(mh.errors, mh.errors, "error")
+    elif mh.warnings:
+        summary += " %s" % count(mh.warnings, mh.warnings, "warning")
+    elif mh.errors:
+        summary += " %s" % count(mh.errors, mh.errors, "error")
+    else:
+        summary += " no issues"
+    if mh.suppressed:
+        summary += " with %u supressed messages" % mh.suppressed
+    return summary
+
+
+def verify_cache_file(file_names):
+    # The verification of a set of files does not depend on the order
+    # or spelling of their names, or the working directory, so that
+    # trlc-verify.py finds what the generators recorded.
+    key = hashlib.sha256()
+    for item in (sys.version, TRLC_VERSION):
+        key.update(item.encode("UTF-8") + b"\0")
+    for file_name in sorted(set(os.path.abspath(file_name)
+                                for file_name in file_names)):
+        key.update(file_name.encode("UTF-8") + b"\0")
+        with open(file_name, "rb") as fd:
+            key.update(hashlib.sha256(fd.read()).digest())
+    return os.path.join(TRLC_CACHE_DIR, "verify-%s.pickle" % key.hexdigest())
+
+
+def load_verify_result(file_names):
+    # The messages, summary line and exit code of trlc --verify on these
+    # files, or None if they are not recorded
+    assert isinstance(file_names, list)
+
+    if not TRLC_CACHE_DIR:
+        return None
+    cache_file = verify_cache_file(file_names)
+    try:
+        with open(cache_file, "rb") as fd:
+            result = pickle.load(fd)
+        os.utime(cache_file)
+        return result
+    except Exception:
+        return None
+
+
+def save_verify_result(file_names, messages, summary, returncode):
+    assert isinstance(file_names, list)
+    assert isinstance(messages, str)
+    assert isinstance(summary, str)
+    assert isinstance(returncode, int)
+
+    if not TRLC_CACHE_DIR:
+        return
+    os.makedirs(TRLC_CACHE_DIR, exist_ok=True)
+    handle, tmp_file = tempfile.mkstemp(dir=TRLC_CACHE_DIR, suffix=".tmp")
+    with os.fdopen(handle, "wb") as fd:
+        pickle.dump((messages, summary, returncode), fd)
+    os.replace(tmp_file, verify_cache_file(file_names))
+
+
+def evict_trlc_cache():
+    entries = []
+    for file_name in os.listdir(TRLC_CACHE_DIR):
+        if file_name.endswith(".pickle"):
+            file_name = os.path.join(TRLC_CACHE_DIR, file_name)
+            try:
+                entries.append((os.path.getmtime(file_name), file_name))
+            except OSError:
+                pass
+
+    for _, file_name in sorted(entries)[:-TRLC_CACHE_ENTRIES]:
+        try:
+            os.unlink(file_name)
+        except OSError:
+            pass
+
+
+class Discard_Output(Exception):
+    # Raise from the body of open_output, and catch outside of it, to
+    # write nothing, e.g. when the errors have already been reported
+    pass
+
+
+@contextlib.contextmanager
+def open_output(file_name):
+    # Use instead of open(file_name, "w"). The output is rendered in
+    # memory and only written if it differs from what is already
+    # there, so that unchanged outputs keep their mtime and Sphinx
+    # (and make) do not consider them out of date. Nothing is written
+    # if the body raises an exception.
+    assert isinstance(file_name, str)
+
+    fd = io.StringIO()
+    yield fd
+    write_if_changed(file_name, fd.getvalue())
+
+
+def write_if_changed(file_name, content):
+    # Atomically replace file_name with content, unless it already
+    # has precisely that content. Returns True if the file was
+    # written.
+    assert isinstance(file_name, str)
+    assert isinstance(content, str)
+
+    data = content.encode("UTF-8")
+    try:
+        if os.path.getsize(file_name) == len(data):
+            with open(file_name, "rb") as fd:
+                if fd.read() == data:
+                    return False
+    except FileNotFoundError:
+        pass
+
+    # The temporary file is unique to this process, so that several
+    # generators (e.g. under make -j) can safely race for the same
+    # output; the rename means readers never see a partial file.
+    tmp_file = "%s.%u.tmp" % (file_name, os.getpid())
+    try:
+        with open(tmp_file, "wb") as fd:
+            fd.write(data)
+        os.replace(tmp_file, file_name)
+    except BaseException:
+        if os.path.exists(tmp_file):
+            os.unlink(tmp_file)
+        raise
+
+    return True
+
+
+def step_label(step):
+    assert isinstance(step, str)
+
+    return "step-%s" % step.lower().replace("_", "-")
+
+
+@functools.lru_cache(maxsize=None)
+def load_step_index(file_name=STEP_INDEX):
+    # The index is loaded once per process. We return None if it does
+    # not exist (e.g. for the guidelines), in which case we cannot
+    # check step references.
+    try:
+        with open(file_name, "r", encoding="UTF-8") as fd:
+            return json.load(fd)
+    except FileNotFoundError:
+        return None
+
+
+def fmt_step_link(mh, location, step):
+    # The link to a step, referenced at location. A step that is not
+    # in the index is reported there (raising TRLC_Error).
+    assert isinstance(mh, Message_Handler)
+    assert isinstance(location, Location)
     assert isinstance(step, str)
 
     if step in ("ALL", "VARIOUS"):
         return "*(%s)*" % step.capitalize()
+
+    index = load_step_index()
+    if index is None:
+        return ":ref:`%s <%s>`" % (step, step_label(step))
+    elif step in index:
+        return ":ref:`%s <%s>`" % (step, index[step]["label"])
     else:
-        return ":ref:`%s <step-%s>`" % (step,
-                                        step.lower().replace("_", "-"))
+        mh.error(location,
+                 "%s is not a process step (see %s)" %
+                 (step, os.path.relpath(STEP_INDEX)))
@@ -22,43 +22,18 @@
 
 import difflib
 import textwrap
+import argparse
+import hashlib
+import json
 import csv
 import os
 import re
 
 from trlc.errors import Message_Handler
-from trlc.trlc import Source_Manager
-
-def mk_context(filename):
-    base = os.path.splitext(os.path.basename(filename))[0]
-    context = {
-        "tool"            : None,
-        "status"          : None,
-        "is_switch"       : True,
-        "warning_related" : False,
-    }
-    if base.startswith("compiler_"):
-        context["tool"]            = "GNAT_Compiler"
-        context["warning_related"] = "warning_" in base
-    elif base.startswith("gnatcheck_"):
-        context["tool"] = "GNAT_Check"
-    elif base.startswith("gnatprove_"):
-        context["tool"] = "SPARK"
-    else:
-        assert False
-    if base.endswith("_required"):
-        context["status"] = "Required"
-    elif base.endswith("_required_rules"):
-        context["status"] = "Required"
-        context["is_switch"] = False
-    elif base.endswith("_optional"):
-        context["status"] = "Allowed"
-    elif base.endswith("_banned"):
-        context["status"] = "Banned"
-    else:
-        assert False
 
-    return context
+import common
+import profiling
+from switches import mk_context, split_switch
 
 
 uid_counters = {
@@ -68,18 +43,7 @@ uid_counters = {
 }
 
 
-def fmt_switches(context, mixed_switches, justification, steps):
-    switches = []
-    for mixed_switch in mixed_switches.splitlines():
-        try:
-            switch, switch_note = mixed_switch.split(" ", 1)
-        except ValueError:
-            switch      = mixed_switch
-            switch_note = None
-        switches.append((switch, switch_note))
-
-    rv = []
-
+def uid_prefix(context):
     if context["tool"] == "GNAT_Compiler":
         uid = "Compiler_"
     elif context["tool"] == "GNAT_Check":
@@ -92,6 +56,17 @@ def fmt_switches(context, mixed_switches, justification, steps):
         uid += "Switch_"
     else:
         uid += "Rule_"
+    return uid
+
+
+def fmt_switches(context, mixed_switches, justification, steps,
+                 group_uid=None):
+    switches = [split_switch(mixed_switch)
+                for mixed_switch in mixed_switches.splitlines()]
+
+    rv = []
+
+    uid = uid_prefix(context)
     if len(switches) == 1:
         if context["is_switch"]:
             uid += switches[0][0].lstrip("-_").split("=", 1)[0]
@@ -119,6 +94,9 @@ def fmt_switches(context, mixed_switches, justification, steps):
         elif uid == "SPARK_Switch_prover" and context["status"] == "Banned":
             uid = "SPARK_Switch_Banned_Provers"
 
+    elif group_uid is not None:
+        uid = group_uid
+
     else:
         uid_counters[context["tool"]] += 1
         uid += "Group_%u" % uid_counters[context["tool"]]
@@ -194,15 +172,135 @@ def process(filename, steps):
             print("\n".join(rv))
 
 
+# In sync mode each row is identified by its table, its switches and
+# (for rows that are repeated verbatim) its occurrence, and the
+# identified rows keep their UID from one run to the next. The UIDs
+# are recorded in a JSON file next to the generated TRLC file, together
+# with a hash of each row, so that the records of unchanged rows can be
+# copied from the TRLC file instead of being generated again.
+
+GROUP_UID = re.compile(r"^(.*_Group_)([0-9]+)$")
+
+
+def digest(*parts):
+    return hashlib.sha256("\0".join(parts).encode("UTF-8")).hexdigest()
+
+
+def read_records(file_name):
+    # The records of a previously synced file, by UID
+    records = {}
+    try:
+        with open(file_name, "r", encoding="UTF-8") as fd:
+            content = fd.read()
+    except FileNotFoundError:
+        return records
+    for block in content.split("\n\n")[1:]:
+        header = block.split("\n", 2)[1]
+        records[header.split()[1]] = block.rstrip("\n")
+    return records
+
+
+def read_uid_map(file_name):
+    try:
+        with open(file_name, "r", encoding="UTF-8") as fd:
+            return json.load(fd)
+    except FileNotFoundError:
+        return {}
+
+
+def sync(csv_dir, trlc_file, uid_file, steps):
+    old_uids    = read_uid_map(uid_file)
+    old_records = read_records(trlc_file)
+    steps_hash  = digest(*sorted(steps))
+
+    # New groups are numbered after the groups that already exist, so
+    # that adding a row never renumbers the other groups.
+    counters = {}
+    for entry in old_uids.values():
+        match = GROUP_UID.match(entry["uid"])
+        if match:
+            counters[match.group(1)] = max(counters.get(match.group(1), 0),
+                                           int(match.group(2)))
+
+    new_uids  = {}
+    records   = []
+    generated = 0
+    for file_name in sorted(os.listdir(csv_dir)):
+        if not file_name.endswith(".csv"):
+            continue
+        context     = mk_context(file_name)
+        occurrences = {}
+        with open(os.path.join(csv_dir, file_name), "r") as fd_in:
+            for switches, justification in csv.reader(fd_in):
+                key = digest(file_name, switches)
+                occurrences[key] = occurrences.get(key, 0) + 1
+                if occurrences[key] > 1:
+                    key = digest(key, str(occurrences[key]))
+                row_hash = digest(steps_hash, switches, justification)
+
+                entry = old_uids.get(key)
+                if entry and entry["hash"] == row_hash and \
+                   entry["uid"] in old_records:
+                    uid    = entry["uid"]
+                    record = old_records[uid]
+                else:
+                    group_uid = None
+                    if len(switches.splitlines()) > 1:
+                        if entry and GROUP_UID.match(entry["uid"]):
+                            group_uid = entry["uid"]
+                        else:
+                            prefix = uid_prefix(context) + "Group_"
+                            counters[prefix] = counters.get(prefix, 0) + 1
+                            group_uid = prefix + str(counters[prefix])
+                    rv = fmt_switches(context, switches, justification, steps,
+                                      group_uid)
+                    uid    = rv[0].split()[1]
+                    record = "// from %s\n%s" % (file_name, "\n".join(rv))
+                    generated += 1
+
+                new_uids[key] = {"uid"  : uid,
+                                 "hash" : row_hash}
+                records.append(record)
+
+    common.write_if_changed(trlc_file,
+                            "\n\n".join(["package Switches"] + records) +
+                            "\n")
+    common.write_if_changed(uid_file,
+                            json.dumps(new_uids, indent=2, sort_keys=True) +
+                            "\n")
+    return generated, len(records)
+
+
 def main():
-    sm = Source_Manager(Message_Handler())
-    sm.register_file("../steps.rsl")
-    ast = sm.process()
-    pkg_steps = ast.lookup_assuming(sm.mh, "Steps")
-    enum_steps = pkg_steps.symbols.lookup_assuming(sm.mh, "ID")
-    steps = [lit.lower()
+    profiling.profile_script()
+
+    ap = argparse.ArgumentParser(
+        description="convert the switch tables to TRLC")
+    ap.add_argument("--sync",
+                    metavar="FILENAME",
+                    help=("update this TRLC file in place instead of"
+                          " printing all records, keeping the UIDs of"
+                          " existing rows stable"))
+    ap.add_argument("--uid-map",
+                    metavar="FILENAME",
+                    help=("where sync mode records the UIDs (default: the"
+                          " TRLC file name with .uids.json)"))
+    options = ap.parse_args()
+
+    mh = Message_Handler()
+    ast = common.process_trlc_files(mh, ["../steps.rsl"])
+    pkg_steps = ast.lookup_assuming(mh, "Steps")
+    enum_steps = pkg_steps.symbols.lookup_assuming(mh, "ID")
+    steps = {lit.lower()
              for lit in enum_steps.literals.all_names()
-             if lit.upper() != lit]
+             if lit.upper() != lit}
+
+    if options.sync:
+        uid_file = (options.uid_map or
+                    os.path.splitext(options.sync)[0] + ".uids.json")
+        generated, total = sync("..", options.sync, uid_file, steps)
+        print("%u of %u records generated" % (generated, total))
+        return
 
     print("package Switches")
     for f in sorted(os.listdir("..")):
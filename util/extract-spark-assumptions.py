@@ -23,9 +23,15 @@
 import os
 import sys
 import re
+import pickle
+import difflib
+import hashlib
 import argparse
+import tempfile
+import multiprocessing
 
-from pprint import pprint
+import common
+import profiling
 
 MARKER_ALL = "when using SPARK on all or part of a program"
 MARKER_PART = "when using SPARK on only part of a program"
@@ -33,16 +39,33 @@ MARKER_MODULAR = ("the complete SPARK program is analyzed"
                   " by calling GNATprove multiple times")
 MARKER_COMPILER = "when compiling the program with another compiler"
 
+# Where the list of assumptions lives in a spark2014 checkout
+ASSUMPTION_FILE = os.path.join("docs", "ug", "en", "source",
+                               "how_to_use_gnatprove_in_a_team.rst")
 
-def process(fd, lines):
+OUTPUT_FILE = os.path.join("source",
+                           "process",
+                           "tracing",
+                           "spark_assumptions",
+                           "spark-assumptions.trlc")
+
+# The assumptions parsed from each version of the user's guide are
+# cached here, keyed by the content of the file. Set
+# ASSUMPTION_CACHE_DIR to an empty string to disable the cache.
+ASSUMPTION_CACHE_DIR = os.environ.get(
+    "ASSUMPTION_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                 "..", "build", "assumption-cache"))
+
+
+def parse(lines):
+    # The (name, record) of each assumption, in the order of the list
     assumptions = []
     assumption_body = None
     assumption_name = None
     assumption_kind = None
     skip_until = None
 
-    fd.write("package Gnatprove_Assumptions\n\n")
-
     def emit_assumption():
         assert assumption_kind is not None
         while not assumption_body[-1].strip():
@@ -68,13 +91,14 @@ def process(fd, lines):
                            text_body,
                            flags=re.DOTALL)
 
-        fd.write("Gnatprove_Assumption %s {\n" % assumption_name)
-        fd.write("  kind = Kind.%s\n" % assumption_kind.capitalize())
-        fd.write("  text = '''\n")
+        record = "Gnatprove_Assumption %s {\n" % assumption_name
+        record += "  kind = Kind.%s\n" % assumption_kind.capitalize()
+        record += "  text = '''\n"
         for line in text_body.splitlines():
-            fd.write(line.rstrip() + "\n")
-        fd.write("  '''\n")
-        fd.write("}\n\n")
+            record += line.rstrip() + "\n"
+        record += "  '''\n"
+        record += "}\n"
+        assumptions.append((assumption_name, record))
 
     for line_no, line in enumerate(lines):
         if skip_until is not None and line_no < skip_until:
@@ -126,45 +150,179 @@ def process(fd, lines):
     if assumption_name is not None:
         emit_assumption()
 
+    return assumptions
 
-def main():
-    ap = argparse.ArgumentParser()
-    ap.add_argument("spark_repo",
-                    help = "root path to a spark 2014 checkout")
-    options = ap.parse_args()
 
-    if not os.path.isdir(options.spark_repo):
-        ap.error("%s not a directory" % options.spark_repo)
+def find_assumption_file(path):
+    # A spark2014 checkout, the directory with the sources of the
+    # user's guide, or the file itself
+    if os.path.isfile(path):
+        return path
+    for candidate in (os.path.join(path, ASSUMPTION_FILE),
+                      os.path.join(path, os.path.basename(ASSUMPTION_FILE))):
+        if os.path.isfile(candidate):
+            return candidate
+    return None
 
-    assumption_file = os.path.join(options.spark_repo,
-                                   "docs", "ug", "en", "source",
-                                   "how_to_use_gnatprove_in_a_team.rst")
 
-    if not os.path.isfile(assumption_file):
-        ap.error("cannot open %s" % assumption_file)
+def extract(assumption_file):
+    # The parsed assumptions of the given file, from the cache if
+    # possible
+    with open(assumption_file, "rb") as fd:
+        content = fd.read()
 
-    du_cfg = {
-        "report_level": 4,
-    }
+    if ASSUMPTION_CACHE_DIR:
+        key = hashlib.sha256()
+        with open(__file__, "rb") as fd:
+            key.update(hashlib.sha256(fd.read()).digest())
+        key.update(content)
+        cache_file = os.path.join(ASSUMPTION_CACHE_DIR,
+                                  key.hexdigest() + ".pickle")
+        try:
+            with open(cache_file, "rb") as fd:
+                return pickle.load(fd)
+        except Exception:
+            # Missing or unreadable; in both cases we just parse again
+            # and overwrite it.
+            pass
 
     in_relevant_section = False
     relevant_lines = []
-    with open(assumption_file, "r", encoding="UTF-8") as fd:
-        for raw_line in fd:
-            if raw_line.startswith("Complete List of Assumptions"):
-                in_relevant_section = True
-            if in_relevant_section:
-                relevant_lines.append(raw_line.rstrip())
-
-    with open(os.path.join("source",
-                           "process",
-                           "tracing",
-                           "spark_assumptions",
-                           "spark-assumptions.trlc"),
-              "w", encoding="UTF-8") as fd:
-        fd.write("// generated from %s, do not edit by hand\n\n" %
-                 os.path.basename(assumption_file))
-        process(fd, relevant_lines)
+    for raw_line in content.decode("UTF-8").splitlines():
+        if raw_line.startswith("Complete List of Assumptions"):
+            in_relevant_section = True
+        if in_relevant_section:
+            relevant_lines.append(raw_line.rstrip())
+    assumptions = parse(relevant_lines)
+
+    if ASSUMPTION_CACHE_DIR:
+        os.makedirs(ASSUMPTION_CACHE_DIR, exist_ok=True)
+        handle, tmp_file = tempfile.mkstemp(dir=ASSUMPTION_CACHE_DIR,
+                                            suffix=".tmp")
+        with os.fdopen(handle, "wb") as fd:
+            pickle.dump(assumptions, fd, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+
+    return assumptions
+
+
+def read_records(file_name):
+    # The (name, record) of each assumption in a file we generated
+    # earlier
+    assumptions = []
+    try:
+        with open(file_name, "r", encoding="UTF-8") as fd:
+            content = fd.read()
+    except FileNotFoundError:
+        return assumptions
+    for match in re.finditer(r"^Gnatprove_Assumption (\w+) \{\n.*?^\}\n",
+                             content,
+                             re.MULTILINE | re.DOTALL):
+        assumptions.append((match.group(1), match.group(0)))
+    return assumptions
+
+
+def report_diff(old_label, old, new_label, new):
+    # Print what changed between two versions, and return the number
+    # of changed assumptions
+    old = dict(old)
+    new = dict(new)
+    added   = [name for name in new if name not in old]
+    removed = [name for name in old if name not in new]
+    changed = [name for name in new if name in old and old[name] != new[name]]
+
+    print("%s -> %s: %u added, %u removed, %u changed" % (old_label,
+                                                          new_label,
+                                                          len(added),
+                                                          len(removed),
+                                                          len(changed)))
+    for name in added:
+        print("  added   %s" % name)
+    for name in removed:
+        print("  removed %s" % name)
+    for name in changed:
+        print("  changed %s" % name)
+        for line in difflib.unified_diff(old[name].splitlines(),
+                                         new[name].splitlines(),
+                                         lineterm="",
+                                         n=1):
+            if not line.startswith(("---", "+++")):
+                print("    %s" % line)
+
+    return len(added) + len(removed) + len(changed)
+
+
+def write_records(file_name, assumption_file, assumptions):
+    # Records are generated the same way each time, so only the records
+    # of changed assumptions differ from what is already there.
+    content = "// generated from %s, do not edit by hand\n\n" % \
+        os.path.basename(assumption_file)
+    content += "package Gnatprove_Assumptions\n\n"
+    for _, record in assumptions:
+        content += record + "\n"
+    return common.write_if_changed(file_name, content)
+
+
+def main():
+    profiling.profile_script()
+
+    ap = argparse.ArgumentParser(
+        description=("extract the assumptions from one or more versions"
+                     " of the SPARK user's guide"))
+    ap.add_argument("spark_repos",
+                    nargs="+",
+                    metavar="[LABEL=]PATH",
+                    help=("root path to a spark 2014 checkout, or to its"
+                          " user's guide sources; give several, oldest"
+                          " first, to see what changed between them"))
+    ap.add_argument("--output",
+                    default=OUTPUT_FILE,
+                    help=("the assumptions of the last version are"
+                          " written here (default: %(default)s)"))
+    ap.add_argument("--diff-only",
+                    action="store_true",
+                    default=False,
+                    help="only report the changes, do not write the output")
+    ap.add_argument("-j", "--jobs",
+                    type=int,
+                    default=os.cpu_count(),
+                    help="number of worker processes (default: %(default)s)")
+    options = ap.parse_args()
+
+    if options.jobs < 1:
+        ap.error("--jobs must be at least 1")
+
+    versions = []
+    for spec in options.spark_repos:
+        if "=" in spec:
+            label, path = spec.split("=", 1)
+        else:
+            label, path = os.path.basename(os.path.normpath(spec)), spec
+        if not os.path.exists(path):
+            ap.error("%s does not exist" % path)
+        assumption_file = find_assumption_file(path)
+        if assumption_file is None:
+            ap.error("cannot find %s in %s" % (ASSUMPTION_FILE, path))
+        versions.append((label, assumption_file))
+
+    files = [assumption_file for _, assumption_file in versions]
+    if options.jobs == 1 or len(files) == 1:
+        results = list(map(extract, files))
+    else:
+        with multiprocessing.Pool(min(options.jobs, len(files))) as pool:
+            results = pool.map(extract, files)
+
+    # Each version is compared with the one before, and the first with
+    # the assumptions we currently trace
+    previous_label = os.path.basename(options.output)
+    previous       = read_records(options.output)
+    for (label, _), assumptions in zip(versions, results):
+        report_diff(previous_label, previous, label, assumptions)
+        previous_label = label
+        previous       = assumptions
+
+    if not options.diff_only:
+        write_records(options.output, versions[-1][1], previous)
 
 
 if __name__ == "__main__":
@@ -22,68 +22,167 @@
 
 import os
 import re
+import json
+import bisect
+import hashlib
 import difflib
+import argparse
+import multiprocessing
+
+import common
+import profiling
+
+FUZZY_CUTOFF = 0.9
+
+
+def mk_step_index(all_steps):
+    # Index the step ids by length. A close match must pass difflib's
+    # real_quick_ratio, which depends only on the lengths involved, so
+    # we only ever need to compare a word against a few buckets.
+    index = {}
+    for step in all_steps:
+        index.setdefault(len(step), []).append(step)
+    return index
+
+
+def find_close_step(step_index, cache, word):
+    if word not in cache:
+        candidates = []
+        for length, steps in step_index.items():
+            if 2.0 * min(length, len(word)) / (length + len(word)) \
+               >= FUZZY_CUTOFF:
+                candidates += steps
+        matches = difflib.get_close_matches(word,
+                                            candidates,
+                                            n=1,
+                                            cutoff=FUZZY_CUTOFF)
+        cache[word] = matches[0] if matches else None
+    return cache[word]
+
+
+def hash_steps(all_steps):
+    return hashlib.sha256(
+        "\n".join(sorted(all_steps.values())).encode("UTF-8")).hexdigest()
+
+
+def hash_file(filename):
+    with open(filename, "rb") as fd:
+        return hashlib.sha256(fd.read()).hexdigest()
+
+
+def load_cache(cache_file, steps_hash):
+    # Any change to the set of steps invalidates every entry, since a
+    # word may have become (or stopped being) a step.
+    try:
+        with open(cache_file, "r", encoding="UTF-8") as fd:
+            cache = json.load(fd)
+    except (OSError, ValueError):
+        return {}
+    if cache.get("steps") != steps_hash:
+        return {}
+    return cache.get("files", {})
+
+
+def save_cache(cache_file, steps_hash, entries):
+    tmp_file = cache_file + ".tmp"
+    with open(tmp_file, "w", encoding="UTF-8") as fd:
+        json.dump({"steps" : steps_hash,
+                   "files" : entries},
+                  fd,
+                  indent=1,
+                  sort_keys=True)
+    os.replace(tmp_file, cache_file)
+
+
+def process(filename, all_steps, step_index, fuzzy_cache):
+    messages = []
 
-def process(filename, all_steps):
     with open(filename, "r", encoding="UTF-8") as fd:
         content = fd.read()
-    lines = [(0, "")]
-    for off, c in enumerate(content):
-        if c == "\n":
-            lines.append((off + 1, ""))
-        else:
-            lines[-1] = (lines[-1][0], lines[-1][1] + c)
+    lines       = content.split("\n")
+    line_starts = [0] + [match.end()
+                         for match in re.finditer("\n", content)]
 
     def get_line(offset):
-        line_no = 0
-        for line_offset, _ in lines:
-            if offset < line_offset:
-                return line_no
-            line_no += 1
-        return line_no
+        return bisect.bisect_right(line_starts, offset)
 
     fixlist = []
 
     for word in re.finditer("[a-zA-Z_]+", content):
         line_id = get_line(word.span(0)[0])
-        line_text = lines[line_id - 1][1]
+        line_text = lines[line_id - 1]
         if line_text.startswith("Step ID"):
             continue
         if "Steps.ID." in line_text:
             continue
 
         if word.group(0).lower() in all_steps:
-            print("%s:%u: unlinked step %s" % (filename,
-                                               line_id,
-                                               word.group(0)))
+            messages.append("%s:%u: unlinked step %s" %
+                            (filename,
+                             line_id,
+                             word.group(0)))
             fixlist.append((word.span(0)[0], word.span(0)[1]))
             continue
 
-        matches = difflib.get_close_matches(word.group(0).lower(),
-                                            list(all_steps),
-                                            n=1,
-                                            cutoff=0.9)
+        match = find_close_step(step_index,
+                                fuzzy_cache,
+                                word.group(0).lower())
 
-        if matches:
-            print("%s:%u: possibly unlinked step %s (did you mean %s?)" %
-                  (filename,
-                   get_line(word.span(0)[0]),
-                   word.group(0),
-                   matches[0]))
+        if match:
+            messages.append("%s:%u: possibly unlinked step %s"
+                            " (did you mean %s?)" %
+                            (filename,
+                             line_id,
+                             word.group(0),
+                             match))
 
-    for start, end in reversed(fixlist):
+    if not fixlist:
+        return messages, False
+
+    fixed_content = []
+    last_end      = 0
+    for start, end in fixlist:
         word = content[start:end].lower()
-        fixed_word = all_steps[word]
-        content = (content[:start] +
-                   ":ref:`step-%s`" % word.lower().replace("_", "-") +
-                   content[end:])
+        fixed_content.append(content[last_end:start])
+        fixed_content.append(":ref:`step-%s`" % word.replace("_", "-"))
+        last_end = end
+    fixed_content.append(content[last_end:])
+
+    common.write_if_changed(filename, "".join(fixed_content))
+
+    return messages, True
+
+
+def init_worker(all_steps):
+    global worker_state
+    worker_state = (all_steps, mk_step_index(all_steps), {})
 
-    with open(filename, "w", encoding="UTF-8") as fd:
-        fd.write(content)
+
+def process_in_worker(filename):
+    return process(filename, *worker_state)
 
 
 def main():
+    profiling.profile_script()
+
+    ap = argparse.ArgumentParser(
+        description="find and link unlinked process steps")
+    ap.add_argument("--cache",
+                    metavar="FILENAME",
+                    default=None,
+                    help=("remember results here, and skip files that"
+                          " have not changed since the last run"))
+    ap.add_argument("-j", "--jobs",
+                    type=int,
+                    default=os.cpu_count(),
+                    help="number of worker processes (default: %(default)s)")
+    options = ap.parse_args()
+
+    if options.jobs < 1:
+        ap.error("--jobs must be at least 1")
+
     all_steps = {}
+    worklist  = []
     for path, _, files in os.walk("."):
         for filename in files:
             if filename.endswith(".rst"):
@@ -94,12 +193,48 @@ def main():
                         if raw_line.startswith("Step ID:"):
                             all_steps[raw_line[8:].strip().lower()] = \
                                 raw_line[8:].strip()
-
-    for path, _, files in os.walk("."):
-        for filename in files:
             if os.path.splitext(filename)[1] in (".rst",
                                                  ".trlc"):
-                process(os.path.join(path, filename), all_steps)
+                worklist.append(os.path.join(path, filename))
+
+    steps_hash = hash_steps(all_steps)
+    if options.cache:
+        old_entries = load_cache(options.cache, steps_hash)
+    else:
+        old_entries = {}
+
+    entries = {}
+    todo    = []
+    for filename in worklist:
+        file_hash = hash_file(filename)
+        if old_entries.get(filename, {}).get("hash") == file_hash:
+            entries[filename] = old_entries[filename]
+        else:
+            entries[filename] = {"hash" : file_hash}
+            todo.append(filename)
+
+    if options.jobs == 1 or len(todo) <= 1:
+        init_worker(all_steps)
+        results = list(map(process_in_worker, todo))
+    else:
+        with multiprocessing.Pool(options.jobs,
+                                  init_worker,
+                                  (all_steps,)) as pool:
+            results = pool.map(process_in_worker, todo)
+
+    for filename, (messages, rewritten) in zip(todo, results):
+        entries[filename]["messages"] = messages
+        if rewritten:
+            # The messages describe the old content, so this file
+            # needs to be checked again on the next run.
+            entries[filename]["hash"] = None
+
+    for filename in worklist:
+        for message in entries[filename]["messages"]:
+            print(message)
+
+    if options.cache:
+        save_cache(options.cache, steps_hash, entries)
 
 
 if __name__ == "__main__":
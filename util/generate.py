@@ -0,0 +1,613 @@
+#!/usr/bin/env python3
+#
+# Ada/SPARK ISO 26262 Process Tools
+# Copyright (C) 2026 NVIDIA CORPORATION & AFFILIATES
+#
+# This file is part of the NVIDIA SPARK ISO 26262 Process.
+#
+# The NVIDIA SPARK ISO 26262 Process Tools are free software: you can
+# redistribute them and/or modify them under the terms of the GNU
+# General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later
+# version.
+#
+# The NVIDIA SPARK ISO 26262 Process Tools are distributed in the hope
+# that they will be useful, but WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with the NVIDIA SPARK ISO 26262 Process Tools. If not, see
+# <https://www.gnu.org/licenses/>.
+
+
+# Run all generators of the documentation, and optionally Sphinx
+# afterwards. This does the same as the Makefiles in source/, but the
+# generators are declared as one graph: each generator has its inputs
+# and outputs, and depends on the generators writing its inputs. The
+# generators whose dependencies are done run in parallel, and the ones
+# whose inputs are unchanged since their last successful run are
+# skipped.
+#
+# With --watch, it keeps running afterwards and watches source/ for
+# changes, re-running just the generators reading the changed files
+# (and the generators reading their outputs, if those change), and
+# then Sphinx. These re-runs happen inside this process, where the
+# generators and trlc are already loaded.
+
+import os
+import sys
+import time
+import glob
+import json
+import runpy
+import ctypes
+import select
+import struct
+import hashlib
+import argparse
+import traceback
+import subprocess
+import ctypes.util
+import concurrent.futures
+
+from trlc.version import TRLC_VERSION
+
+import common
+import profiling
+
+UTIL_DIR = os.path.dirname(os.path.abspath(__file__))
+TOP_DIR  = os.path.dirname(UTIL_DIR)
+SOURCE   = os.path.join(TOP_DIR, "source")
+PROCESS  = os.path.join(SOURCE, "process")
+
+# The input hashes of the last successful run of each generator
+STATE_FILE = os.path.join(TOP_DIR, "build", "generate-state.json")
+
+# Every generator imports these
+UTIL_MODULES = ("common.py", "profiling.py")
+
+# In watch mode, changes are collected until there has been none for
+# this long (in seconds), since editors often write a file in several
+# steps. The polling fallback checks for changes this often.
+SETTLE_TIME   = 0.2
+POLL_INTERVAL = 0.5
+
+# From <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM  = 0x00000040
+IN_MOVED_TO    = 0x00000080
+IN_CREATE      = 0x00000100
+IN_DELETE      = 0x00000200
+IN_Q_OVERFLOW  = 0x00004000
+IN_IGNORED     = 0x00008000
+IN_ISDIR       = 0x40000000
+IN_CLOEXEC     = 0x00080000
+INOTIFY_MASK   = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+                  IN_CREATE | IN_DELETE)
+
+
+class Node:
+    # A generator: a command run in a directory, with the files it
+    # reads and writes (relative to that directory).
+    def __init__(self, name, cwd, command, inputs, outputs, after=()):
+        assert isinstance(name, str)
+        assert isinstance(cwd, str)
+        assert isinstance(command, list)
+        assert isinstance(inputs, list)
+        assert isinstance(outputs, list)
+
+        self.name    = name
+        self.cwd     = cwd
+        self.command = command
+        self.inputs  = [os.path.normpath(os.path.join(cwd, file_name))
+                        for file_name in inputs]
+        self.outputs = [os.path.normpath(os.path.join(cwd, file_name))
+                        for file_name in outputs]
+        self.after   = set(after)
+        self.deps    = set()
+
+    def key(self):
+        # The hash of everything the result depends on
+        key = hashlib.sha256()
+        for item in [TRLC_VERSION, self.cwd] + self.command:
+            key.update(item.encode("UTF-8") + b"\0")
+        for file_name in sorted(self.inputs):
+            key.update(file_name.encode("UTF-8") + b"\0")
+            with open(file_name, "rb") as fd:
+                key.update(hashlib.sha256(fd.read()).digest())
+        return key.hexdigest()
+
+    def run(self):
+        # Returns the exit code and everything written by the command,
+        # so that the output of parallel generators is not interleaved
+        result = subprocess.run(self.command,
+                                cwd=self.cwd,
+                                stdout=subprocess.PIPE,
+                                stderr=subprocess.STDOUT)
+        return result.returncode, result.stdout.decode("UTF-8",
+                                                       errors="replace")
+
+    def run_in_process(self):
+        # Like run, but the command is run in this process, and writes
+        # its output directly.
+        old_argv = sys.argv
+        old_cwd  = os.getcwd()
+        # The step index may have been regenerated since the last run
+        common.load_step_index.cache_clear()
+        try:
+            os.chdir(self.cwd)
+            assert self.command[0] == sys.executable
+            sys.argv = self.command[1:]
+            runpy.run_path(self.command[1], run_name="__main__")
+            returncode = 0
+        except SystemExit as exit:
+            if exit.code is None:
+                returncode = 0
+            elif isinstance(exit.code, int):
+                returncode = exit.code
+            else:
+                print(exit.code)
+                returncode = 1
+        except Exception:
+            # E.g. a source file saved half-way; report it like a
+            # failing command instead of ending the watch
+            traceback.print_exc()
+            returncode = 1
+        finally:
+            sys.argv = old_argv
+            os.chdir(old_cwd)
+            sys.stdout.flush()
+        return returncode, ""
+
+
+class Inline_Executor(concurrent.futures.Executor):
+    # Runs everything in the calling thread, when it is submitted
+    def submit(self, fn, *args, **kwargs):
+        future = concurrent.futures.Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as exc:
+            future.set_exception(exc)
+        return future
+
+
+def files(directory, pattern):
+    return sorted(os.path.basename(file_name)
+                  for file_name in glob.glob(os.path.join(directory,
+                                                          pattern)))
+
+
+def script(name, *args):
+    return [sys.executable, os.path.join(UTIL_DIR, name)] + list(args)
+
+
+def script_inputs(name, cwd):
+    return [os.path.relpath(os.path.join(UTIL_DIR, file_name), cwd)
+            for file_name in (name,) + UTIL_MODULES]
+
+
+def mk_graph():
+    nodes = []
+
+    # source/process/Makefile
+    cwd = PROCESS
+    rst = files(cwd, "*.rst") + ["process/" + file_name
+                                 for file_name in files(cwd + "/process",
+                                                        "*.rst")]
+    nodes.append(Node("steps",
+                      cwd,
+                      script("build-step-index.py",
+                             "--rsl", "steps.rsl",
+                             "--index", "steps.json",
+                             *rst),
+                      rst + script_inputs("build-step-index.py", cwd),
+                      ["steps.rsl", "steps.json"]))
+
+    # source/process/checklist/Makefile
+    cwd    = os.path.join(PROCESS, "checklist")
+    models = files(cwd, "*.trlc")
+    rsl    = files(cwd, "*.rsl") + ["../steps.rsl"]
+    nodes.append(Node("checklist",
+                      cwd,
+                      script("checklist-generator.py", *models),
+                      models + rsl + ["../steps.json"] +
+                      script_inputs("checklist-generator.py", cwd),
+                      [os.path.splitext(file_name)[0] + ".rst"
+                       for file_name in models]))
+    nodes.append(Node("checklist-verify",
+                      cwd,
+                      script("trlc-verify.py", "../steps.rsl", "."),
+                      models + rsl + script_inputs("trlc-verify.py", cwd),
+                      [],
+                      after=["checklist"]))
+
+    # source/process/tracing/spark_assumptions/Makefile
+    cwd    = os.path.join(PROCESS, "tracing", "spark_assumptions")
+    models = files(cwd, "*.trlc")
+    rsl    = files(cwd, "*.rsl") + ["../../steps.rsl"]
+    nodes.append(Node("spark-assumptions",
+                      cwd,
+                      script("assumption-tracing.py", "--source-dir=../../"),
+                      models + rsl + ["../../steps.json"] +
+                      script_inputs("assumption-tracing.py", cwd),
+                      ["tracing-all.inc",
+                       "tracing-compiler.inc",
+                       "tracing-modular.inc",
+                       "tracing-part.inc"]))
+    nodes.append(Node("spark-assumptions-verify",
+                      cwd,
+                      script("trlc-verify.py", "../../steps.rsl", "."),
+                      models + rsl + script_inputs("trlc-verify.py", cwd),
+                      [],
+                      after=["spark-assumptions"]))
+
+    # source/process/tracing/iso_26262/Makefile
+    cwd    = os.path.join(PROCESS, "tracing", "iso_26262")
+    models = files(cwd, "*.trlc")
+    rsl    = files(cwd, "*.rsl") + ["../../steps.rsl"]
+    nodes.append(Node("iso-26262",
+                      cwd,
+                      script("iso-tracing.py", *(models + rsl),
+                             "--all-sections", "all_sections.txt"),
+                      models + rsl + ["../../steps.json"] +
+                      script_inputs("iso-tracing.py", cwd),
+                      [os.path.splitext(file_name)[0] + ext
+                       for file_name in models
+                       for ext in (".inc", ".sections", ".verbatim")] +
+                      ["all_sections.txt"]))
+    nodes.append(Node("iso-26262-verify",
+                      cwd,
+                      script("trlc-verify.py", "../../steps.rsl", "."),
+                      models + rsl + script_inputs("trlc-verify.py", cwd),
+                      [],
+                      after=["iso-26262"]))
+
+    # A node depends on the nodes writing any of its inputs, and the
+    # nodes it is explicitly run after (the verification of a
+    # directory reports what its generator recorded)
+    writers = {}
+    for node in nodes:
+        for file_name in node.outputs:
+            assert file_name not in writers
+            writers[file_name] = node
+    for node in nodes:
+        node.deps = node.after | {writers[file_name].name
+                                  for file_name in node.inputs
+                                  if file_name in writers}
+
+    return nodes
+
+
+def read_state(file_name):
+    try:
+        with open(file_name, "r", encoding="UTF-8") as fd:
+            return json.load(fd)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def write_state(file_name, state):
+    os.makedirs(os.path.dirname(file_name), exist_ok=True)
+    tmp_file = "%s.%u.tmp" % (file_name, os.getpid())
+    with open(tmp_file, "w", encoding="UTF-8") as fd:
+        json.dump(state, fd, indent=2, sort_keys=True)
+        fd.write("\n")
+    os.replace(tmp_file, file_name)
+
+
+def affected(nodes, file_names):
+    # The nodes reading (or writing) any of the given files, and the
+    # nodes reading their outputs, and so on
+    selected = {node.name
+                for node in nodes
+                if not file_names.isdisjoint(node.inputs) or
+                not file_names.isdisjoint(node.outputs)}
+    while True:
+        more = {node.name
+                for node in nodes
+                if node.name not in selected and node.deps & selected}
+        if not more:
+            return [node for node in nodes if node.name in selected]
+        selected |= more
+
+
+def generate(nodes, state, jobs, force, in_process=False):
+    # Run the nodes in dependency order, up to jobs at a time (or one
+    # after the other in this process). Dependencies on nodes that are
+    # not given are considered done. Returns True if all of them
+    # succeeded (or were up to date); the state is updated in place
+    # for every node that succeeded.
+    waiting = {node.name: node for node in nodes}
+    names   = set(waiting)
+    done    = set()
+    running = {}
+    ok      = True
+
+    if in_process:
+        executor = Inline_Executor()
+    else:
+        executor = concurrent.futures.ThreadPoolExecutor(jobs)
+
+    with executor as pool:
+        while waiting or running:
+            # Start everything whose dependencies are done, unless
+            # something already failed
+            for node in list(waiting.values()):
+                if not ok or not node.deps & names <= done:
+                    continue
+                del waiting[node.name]
+                key = node.key()
+                if not force and \
+                   state.get(node.name) == key and \
+                   all(os.path.exists(file_name)
+                       for file_name in node.outputs):
+                    print("[%s] up to date" % node.name)
+                    done.add(node.name)
+                    continue
+                if in_process:
+                    future = pool.submit(node.run_in_process)
+                else:
+                    future = pool.submit(node.run)
+                running[future] = (node, key)
+
+            if not running:
+                if waiting and ok:
+                    # Only possible if a dependency is waiting for a
+                    # skipped node, i.e. there is a cycle
+                    print("error: cyclic dependencies between %s" %
+                          ", ".join(sorted(waiting)))
+                    ok = False
+                break
+
+            finished, _ = concurrent.futures.wait(
+                running,
+                return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in finished:
+                node, key = running.pop(future)
+                returncode, output = future.result()
+                if output:
+                    sys.stdout.write(output)
+                if returncode == 0:
+                    print("[%s] done" % node.name)
+                    state[node.name] = key
+                    done.add(node.name)
+                else:
+                    print("[%s] failed with exit code %d" %
+                          (node.name, returncode))
+                    state.pop(node.name, None)
+                    ok = False
+            sys.stdout.flush()
+
+    return ok
+
+
+def ignored(file_name):
+    # Editor backup and swap files, and the temporary files of
+    # common.write_if_changed
+    base = os.path.basename(file_name)
+    return (base.startswith((".", "#")) or
+            base.endswith(("~", ".tmp", ".swp")) or
+            "__pycache__" in file_name)
+
+
+def all_files(root):
+    # All files below root, with their mtime and size
+    rv = {}
+    for path, _, file_names in os.walk(root):
+        for file_name in file_names:
+            file_name = os.path.join(path, file_name)
+            try:
+                info = os.stat(file_name)
+            except OSError:
+                continue
+            rv[file_name] = (info.st_mtime_ns, info.st_size)
+    return rv
+
+
+def watch_inotify(root):
+    # Returns an iterator over the sets of files changed below root,
+    # using inotify. Raises OSError if inotify is not available.
+    libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    if not hasattr(libc, "inotify_init1"):
+        raise OSError("inotify is not available")
+    fd = libc.inotify_init1(IN_CLOEXEC)
+    if fd < 0:
+        raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    watches = {}
+
+    def add(directory):
+        for path, _, _ in os.walk(directory):
+            wd = libc.inotify_add_watch(fd,
+                                        os.fsencode(path),
+                                        INOTIFY_MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(),
+                              "cannot watch %s" % path)
+            watches[wd] = path
+
+    def changes():
+        changed = set()
+        while True:
+            # Once something changed, wait until it settles
+            ready, _, _ = select.select([fd], [], [],
+                                        SETTLE_TIME if changed else None)
+            if not ready:
+                yield changed
+                changed = set()
+                continue
+
+            data = os.read(fd, 1 << 16)
+            pos  = 0
+            while pos < len(data):
+                wd, mask, _, length = struct.unpack_from("iIII", data, pos)
+                name = os.fsdecode(data[pos + 16:pos + 16 + length]
+                                   .rstrip(b"\0"))
+                pos += 16 + length
+
+                if mask & IN_Q_OVERFLOW:
+                    # Events were lost, so anything may have changed
+                    changed |= set(all_files(root))
+                elif mask & IN_IGNORED:
+                    watches.pop(wd, None)
+                elif wd not in watches:
+                    pass
+                elif mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        add(os.path.join(watches[wd], name))
+                        changed |= set(all_files(os.path.join(watches[wd],
+                                                              name)))
+                else:
+                    changed.add(os.path.join(watches[wd], name))
+
+    add(root)
+    return changes()
+
+
+def watch_poll(root):
+    # Like watch_inotify, but by looking at all files every now and
+    # then
+    old     = all_files(root)
+    changed = set()
+    while True:
+        time.sleep(POLL_INTERVAL)
+        new  = all_files(root)
+        diff = {file_name
+                for file_name in old.keys() | new.keys()
+                if old.get(file_name) != new.get(file_name)}
+        old = new
+        if diff:
+            changed |= diff
+        elif changed:
+            yield changed
+            changed = set()
+
+
+def watch(options, state, sphinx):
+    # Re-run the generators reading the changed files, one after the
+    # other in this process, and then Sphinx (which only rebuilds the
+    # documents that changed).
+    changes = None
+    if not options.poll:
+        try:
+            changes = watch_inotify(SOURCE)
+        except OSError as err:
+            print("cannot use inotify (%s), polling instead" % err)
+    if changes is None:
+        changes = watch_poll(SOURCE)
+    print("watching %s for changes" % os.path.relpath(SOURCE))
+    sys.stdout.flush()
+
+    known = set(all_files(SOURCE))
+    for changed in changes:
+        # We are not interested in the outputs we write ourselves
+        # (unless they are gone), nor in files that came and went in
+        # the meantime (such as the temporary files of sed -i).
+        nodes   = mk_graph()
+        outputs = {file_name for node in nodes for file_name in node.outputs}
+        present = set(all_files(SOURCE))
+        changed = {file_name
+                   for file_name in changed
+                   if not ignored(file_name) and
+                   (file_name not in outputs or file_name not in present) and
+                   (file_name in present or file_name in known)}
+        known = present
+        if not changed:
+            continue
+
+        start = time.time()
+        for file_name in sorted(changed):
+            print("changed: %s" % os.path.relpath(file_name))
+        ok = generate(affected(nodes, changed),
+                      state,
+                      1,
+                      False,
+                      in_process=True)
+        write_state(options.state, state)
+        if ok and sphinx:
+            ok = subprocess.run(sphinx, cwd=TOP_DIR).returncode == 0
+        print("%s after %.1fs" % ("done" if ok else "failed",
+                                  time.time() - start))
+        sys.stdout.flush()
+
+
+def main():
+    profiling.profile_script()
+
+    ap = argparse.ArgumentParser(
+        description=("run the documentation generators in parallel, then"
+                     " optionally Sphinx"))
+    ap.add_argument("-j", "--jobs",
+                    type=int,
+                    default=os.cpu_count(),
+                    help="number of parallel generators (default: %(default)s)")
+    ap.add_argument("--force",
+                    action="store_true",
+                    default=False,
+                    help="run all generators, even if up to date")
+    ap.add_argument("--state",
+                    default=STATE_FILE,
+                    help="where the input hashes are recorded")
+    ap.add_argument("--sphinx",
+                    metavar="BUILDER",
+                    help="run sphinx-build -M BUILDER afterwards")
+    ap.add_argument("--sphinx-build",
+                    default="sphinx-build",
+                    metavar="COMMAND",
+                    help="the sphinx-build to run (default: %(default)s)")
+    ap.add_argument("--watch",
+                    action="store_true",
+                    default=False,
+                    help=("keep running, and regenerate (and run Sphinx)"
+                          " whenever something in source/ changes"))
+    ap.add_argument("--poll",
+                    action="store_true",
+                    default=False,
+                    help="in watch mode, poll for changes instead of inotify")
+    ap.add_argument("sphinx_options",
+                    nargs=argparse.REMAINDER,
+                    help="further options for sphinx-build, after --")
+    options = ap.parse_args()
+
+    if options.jobs < 1:
+        ap.error("--jobs must be at least 1")
+    sphinx_options = options.sphinx_options
+    if sphinx_options[:1] == ["--"]:
+        sphinx_options = sphinx_options[1:]
+    if sphinx_options and not options.sphinx:
+        ap.error("sphinx options given without --sphinx")
+
+    if options.sphinx:
+        sphinx = options.sphinx_build.split() + ["-M",
+                                                 options.sphinx,
+                                                 "source",
+                                                 "build"] + sphinx_options
+    else:
+        sphinx = None
+
+    state = read_state(options.state)
+    ok    = generate(mk_graph(), state, options.jobs, options.force)
+    write_state(options.state, state)
+
+    if options.watch:
+        # A failure is reported, but fixing it is what watching is for
+        if ok and sphinx:
+            subprocess.run(sphinx, cwd=TOP_DIR)
+        try:
+            watch(options, state, sphinx)
+        except KeyboardInterrupt:
+            pass
+        return
+
+    if not ok:
+        sys.exit(1)
+
+    if sphinx:
+        sys.stdout.flush()
+        os.chdir(TOP_DIR)
+        os.execvp(sphinx[0], sphinx)
+
+
+if __name__ == "__main__":
+    main()
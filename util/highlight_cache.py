@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+#
+# Ada/SPARK ISO 26262 Process Tools
+# Copyright (C) 2026 NVIDIA CORPORATION & AFFILIATES
+#
+# This file is part of the NVIDIA SPARK ISO 26262 Process.
+#
+# The NVIDIA SPARK ISO 26262 Process Tools are free software: you can
+# redistribute them and/or modify them under the terms of the GNU
+# General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later
+# version.
+#
+# The NVIDIA SPARK ISO 26262 Process Tools are distributed in the hope
+# that they will be useful, but WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with the NVIDIA SPARK ISO 26262 Process Tools. If not, see
+# <https://www.gnu.org/licenses/>.
+
+
+# Highlighted code blocks are cached on disk, keyed by the lexer, the
+# options and the code, so that unchanged code blocks are not lexed and
+# formatted again by later builds (HTML or LaTeX, incremental or
+# not). Set HIGHLIGHT_CACHE_DIR to an empty string to disable the
+# cache.
+
+import os
+import sys
+import hashlib
+import tempfile
+
+import pygments
+import sphinx
+import sphinx.highlighting
+from sphinx.util import logging
+
+HIGHLIGHT_CACHE_DIR = os.environ.get(
+    "HIGHLIGHT_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                 "..", "build", "highlight-cache"))
+
+# Once the cache is larger than this (in bytes), the least recently
+# used entries are removed at the end of the build.
+HIGHLIGHT_CACHE_SIZE = 32 * 2**20
+
+# Bump this when changing how entries are keyed or stored
+HIGHLIGHT_CACHE_VERSION = 1
+
+logger = logging.getLogger(__name__)
+
+
+class Highlight_Cache:
+    def __init__(self, cache_dir, languages):
+        assert isinstance(cache_dir, str)
+        assert isinstance(languages, tuple)
+
+        self.cache_dir = cache_dir
+        self.languages = languages
+        self.salt      = None
+        self.hits      = 0
+        self.misses    = 0
+
+    def compute_salt(self):
+        # Entries are only valid for the same versions of the tools and
+        # of the lexers themselves.
+        salt = hashlib.sha256()
+        salt.update(repr((HIGHLIGHT_CACHE_VERSION,
+                          pygments.__version__,
+                          sphinx.__version__)).encode("UTF-8"))
+        for language in self.languages:
+            lexer = sphinx.highlighting.lexer_classes[language]
+            if not isinstance(lexer, type):
+                lexer = type(lexer)
+            salt.update(language.encode("UTF-8"))
+            with open(sys.modules[lexer.__module__].__file__, "rb") as fd:
+                salt.update(fd.read())
+        self.salt = salt.hexdigest()
+
+    def key(self, highlighter, source, lang, opts, force, kwargs):
+        key = hashlib.sha256()
+        key.update(repr((self.salt,
+                         highlighter.dest,
+                         sorted(highlighter.formatter_args.items()),
+                         lang,
+                         sorted((opts or {}).items()),
+                         force,
+                         sorted(kwargs.items()))).encode("UTF-8"))
+        key.update(source.encode("UTF-8"))
+        return os.path.join(self.cache_dir, key.hexdigest() + ".txt")
+
+    def lookup(self, cache_file):
+        try:
+            with open(cache_file, "r", encoding="UTF-8") as fd:
+                content = fd.read()
+            # The modification time tracks the last use
+            os.utime(cache_file)
+            return content
+        except OSError:
+            return None
+
+    def store(self, cache_file, content):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        handle, tmp_file = tempfile.mkstemp(dir=self.cache_dir,
+                                            suffix=".tmp")
+        with os.fdopen(handle, "w", encoding="UTF-8") as fd:
+            fd.write(content)
+        os.replace(tmp_file, cache_file)
+
+    def wrap(self, highlighter):
+        # Replace the highlight_block method of the given PygmentsBridge
+        # with one going through the cache for our languages.
+        highlight_block = highlighter.highlight_block
+
+        def cached_highlight_block(source, lang, opts=None, force=False,
+                                   location=None, **kwargs):
+            if lang not in self.languages or not isinstance(source, str):
+                return highlight_block(source, lang, opts, force, location,
+                                       **kwargs)
+
+            cache_file = self.key(highlighter, source, lang, opts, force,
+                                  kwargs)
+            content = self.lookup(cache_file)
+            if content is None:
+                self.misses += 1
+                content = highlight_block(source, lang, opts, force, location,
+                                          **kwargs)
+                self.store(cache_file, content)
+            else:
+                self.hits += 1
+            return content
+
+        highlighter.highlight_block = cached_highlight_block
+
+    def evict(self):
+        entries = []
+        for file_name in os.listdir(self.cache_dir):
+            if file_name.endswith(".txt"):
+                file_name = os.path.join(self.cache_dir, file_name)
+                try:
+                    entries.append((os.path.getmtime(file_name),
+                                    os.path.getsize(file_name),
+                                    file_name))
+                except OSError:
+                    pass
+
+        size = sum(entry[1] for entry in entries)
+        for _, entry_size, file_name in sorted(entries):
+            if size <= HIGHLIGHT_CACHE_SIZE:
+                break
+            try:
+                os.unlink(file_name)
+            except OSError:
+                pass
+            size -= entry_size
+
+
+def setup_sphinx(app, languages):
+    # Cache the highlighting of code blocks in the given languages. Our
+    # own lexers never produce error tokens, so there are no warnings
+    # that a cache hit would lose.
+    if not HIGHLIGHT_CACHE_DIR:
+        return
+
+    cache = Highlight_Cache(HIGHLIGHT_CACHE_DIR, tuple(languages))
+
+    def on_builder_inited(app):
+        cache.compute_salt()
+
+        # The HTML builders share their highlighters with all
+        # translators, the LaTeX translators create their own.
+        for name in ("highlighter", "dark_highlighter"):
+            if getattr(app.builder, name, None):
+                cache.wrap(getattr(app.builder, name))
+
+        if app.builder.format == "latex":
+            translator = app.builder.get_translator_class()
+
+            class Caching_Translator(translator):
+                def __init__(self, *args, **kwargs):
+                    super().__init__(*args, **kwargs)
+                    cache.wrap(self.highlighter)
+
+            app.set_translator(app.builder.name, Caching_Translator,
+                               override=True)
+
+    def on_build_finished(app, exception):
+        logger.verbose("highlight cache: %u hits, %u misses",
+                       cache.hits, cache.misses)
+        if os.path.isdir(cache.cache_dir):
+            cache.evict()
+
+    app.connect("builder-inited", on_builder_inited)
+    app.connect("build-finished", on_build_finished)
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+#
+# Ada/SPARK ISO 26262 Process Tools
+# Copyright (C) 2026 NVIDIA CORPORATION & AFFILIATES
+#
+# This file is part of the NVIDIA SPARK ISO 26262 Process.
+#
+# The NVIDIA SPARK ISO 26262 Process Tools are free software: you can
+# redistribute them and/or modify them under the terms of the GNU
+# General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later
+# version.
+#
+# The NVIDIA SPARK ISO 26262 Process Tools are distributed in the hope
+# that they will be useful, but WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with the NVIDIA SPARK ISO 26262 Process Tools. If not, see
+# <https://www.gnu.org/licenses/>.
+
+
+
+# Ingest the answers of checklist reviews and roll them up into the
+# completion of each unit, process step and scope.
+#
+# Answers are csv (with a unit,item,status header; other columns are
+# ignored) or ndjson files, one answer per line, where item is an id
+# as in the documents of instantiate-checklists.py (e.g.
+# software-unit-design/2.1.3) and status is one of STATUSES. The
+# latest answer for a unit and item wins, so ingesting the same
+# answers twice changes nothing.
+#
+# The status of every unit and item, and the roll-up counters, are
+# kept in a state file. Ingesting a delta only touches the counters of
+# the answers in it; everything is only recounted when the checklists
+# or the manifest change.
+
+import os
+import sys
+import csv
+import json
+import pickle
+import hashlib
+import argparse
+import tempfile
+import collections
+
+from trlc.errors import Message_Handler
+
+import common
+import profiling
+import checklists
+
+# The status codes we store for each unit and item
+STATUSES = {
+    "open"   : 0,
+    "passed" : 1,
+    "failed" : 2,
+    "n/a"    : 3,
+}
+COMPLETE = (STATUSES["passed"], STATUSES["n/a"])
+FAILED   = STATUSES["failed"]
+
+# Bump this when changing what the state file contains
+STATE_VERSION = 1
+
+
+def new_counter():
+    # Applicable, complete and failed items
+    return [0, 0, 0]
+
+
+class Rollup:
+    # The statuses of all units, and for each unit, step and scope the
+    # number of applicable, complete and failed items
+    def __init__(self, items, units, key):
+        assert isinstance(items, list)
+        assert isinstance(units, list)
+        assert isinstance(key, str)
+
+        self.key      = key
+        self.items    = [item["id"] for item in items]
+        self.statuses = {}
+        self.recount(items, units)
+
+    def recount(self, items, units):
+        self.index      = {item_id: n for n, item_id in enumerate(self.items)}
+        self.item_steps = [item["steps"] for item in items]
+        self.item_scope = [item["scope"] for item in items]
+        self.applicable = {unit["name"]: bytes(item["scope"] in unit["scopes"]
+                                               for item in items)
+                           for unit in units}
+        self.counters   = {"unit"  : collections.defaultdict(new_counter),
+                           "step"  : collections.defaultdict(new_counter),
+                           "scope" : collections.defaultdict(new_counter)}
+        for unit in units:
+            statuses = self.statuses.setdefault(unit["name"],
+                                                bytearray(len(self.items)))
+            for n, applicable in enumerate(self.applicable[unit["name"]]):
+                if applicable:
+                    self.count(unit["name"], n, None, statuses[n])
+
+    def groups(self, unit, n):
+        yield self.counters["unit"][unit]
+        for step in self.item_steps[n]:
+            yield self.counters["step"][step]
+        yield self.counters["scope"][self.item_scope[n]]
+
+    def count(self, unit, n, old, new):
+        # Move one applicable item from status old (None if it was not
+        # counted yet) to new
+        for counter in self.groups(unit, n):
+            if old is None:
+                counter[0] += 1
+            else:
+                counter[1] -= old in COMPLETE
+                counter[2] -= old == FAILED
+            counter[1] += new in COMPLETE
+            counter[2] += new == FAILED
+
+    def update(self, unit, item_id, status):
+        # Returns an error message, or None
+        if unit not in self.applicable:
+            return "unknown unit %s" % unit
+        if item_id not in self.index:
+            return "unknown item %s" % item_id
+        if status not in STATUSES:
+            return "unknown status %s" % status
+        n        = self.index[item_id]
+        statuses = self.statuses[unit]
+        new      = STATUSES[status]
+        if statuses[n] != new:
+            if self.applicable[unit][n]:
+                self.count(unit, n, statuses[n], new)
+            statuses[n] = new
+        return None
+
+    def report(self):
+        def fmt(counter):
+            applicable, complete, failed = counter
+            return {"applicable" : applicable,
+                    "complete"   : complete,
+                    "failed"     : failed,
+                    "open"       : applicable - complete - failed,
+                    "percent"    : round(100.0 * complete / applicable, 1)
+                                   if applicable else 100.0}
+
+        total = [0, 0, 0]
+        for counter in self.counters["unit"].values():
+            total = [a + b for a, b in zip(total, counter)]
+        return {
+            "total"  : fmt(total),
+            "units"  : {unit: fmt(counter)
+                        for unit, counter in
+                        sorted(self.counters["unit"].items())},
+            "steps"  : {step: fmt(counter)
+                        for step, counter in
+                        sorted(self.counters["step"].items())},
+            "scopes" : {scope: fmt(counter)
+                        for scope, counter in
+                        sorted(self.counters["scope"].items())},
+        }
+
+
+def load_state(file_name, items, units, key):
+    # The roll-up from the state file, brought up to date with the
+    # given checklists and manifest if they changed
+    try:
+        with open(file_name, "rb") as fd:
+            version = pickle.load(fd)
+            if version != STATE_VERSION:
+                raise ValueError("version %r, not %r" % (version,
+                                                         STATE_VERSION))
+            rollup = pickle.load(fd)
+    except FileNotFoundError:
+        return Rollup(items, units, key)
+    except (ValueError, EOFError, pickle.UnpicklingError) as err:
+        # Written by an older version of this script, or damaged
+        print("%s: warning: cannot use state (%s), starting afresh; the"
+              " earlier answers must be ingested again" %
+              (file_name, str(err) or err.__class__.__name__),
+              file=sys.stderr)
+        return Rollup(items, units, key)
+
+    if rollup.key != key:
+        # Keep the answers we have, by unit and item id, and count
+        # everything again.
+        old_index    = {item_id: n for n, item_id in enumerate(rollup.items)}
+        old_statuses = rollup.statuses
+        rollup.key      = key
+        rollup.items    = [item["id"] for item in items]
+        rollup.statuses = {}
+        for unit in units:
+            old = old_statuses.get(unit["name"])
+            new = bytearray(len(rollup.items))
+            if old is not None:
+                for n, item_id in enumerate(rollup.items):
+                    if item_id in old_index:
+                        new[n] = old[old_index[item_id]]
+            rollup.statuses[unit["name"]] = new
+        rollup.recount(items, units)
+
+    return rollup
+
+
+def save_state(file_name, rollup):
+    directory = os.path.dirname(os.path.abspath(file_name))
+    handle, tmp_file = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(handle, "wb") as fd:
+        pickle.dump(STATE_VERSION, fd)
+        pickle.dump(rollup, fd, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_file, file_name)
+
+
+def read_answers(file_name):
+    # Yields (location, unit, item, status) without loading the file
+    fd = sys.stdin if file_name == "-" else \
+        open(file_name, "r", encoding="UTF-8", newline="")
+    try:
+        if file_name.endswith(".csv"):
+            reader = csv.DictReader(fd)
+            for row in reader:
+                yield ("%s:%u" % (file_name, reader.line_num),
+                       row.get("unit"),
+                       row.get("item"),
+                       row.get("status"))
+        else:
+            for line_id, line in enumerate(fd, 1):
+                if not line.strip():
+                    continue
+                location = "%s:%u" % (file_name, line_id)
+                try:
+                    answer = json.loads(line)
+                except ValueError:
+                    yield location, None, None, None
+                    continue
+                if not isinstance(answer, dict):
+                    yield location, None, None, None
+                    continue
+                yield (location,
+                       answer.get("unit"),
+                       answer.get("item"),
+                       answer.get("status"))
+    finally:
+        if fd is not sys.stdin:
+            fd.close()
+
+
+def main():
+    profiling.profile_script()
+
+    ap = argparse.ArgumentParser(
+        description="roll up the answers of checklist reviews")
+    ap.add_argument("answers",
+                    nargs="*",
+                    metavar="FILENAME",
+                    help=("answers to ingest, csv (ending in .csv) or"
+                          " ndjson files, or - for ndjson on stdin"))
+    ap.add_argument("--manifest",
+                    required=True,
+                    help="the units, as for instantiate-checklists.py")
+    ap.add_argument("--state",
+                    required=True,
+                    metavar="FILENAME",
+                    help=("the state file, created if it does not exist"
+                          " and updated with the answers"))
+    ap.add_argument("-o", "--output",
+                    metavar="FILENAME",
+                    help="write the roll-up (json) here")
+    ap.add_argument("--checklist-dir",
+                    default=checklists.CHECKLIST_DIR,
+                    help="directory with the checklist trlc files")
+    ap.add_argument("--check",
+                    action="store_true",
+                    default=False,
+                    help=("fail unless every applicable item of every unit"
+                          " is complete"))
+    options = ap.parse_args()
+
+    try:
+        units = checklists.read_manifest(options.manifest)
+    except (OSError, ValueError) as err:
+        ap.error(str(err))
+
+    mh        = Message_Handler()
+    documents = checklists.load_model(mh,
+                                      options.checklist_dir,
+                                      checklists.checklist_files(
+                                          options.checklist_dir))
+    if documents is None:
+        sys.exit(1)
+    items = [item for document in documents for item in document["items"]]
+
+    key = hashlib.sha256()
+    key.update(json.dumps([[item["id"], item["steps"], item["scope"]]
+                           for item in items]).encode("UTF-8"))
+    key.update(json.dumps(units, sort_keys=True).encode("UTF-8"))
+    rollup = load_state(options.state, items, units, key.hexdigest())
+
+    ok       = True
+    ingested = 0
+    for file_name in options.answers:
+        for location, unit, item_id, status in read_answers(file_name):
+            if not all(isinstance(field, str)
+                       for field in (unit, item_id, status)):
+                message = "malformed answer"
+            else:
+                message = rollup.update(unit, item_id, status.lower())
+            if message:
+                print("%s: error: %s" % (location, message),
+                      file=sys.stderr)
+                ok = False
+            else:
+                ingested += 1
+
+    save_state(options.state, rollup)
+
+    report = rollup.report()
+    if options.output:
+        common.write_if_changed(options.output,
+                                json.dumps(report, indent=2) + "\n")
+
+    total = report["total"]
+    print("%u answers ingested; %u of %u items complete (%.1f%%),"
+          " %u failed, %u open" % (ingested,
+                                   total["complete"],
+                                   total["applicable"],
+                                   total["percent"],
+                                   total["failed"],
+                                   total["open"]))
+
+    if options.check and (total["failed"] or total["open"]):
+        ok = False
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
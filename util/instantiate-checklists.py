@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+#
+# Ada/SPARK ISO 26262 Process Tools
+# Copyright (C) 2026 NVIDIA CORPORATION & AFFILIATES
+#
+# This file is part of the NVIDIA SPARK ISO 26262 Process.
+#
+# The NVIDIA SPARK ISO 26262 Process Tools are free software: you can
+# redistribute them and/or modify them under the terms of the GNU
+# General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later
+# version.
+#
+# The NVIDIA SPARK ISO 26262 Process Tools are distributed in the hope
+# that they will be useful, but WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with the NVIDIA SPARK ISO 26262 Process Tools. If not, see
+# <https://www.gnu.org/licenses/>.
+
+
+# Instantiate the checklists and worksheets for each software unit of a
+# programme. The units come from a manifest (json, or csv with a
+# name,level[,scopes] header), and each unit gets its own copy of all
+# checklists in which the items outside the unit's scopes are marked
+# as not applicable, as rst, HTML and/or json (for evidence tracking).
+#
+# The checklists are parsed once into a plain model that is shared by
+# all workers, and each worker renders every distinct item (per output
+# format and applicability) only once.
+
+import os
+import sys
+import html
+import json
+import argparse
+import multiprocessing
+
+import docutils.core
+from trlc.errors import Message_Handler
+
+import common
+import profiling
+import checklists
+
+SCOPE_TEXT = {
+    "All"          : "Up to and including SPARK Platinum",
+    "Not_Platinum" : "Up to and including SPARK Gold",
+    "Ada"          : "Interfaces and units containing Ada",
+    "Automated"    : "N/A - Fully automated",
+}
+
+FORMATS = ("rst", "html", "json")
+
+HTML_STYLE = """
+body { font-family: sans-serif; max-width: 60em; margin: auto; }
+.item { border-top: 1px solid #ccc; }
+.not-applicable { color: #999; }
+th { text-align: left; padding-right: 1em; }
+"""
+
+
+def item_title(item):
+    if item["kind"] == "worklist":
+        title = "Worklist item %s (%s)" % (item["number"], item["section"])
+    else:
+        title = "Checklist item %s" % item["number"]
+    if item["automatable"] and item["manual"]:
+        title += " (automatable/manual)"
+    elif item["automatable"]:
+        title += " (automatable)"
+    elif item["manual"]:
+        title += " (manual)"
+    return title
+
+
+def item_steps(item):
+    return (" .. " if item["range"] else ", ").join(item["steps"])
+
+
+def render_rst(item, applicable):
+    title = item_title(item)
+    rv  = "%s\n%s\n\n" % (title, "~" * len(title))
+    if item["steps"]:
+        rv += ":Steps: %s\n" % item_steps(item)
+    rv += ":Applies to: %s\n" % SCOPE_TEXT[item["scope"]]
+    rv += ":Status: %s\n\n" % ("open" if applicable else "not applicable")
+    rv += item["text"] + "\n\n"
+    return rv
+
+
+def render_html(item, applicable):
+    body = docutils.core.publish_parts(
+        item["text"],
+        writer_name="html",
+        settings_overrides={"report_level"    : 5,
+                            "halt_level"      : 5,
+                            "input_encoding"  : "unicode",
+                            "output_encoding" : "unicode"})["body"]
+    rv  = '<div class="item%s" id="%s">\n' % \
+        ("" if applicable else " not-applicable",
+         html.escape(item["id"]))
+    rv += "<h3>%s</h3>\n" % html.escape(item_title(item))
+    rv += "<table>\n"
+    if item["steps"]:
+        rv += "<tr><th>Steps</th><td>%s</td></tr>\n" % \
+            html.escape(item_steps(item))
+    rv += "<tr><th>Applies to</th><td>%s</td></tr>\n" % \
+        html.escape(SCOPE_TEXT[item["scope"]])
+    rv += "<tr><th>Status</th><td>%s</td></tr>\n" % \
+        ("open" if applicable else "not applicable")
+    rv += "</table>\n"
+    rv += body
+    rv += "</div>\n"
+    return rv
+
+
+def render_json(item, applicable):
+    return json.dumps({
+        "id"          : item["id"],
+        "title"       : item_title(item),
+        "scope"       : item["scope"],
+        "applicable"  : applicable,
+        "automatable" : item["automatable"],
+        "manual"      : item["manual"],
+        "steps"       : item["steps"],
+        "step_range"  : item["range"],
+        "text"        : item["text"],
+        "status"      : "open" if applicable else "n/a",
+        "evidence"    : [],
+    })
+
+
+RENDER = {
+    "rst"  : render_rst,
+    "html" : render_html,
+    "json" : render_json,
+}
+
+
+def init_worker(documents, output_dir, formats):
+    global worker_state
+    worker_state = (documents, output_dir, formats, {})
+
+
+def render_item(fmt, item, applicable):
+    memo = worker_state[3]
+    key  = (fmt, item["key"], applicable)
+    if key not in memo:
+        memo[key] = RENDER[fmt](item, applicable)
+    return memo[key]
+
+
+def instantiate(unit):
+    # Write the documents of one unit, returning how many files changed
+    documents, output_dir, formats, _ = worker_state
+    scopes  = set(unit["scopes"])
+    changed = 0
+
+    title = "Checklists for %s" % unit["name"]
+    meta  = [("SPARK level", unit["level"].capitalize()),
+             ("Scopes", ", ".join(unit["scopes"]))]
+
+    for fmt in formats:
+        if fmt == "rst":
+            content  = "%s\n%s\n\n" % (title, "=" * len(title))
+            content += "".join(":%s: %s\n" % item for item in meta) + "\n"
+            for document in documents:
+                content += "%s\n%s\n\n" % (document["title"],
+                                           "-" * len(document["title"]))
+                content += "".join(render_item(fmt,
+                                               item,
+                                               item["scope"] in scopes)
+                                   for item in document["items"])
+
+        elif fmt == "html":
+            content  = "<!DOCTYPE html>\n<html>\n<head>\n"
+            content += '<meta charset="utf-8">\n'
+            content += "<title>%s</title>\n" % html.escape(title)
+            content += "<style>%s</style>\n" % HTML_STYLE
+            content += "</head>\n<body>\n"
+            content += "<h1>%s</h1>\n<table>\n" % html.escape(title)
+            content += "".join("<tr><th>%s</th><td>%s</td></tr>\n" %
+                               (html.escape(key), html.escape(value))
+                               for key, value in meta)
+            content += "</table>\n"
+            for document in documents:
+                content += "<h2>%s</h2>\n" % html.escape(document["title"])
+                content += "".join(render_item(fmt,
+                                               item,
+                                               item["scope"] in scopes)
+                                   for item in document["items"])
+            content += "</body>\n</html>\n"
+
+        else:
+            # One item per line; indenting everything would be much
+            # slower, since json.dumps(..., indent=2) bypasses the C
+            # encoder.
+            content  = '{"unit": %s,\n' % json.dumps(unit["name"])
+            content += ' "level": %s,\n' % json.dumps(unit["level"])
+            content += ' "scopes": %s,\n' % json.dumps(unit["scopes"])
+            content += ' "documents": [\n'
+            content += ",\n".join(
+                '  {"name": %s,\n   "title": %s,\n   "items": [\n%s]}' %
+                (json.dumps(document["name"]),
+                 json.dumps(document["title"]),
+                 ",\n".join("    " + render_item(fmt,
+                                                 item,
+                                                 item["scope"] in scopes)
+                            for item in document["items"]))
+                for document in documents)
+            content += "]}\n"
+
+        file_name = os.path.join(output_dir, "%s.%s" % (unit["name"], fmt))
+        changed  += common.write_if_changed(file_name, content)
+
+    return changed
+
+
+def main():
+    profiling.profile_script()
+
+    ap = argparse.ArgumentParser(
+        description="instantiate the checklists for each software unit")
+    ap.add_argument("manifest",
+                    help=("the units, as json (a list of objects) or csv,"
+                          " each with a name, a SPARK level and optionally"
+                          " the applicable checklist scopes (by default"
+                          " derived from the level)"))
+    ap.add_argument("-o", "--output-dir",
+                    required=True,
+                    help="write the documents of each unit here")
+    ap.add_argument("--format",
+                    action="append",
+                    choices=FORMATS,
+                    help="output format (default: all of them)")
+    ap.add_argument("--checklist-dir",
+                    default=checklists.CHECKLIST_DIR,
+                    help="directory with the checklist trlc files")
+    ap.add_argument("-j", "--jobs",
+                    type=int,
+                    default=os.cpu_count(),
+                    help="number of worker processes (default: %(default)s)")
+    options = ap.parse_args()
+
+    if options.jobs < 1:
+        ap.error("--jobs must be at least 1")
+
+    try:
+        units = checklists.read_manifest(options.manifest)
+    except (OSError, ValueError) as err:
+        ap.error(str(err))
+
+    mh        = Message_Handler()
+    documents = checklists.load_model(mh,
+                                      options.checklist_dir,
+                                      checklists.checklist_files(
+                                          options.checklist_dir))
+    if documents is None:
+        sys.exit(1)
+
+    formats = tuple(options.format or FORMATS)
+    os.makedirs(options.output_dir, exist_ok=True)
+
+    if options.jobs == 1 or len(units) == 1:
+        init_worker(documents, options.output_dir, formats)
+        changed = sum(map(instantiate, units))
+    else:
+        with multiprocessing.Pool(options.jobs,
+                                  init_worker,
+                                  (documents,
+                                   options.output_dir,
+                                   formats)) as pool:
+            changed = sum(pool.imap_unordered(instantiate,
+                                              units,
+                                              chunksize=16))
+
+    print("%u units, %u files written" % (len(units), changed))
+
+
+if __name__ == "__main__":
+    main()
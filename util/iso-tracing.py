@@ -23,12 +23,13 @@
 import sys
 import os
 import argparse
+import functools
 
-from trlc.trlc import Source_Manager
 from trlc.errors import Message_Handler, TRLC_Error
 from trlc import ast
 
 import common
+import profiling
 
 def pp_iso_section(n_obj):
     assert isinstance(n_obj, ast.Record_Object)
@@ -41,6 +42,7 @@ def pp_iso_section(n_obj):
                               ref.value["sec"].value)
 
 
+@functools.lru_cache(maxsize=None)
 def pp_iso_ref(n_obj, with_subref=True):
     assert isinstance(n_obj, ast.Record_Object)
     assert n_obj.n_typ.name == "Tracing"
@@ -65,25 +67,30 @@ def pp_iso_ref(n_obj, with_subref=True):
     return rv
 
 
-def pp_step_id(n_step):
-    assert isinstance(n_step, ast.Enumeration_Literal_Spec)
-    return common.fmt_step_link(n_step.name)
+@functools.lru_cache(maxsize=None)
+def pp_iso_link(n_obj):
+    return ":ref:`%s <iso-trace-%s>`" % (pp_iso_ref(n_obj),
+                                          n_obj.name.replace("_", "-"))
 
 
-def get_process_steps(n_obj):
+def pp_step_id(mh, n_step):
+    assert isinstance(n_step.value, ast.Enumeration_Literal_Spec)
+    return common.fmt_step_link(mh, n_step.location, n_step.value.name)
+
+
+def get_process_steps(mh, n_obj):
+    assert isinstance(mh, Message_Handler)
     assert isinstance(n_obj, ast.Record_Object)
     assert n_obj.n_typ.name == "Tracing"
 
     rv = []
 
     if isinstance(n_obj.field["steps"], ast.Array_Aggregate):
-        rv += [pp_step_id(item.value)
+        rv += [pp_step_id(mh, item)
                for item in n_obj.field["steps"].value]
 
     if isinstance(n_obj.field["ref_steps"], ast.Array_Aggregate):
-        rv += ["See :ref:`%s <iso-trace-%s>`" %
-               (pp_iso_ref(ref.target),
-                ref.target.name.replace("_", "-"))
+        rv += ["See %s" % pp_iso_link(ref.target)
                for ref in n_obj.field["ref_steps"].value]
 
     return rv
@@ -143,7 +150,7 @@ def process(mh, fd, n_obj, emit_steps):
 
     if emit_steps:
         fd.write("Process steps that apply:")
-        steps = get_process_steps(n_obj)
+        steps = get_process_steps(mh, n_obj)
         if len(steps) == 0:
             if isinstance(n_obj.field["alt_steps"], ast.Implicit_Null):
                 fd.write(" N/A\n\n")
@@ -164,10 +171,8 @@ def process(mh, fd, n_obj, emit_steps):
             fd.write("\n")
 
     if isinstance(n_obj.field["same_as"], ast.Record_Reference):
-        target = n_obj.field["same_as"].target
-        fd.write("Same as: :ref:`%s <iso-trace-%s>`\n\n" %
-                 (pp_iso_ref(target),
-                  target.name.replace("_", "-")))
+        fd.write("Same as: %s\n\n" %
+                 pp_iso_link(n_obj.field["same_as"].target))
 
     if isinstance(n_obj.field["just"], ast.String_Literal):
         fd.write("Justification:\n\n")
@@ -178,14 +183,61 @@ def process(mh, fd, n_obj, emit_steps):
 
     return True
 
+def generate(mh, out_file, items, emit_steps):
+    assert isinstance(mh, Message_Handler)
+    assert isinstance(out_file, str)
+    assert isinstance(emit_steps, bool)
+
+    ok          = True
+    old_section = None
+    base        = os.path.splitext(out_file)[0]
+
+    try:
+        with common.open_output(out_file) as fd, \
+             common.open_output(base + ".sections") as fd_sections, \
+             common.open_output(base + ".verbatim") as fd_verbatim:
+            for item in items:
+                current_section = pp_iso_section(item)
+                if old_section != current_section:
+                    fd.write("%s\n" % current_section)
+                    fd.write("^" * len(current_section) + "\n\n")
+                    old_section = current_section
+
+                try:
+                    ok &= process(mh, fd, item, emit_steps)
+                except TRLC_Error:
+                    ok = False
+
+                fd_sections.write(pp_iso_ref(item, with_subref=False) + "\n")
+
+                if isinstance(item.field["text"], ast.String_Literal):
+                    fd_verbatim.write(item.field["text"].value + "\n")
+                else:
+                    fd_verbatim.write(item.field["row"].value + "\n")
+
+            if not ok:
+                raise common.Discard_Output()
+    except common.Discard_Output:
+        pass
+
+    return ok
+
+
 def main():
+    profiling.profile_script()
+
     ap = argparse.ArgumentParser()
     ap.add_argument("inputs",
                     nargs="*",
                     help="input sources")
     ap.add_argument("--out",
                     default=None,
-                    help="output rest file")
+                    help=("output rest file for all records; by default"
+                          " each trlc input gets its own .inc file"))
+    ap.add_argument("--all-sections",
+                    default=None,
+                    metavar="FILENAME",
+                    help="also write a sorted list of all ISO sections")
     ap.add_argument("--no-steps",
                     default=False,
                     action="store_true",
@@ -194,14 +246,12 @@ def main():
     options = ap.parse_args()
 
     mh = Message_Handler()
-    sm = Source_Manager(mh)
 
     for filename in options.inputs:
         if not os.path.isfile(filename):
             ap.error("%s is not a file" % filename)
-        sm.register_file(filename)
 
-    stab = sm.process()
+    stab = common.process_trlc_files(mh, options.inputs, verify=True)
 
     if stab is None:
         sys.exit(1)
@@ -210,33 +260,33 @@ def main():
 
     pkg_tracing = stab.lookup_assuming(mh, "ISO_26262_Tracing")
 
-    old_section = None
-
-    with open(options.out, "w", encoding="UTF-8") as fd:
-        for item in pkg_tracing.symbols.iter_record_objects():
-            current_section = pp_iso_section(item)
-            if old_section != current_section:
-                fd.write("%s\n" % current_section)
-                fd.write("^" * len(current_section) + "\n\n")
-                old_section = current_section
-
-            try:
-                ok &= process(mh, fd, item, not options.no_steps)
-            except TRLC_Error:
-                ok = False
-
-    section_file = os.path.splitext(options.out)[0] + ".sections"
-    with open(section_file, "w", encoding="UTF-8") as fd:
-        for item in pkg_tracing.symbols.iter_record_objects():
-            fd.write(pp_iso_ref(item, with_subref=False) + "\n")
-
-    verbatim_file = os.path.splitext(options.out)[0] + ".verbatim"
-    with open(verbatim_file, "w", encoding="UTF-8") as fd:
-        for item in pkg_tracing.symbols.iter_record_objects():
-            if isinstance(item.field["text"], ast.String_Literal):
-                fd.write(item.field["text"].value + "\n")
-            else:
-                fd.write(item.field["row"].value + "\n")
+    # Sort all records into their output files in a single pass
+    # over the package.
+    outputs = {}
+    if options.out:
+        outputs[options.out] = []
+    else:
+        for filename in options.inputs:
+            if filename.endswith(".trlc"):
+                outputs[os.path.splitext(filename)[0] + ".inc"] = []
+
+    all_sections = set()
+    for item in pkg_tracing.symbols.iter_record_objects():
+        if options.out:
+            outputs[options.out].append(item)
+        else:
+            out_file = os.path.splitext(item.location.file_name)[0] + ".inc"
+            if out_file in outputs:
+                outputs[out_file].append(item)
+        all_sections.add(pp_iso_ref(item, with_subref=False))
+
+    for out_file, items in outputs.items():
+        ok &= generate(mh, out_file, items, not options.no_steps)
+
+    if options.all_sections:
+        with common.open_output(options.all_sections) as fd:
+            for section in sorted(all_sections):
+                fd.write(section + "\n")
 
     sys.exit(0 if ok else 1)
 
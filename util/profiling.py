@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+#
+# Ada/SPARK ISO 26262 Process Tools
+# Copyright (C) 2026 NVIDIA CORPORATION & AFFILIATES
+#
+# This file is part of the NVIDIA SPARK ISO 26262 Process.
+#
+# The NVIDIA SPARK ISO 26262 Process Tools are free software: you can
+# redistribute them and/or modify them under the terms of the GNU
+# General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later
+# version.
+#
+# The NVIDIA SPARK ISO 26262 Process Tools are distributed in the hope
+# that they will be useful, but WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with the NVIDIA SPARK ISO 26262 Process Tools. If not, see
+# <https://www.gnu.org/licenses/>.
+
+
+# Opt-in profiling of the documentation build. If SPARK_PROCESS_PROFILE
+# names a file, every util script (from its main) and every Sphinx
+# phase (via conf.py) appends Chrome trace events to it; the file can be
+# loaded into chrome://tracing or https://ui.perfetto.dev directly.
+#
+# When run as a script, prints a summary table of such a file.
+
+import os
+import sys
+import json
+import time
+import fcntl
+import atexit
+import argparse
+import resource
+
+PROFILE_FILE = os.environ.get("SPARK_PROCESS_PROFILE")
+
+# Phases that have started but not finished yet, name -> (wall, cpu)
+open_phases = {}
+
+# Set once profile_script has been called
+profiling_script = False
+
+
+def max_rss_kb():
+    # On Linux ru_maxrss is in KiB; this includes any child processes
+    # (e.g. worker pools) that have been waited for.
+    return max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+
+
+def cpu_time():
+    return sum(getattr(resource.getrusage(who), field)
+               for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN)
+               for field in ("ru_utime", "ru_stime"))
+
+
+def record(name, category, start, wall, cpu, args=None):
+    assert isinstance(name, str)
+    assert isinstance(category, str)
+    assert isinstance(start, float)
+    assert isinstance(wall, float)
+    assert isinstance(cpu, float)
+
+    event = {
+        "name" : name,
+        "cat"  : category,
+        "ph"   : "X",
+        "ts"   : int(start * 1e6),
+        "dur"  : int(wall * 1e6),
+        "pid"  : os.getpid(),
+        "tid"  : 0,
+        "args" : dict(args or {},
+                      cpu_s      = round(cpu, 6),
+                      max_rss_kb = max_rss_kb()),
+    }
+
+    # The trace is written in the JSON array format, which does not
+    # require the closing bracket. Concurrent writers (make -j, or
+    # util/generate.py) take turns through the lock, so that only the
+    # first one writes the opening bracket.
+    os.makedirs(os.path.dirname(os.path.abspath(PROFILE_FILE)),
+                exist_ok=True)
+    with open(PROFILE_FILE, "a", encoding="UTF-8") as fd:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        if fd.seek(0, os.SEEK_END) == 0:
+            fd.write("[\n")
+        fd.write(json.dumps(event, sort_keys=True) + ",\n")
+
+
+def start_phase(name):
+    open_phases[name] = (time.time(), cpu_time())
+
+
+def process_start():
+    # When this process started (from /proc on Linux), or else now
+    try:
+        with open("/proc/self/stat", "r", encoding="UTF-8") as fd:
+            # The start time is field 22, counting from the pid, in
+            # clock ticks since boot
+            ticks = int(fd.read().rsplit(")", 1)[1].split()[19])
+        age = (time.clock_gettime(time.CLOCK_BOOTTIME) -
+               ticks / os.sysconf("SC_CLK_TCK"))
+        return time.time() - max(age, 0.0)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return time.time()
+
+
+def end_phase(name, category, args=None):
+    if name not in open_phases:
+        return
+    start, start_cpu = open_phases.pop(name)
+    record(name,
+           category,
+           start,
+           time.time() - start,
+           cpu_time() - start_cpu,
+           args)
+
+
+def profile_script():
+    # Record this whole process as one event, named after the
+    # script. Only the first call counts, since scripts run in-process
+    # by another (e.g. util/generate.py --watch) are part of its event.
+    global profiling_script
+    if not PROFILE_FILE or profiling_script:
+        return
+    profiling_script = True
+
+    # The event covers the imports before main as well
+    name = os.path.basename(sys.argv[0])
+    open_phases[name] = (process_start(), 0.0)
+    atexit.register(end_phase,
+                    name,
+                    "util",
+                    {"argv" : sys.argv[1:],
+                     "cwd"  : os.getcwd()})
+
+
+def setup_sphinx(app):
+    # Record the major Sphinx phases, and reading of each document
+    if not PROFILE_FILE:
+        return
+
+    def on_source_read(app, docname, source):
+        start_phase("read %s" % docname)
+
+    def on_doctree_read(app, doctree):
+        end_phase("read %s" % app.env.docname, "sphinx-doc")
+
+    def phase_hook(end, start=None):
+        def hook(app, *args):
+            if end:
+                end_phase("sphinx %s" % end, "sphinx")
+            if start:
+                start_phase("sphinx %s" % start)
+        return hook
+
+    start_phase("sphinx build")
+    start_phase("sphinx init")
+    app.connect("builder-inited",       phase_hook("init"))
+    app.connect("env-before-read-docs", phase_hook(None, "read"))
+    app.connect("source-read",          on_source_read)
+    app.connect("doctree-read",         on_doctree_read)
+    app.connect("env-updated",          phase_hook("read", "resolve"))
+    app.connect("write-started",        phase_hook("resolve", "write"))
+    app.connect("build-finished",       phase_hook("write"))
+    app.connect("build-finished",       phase_hook("build"))
+
+
+def load(file_name):
+    with open(file_name, "r", encoding="UTF-8") as fd:
+        content = fd.read().strip()
+    if not content.endswith("]"):
+        content = content.rstrip(",") + "]"
+    return json.loads(content)
+
+
+def main():
+    ap = argparse.ArgumentParser(
+        description="summarise a build profile")
+    ap.add_argument("profile",
+                    help="trace file written with SPARK_PROCESS_PROFILE")
+    options = ap.parse_args()
+
+    summary = {}
+    for event in load(options.profile):
+        item = summary.setdefault(event["name"],
+                                  {"calls"  : 0,
+                                   "wall"   : 0.0,
+                                   "cpu"    : 0.0,
+                                   "max_rss": 0})
+        item["calls"]   += 1
+        item["wall"]    += event["dur"] / 1e6
+        item["cpu"]     += event["args"]["cpu_s"]
+        item["max_rss"]  = max(item["max_rss"], event["args"]["max_rss_kb"])
+
+    width = max([len("Stage")] + [len(name) for name in summary])
+    print("%-*s  %5s  %8s  %8s  %8s" % (width,
+                                        "Stage",
+                                        "Calls",
+                                        "Wall/s",
+                                        "CPU/s",
+                                        "RSS/MiB"))
+    print("-" * (width + 2 + 5 + 3 * (2 + 8)))
+    for name, item in sorted(summary.items(),
+                             key=lambda pair: -pair[1]["wall"]):
+        print("%-*s  %5u  %8.3f  %8.3f  %8.1f" % (width,
+                                                  name,
+                                                  item["calls"],
+                                                  item["wall"],
+                                                  item["cpu"],
+                                                  item["max_rss"] / 1024))
+
+
+if __name__ == "__main__":
+    main()
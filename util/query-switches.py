@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+#
+# Ada/SPARK ISO 26262 Process Tools
+# Copyright (C) 2026 NVIDIA CORPORATION & AFFILIATES
+#
+# This file is part of the NVIDIA SPARK ISO 26262 Process.
+#
+# The NVIDIA SPARK ISO 26262 Process Tools are free software: you can
+# redistribute them and/or modify them under the terms of the GNU
+# General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later
+# version.
+#
+# The NVIDIA SPARK ISO 26262 Process Tools are distributed in the hope
+# that they will be useful, but WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with the NVIDIA SPARK ISO 26262 Process Tools. If not, see
+# <https://www.gnu.org/licenses/>.
+
+
+
+# Answer questions about the switch policy, e.g.
+#
+#   query-switches.py status compiler -gnatw.x
+#   query-switches.py list --tool=spark --status=banned
+
+import sys
+import json
+import argparse
+
+import switches
+
+# The tool names we accept, besides the ones used in the policy
+TOOL_NAMES = {
+    "compiler"  : "GNAT_Compiler",
+    "gcc"       : "GNAT_Compiler",
+    "gnatcheck" : "GNAT_Check",
+    "check"     : "GNAT_Check",
+    "gnatprove" : "SPARK",
+    "prove"     : "SPARK",
+}
+TOOL_NAMES.update({tool.lower(): tool for tool in switches.TOOLS})
+
+STATUS_NAMES = {
+    "required" : "Required",
+    "allowed"  : "Allowed",
+    "optional" : "Allowed",
+    "banned"   : "Banned",
+}
+
+
+def tool_name(name):
+    try:
+        return TOOL_NAMES[name.lower()]
+    except KeyError:
+        raise argparse.ArgumentTypeError("unknown tool %s" % name)
+
+
+def status_name(name):
+    try:
+        return STATUS_NAMES[name.lower()]
+    except KeyError:
+        raise argparse.ArgumentTypeError("unknown status %s" % name)
+
+
+def to_json(constraint):
+    return {
+        "tool"            : constraint.tool,
+        "status"          : constraint.status,
+        "warning_related" : constraint.warning_related,
+        "switches"        : [switch for switch, _ in constraint.switches],
+        "justification"   : constraint.justification,
+        "location"        : constraint.location(),
+    }
+
+
+def query_status(database, options):
+    # Exits with 1 if any of the switches is banned, and with 2 if the
+    # policy does not mention one of them.
+    result    = []
+    exit_code = 0
+    for arg in options.switches:
+        for switch, pattern, constraints in database.status(options.tool,
+                                                            arg):
+            result.append({
+                "switch"      : switch,
+                "pattern"     : pattern,
+                "constraints" : [to_json(constraint)
+                                 for constraint in constraints],
+            })
+            if not constraints:
+                exit_code = max(exit_code, 2)
+            elif any(constraint.status == "Banned"
+                     for constraint in constraints):
+                exit_code = max(exit_code, 1)
+
+    if options.json:
+        print(json.dumps(result, indent=2))
+    else:
+        for item in result:
+            if not item["constraints"]:
+                print("%s: not covered by the policy" % item["switch"])
+            for constraint in item["constraints"]:
+                print("%s: %s (pattern %s, %s)" % (item["switch"],
+                                                    constraint["status"],
+                                                    item["pattern"],
+                                                    constraint["location"]))
+    return exit_code
+
+
+def query_list(database, options):
+    constraints = database.select(options.tool,
+                                  options.status,
+                                  options.warning_related)
+    if options.json:
+        print(json.dumps([to_json(constraint) for constraint in constraints],
+                         indent=2))
+    else:
+        for constraint in constraints:
+            for switch, _ in constraint.switches:
+                print("%s %s %s (%s)" % (constraint.tool,
+                                         constraint.status,
+                                         switch,
+                                         constraint.location()))
+    return 0
+
+
+def main():
+    ap = argparse.ArgumentParser(
+        description="query the switch policy")
+    ap.add_argument("--switch-dir",
+                    default=switches.SWITCH_DIR,
+                    help="directory with the switch tables")
+    ap.add_argument("--json",
+                    action="store_true",
+                    default=False,
+                    help="print the answer as json")
+    subparsers = ap.add_subparsers(dest="query", required=True)
+
+    ap_status = subparsers.add_parser(
+        "status",
+        help=("the status of the given switches (exit code 1 if one is"
+              " banned, 2 if one is not covered by the policy)"))
+    ap_status.add_argument("tool",
+                           type=tool_name,
+                           help="compiler, gnatcheck, or gnatprove")
+    ap_status.add_argument("switches",
+                           nargs=argparse.REMAINDER,
+                           metavar="SWITCH")
+    ap_status.set_defaults(function=query_status)
+
+    ap_list = subparsers.add_parser(
+        "list",
+        help="all constraints with the given properties")
+    ap_list.add_argument("--tool",
+                         type=tool_name,
+                         help="compiler, gnatcheck, or gnatprove")
+    ap_list.add_argument("--status",
+                         type=status_name,
+                         help="required, allowed, or banned")
+    ap_list.add_argument("--warnings",
+                         dest="warning_related",
+                         action="store_true",
+                         default=None,
+                         help="only warning related compiler switches")
+    ap_list.add_argument("--no-warnings",
+                         dest="warning_related",
+                         action="store_false",
+                         help="no warning related compiler switches")
+    ap_list.set_defaults(function=query_list)
+
+    options = ap.parse_args()
+
+    if options.query == "status" and not options.switches:
+        ap_status.error("no switches given")
+
+    database = switches.load_database(options.switch_dir)
+    sys.exit(options.function(database, options))
+
+
+if __name__ == "__main__":
+    main()
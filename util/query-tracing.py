@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+#
+# Ada/SPARK ISO 26262 Process Tools
+# Copyright (C) 2026 NVIDIA CORPORATION & AFFILIATES
+#
+# This file is part of the NVIDIA SPARK ISO 26262 Process.
+#
+# The NVIDIA SPARK ISO 26262 Process Tools are free software: you can
+# redistribute them and/or modify them under the terms of the GNU
+# General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later
+# version.
+#
+# The NVIDIA SPARK ISO 26262 Process Tools are distributed in the hope
+# that they will be useful, but WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with the NVIDIA SPARK ISO 26262 Process Tools. If not, see
+# <https://www.gnu.org/licenses/>.
+
+
+
+# Answer traceability questions about the process, e.g.
+#
+#   query-tracing.py traces-to Check_Stack_Usage_Unit
+#   query-tracing.py untraced iso
+#   query-tracing.py --sqlite build/tracing.db
+
+import sys
+import json
+import argparse
+
+from trlc.errors import Message_Handler
+
+import trace_graph
+import profiling
+
+
+def fmt_node(graph, node_id):
+    node = graph.nodes[node_id]
+    if node.label != node.name:
+        return "%-10s %s (%s) %s" % (node.kind,
+                                     node.name,
+                                     node.label,
+                                     node.location())
+    return "%-10s %s %s" % (node.kind, node.name, node.location())
+
+
+def to_json(graph, node_id):
+    node = graph.nodes[node_id]
+    return {
+        "kind"      : node.kind,
+        "name"      : node.name,
+        "label"     : node.label,
+        "file_name" : node.file_name,
+        "line"      : node.line,
+    }
+
+
+def main():
+    profiling.profile_script()
+
+    ap = argparse.ArgumentParser(
+        description="query the traceability of the process")
+    ap.add_argument("query",
+                    nargs="?",
+                    choices=("traces-to", "traced-by", "untraced", "show"),
+                    help=("traces-to NAME: everything tracing to these;"
+                          " traced-by NAME: everything these trace to;"
+                          " untraced KIND: the nodes of this kind that do"
+                          " not lead to any process step;"
+                          " show NAME: the nodes with their edges"))
+    ap.add_argument("names",
+                    nargs="*",
+                    metavar="NAME",
+                    help=("step, clause, assumption, argument or checklist"
+                          " item names, optionally qualified with the"
+                          " kind (e.g. assumption:SPARK_EXTERNAL), or"
+                          " for untraced one of %s" %
+                          ", ".join(trace_graph.KINDS[1:])))
+    ap.add_argument("--json",
+                    action="store_true",
+                    default=False,
+                    help="print the answer as json")
+    ap.add_argument("--sqlite",
+                    metavar="FILENAME",
+                    help="export the whole graph to this SQLite database")
+    options = ap.parse_args()
+
+    if options.query is None and not options.sqlite:
+        ap.error("nothing to do, give a query or --sqlite")
+
+    mh    = Message_Handler()
+    graph = trace_graph.load(mh)
+    if graph is None:
+        sys.exit(1)
+
+    if options.sqlite:
+        graph.export_sqlite(options.sqlite)
+    if options.query is None:
+        return
+
+    if options.query == "untraced":
+        for kind in options.names:
+            if kind not in trace_graph.KINDS[1:]:
+                ap.error("unknown kind %s" % kind)
+        result = [node_id
+                  for kind in options.names or trace_graph.KINDS[1:]
+                  for node_id in graph.untraced[kind]]
+    else:
+        if not options.names:
+            ap.error("%s needs at least one name" % options.query)
+        start = []
+        for name in options.names:
+            node_ids = graph.find(name)
+            if not node_ids:
+                ap.error("nothing is called %s" % name)
+            start += node_ids
+        if options.query == "traces-to":
+            result = graph.traces_to(start)
+        elif options.query == "traced-by":
+            result = graph.traced_by(start)
+        else:
+            result = start
+
+    if options.query == "show" and options.json:
+        nodes = []
+        for node_id in result:
+            item = to_json(graph, node_id)
+            item["out"] = [(graph.edges[edge_id].kind,
+                            to_json(graph, graph.edges[edge_id].target))
+                           for edge_id in graph.out_edges[node_id]]
+            item["in"]  = [(graph.edges[edge_id].kind,
+                            to_json(graph, graph.edges[edge_id].source))
+                           for edge_id in graph.in_edges[node_id]]
+            nodes.append(item)
+        print(json.dumps(nodes, indent=2))
+
+    elif options.query == "show":
+        for node_id in result:
+            print(fmt_node(graph, node_id))
+            for edge_id in graph.out_edges[node_id]:
+                edge = graph.edges[edge_id]
+                print("  %s -> %s" % (edge.kind,
+                                      fmt_node(graph, edge.target)))
+            for edge_id in graph.in_edges[node_id]:
+                edge = graph.edges[edge_id]
+                print("  %s <- %s" % (edge.kind,
+                                      fmt_node(graph, edge.source)))
+
+    elif options.json:
+        print(json.dumps([to_json(graph, node_id) for node_id in result],
+                         indent=2))
+
+    else:
+        for node_id in result:
+            print(fmt_node(graph, node_id))
+
+
+if __name__ == "__main__":
+    main()
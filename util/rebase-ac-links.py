@@ -23,6 +23,9 @@
 import os
 import re
 
+import common
+import profiling
+
 VERSION = "R/docs/gnat-25.1"
 
 
@@ -41,11 +44,12 @@ def process(file_name):
         fix_links,
         content)
 
-    with open(file_name, "w", encoding="UTF-8") as fd:
-        fd.write(content)
+    common.write_if_changed(file_name, content)
 
 
 def main():
+    profiling.profile_script()
+
     for path, _, files in os.walk("."):
         for file_name in files:
             if os.path.splitext(file_name)[1] in (".rst",
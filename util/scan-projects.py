@@ -0,0 +1,744 @@
+#!/usr/bin/env python3
+#
+# Ada/SPARK ISO 26262 Process Tools
+# Copyright (C) 2026 NVIDIA CORPORATION & AFFILIATES
+#
+# This file is part of the NVIDIA SPARK ISO 26262 Process.
+#
+# The NVIDIA SPARK ISO 26262 Process Tools are free software: you can
+# redistribute them and/or modify them under the terms of the GNU
+# General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later
+# version.
+#
+# The NVIDIA SPARK ISO 26262 Process Tools are distributed in the hope
+# that they will be useful, but WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with the NVIDIA SPARK ISO 26262 Process Tools. If not, see
+# <https://www.gnu.org/licenses/>.
+
+
+# Scan a source tree for GPR project files and report the effective
+# switches of each project (Default_Switches, Switches and so on, per
+# package and index), resolving variables, & concatenation, attribute
+# references, and packages inherited through extends. With --check,
+# the switches are also checked against the switch policy.
+#
+# Project files are tokenised (in parallel) with the GNATProjectLexer
+# we use for the documentation; this is not a full GPR implementation.
+# Assignments under a case statement are reported with their condition
+# and anything that cannot be resolved statically is reported as such.
+
+import os
+import sys
+import json
+import argparse
+import multiprocessing
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                "..", "pygments"))
+
+import ada_pygments
+from pygments.token import Keyword, Name, String, Comment, Text, Punctuation
+
+import common
+import profiling
+import switches
+
+# The attributes we report
+SWITCH_ATTRIBUTES = ("default_switches",
+                     "switches",
+                     "proof_switches",
+                     "global_compilation_switches")
+
+# Qualifiers that may come before "project"
+QUALIFIERS = ("abstract", "aggregate", "configuration", "library", "standard")
+
+# The packages we check, and the tool their switches are for
+PACKAGE_TOOLS = {
+    "compiler" : "GNAT_Compiler",
+    "prove"    : "SPARK",
+    "check"    : "GNAT_Check",
+}
+
+
+class Unresolved(Exception):
+    pass
+
+
+class Parse_Error(Exception):
+    pass
+
+
+##############################################################################
+# Parsing (in the workers)
+##############################################################################
+
+def tokenise(lexer, content):
+    # The tokens as (kind, value), where kind is one of kw, name, str
+    # or op, without whitespace and comments.
+    tokens  = []
+    last_end = None
+    for pos, token, value in lexer.get_tokens_unprocessed(content):
+        if token in Text or token in Comment:
+            continue
+        elif token in Punctuation and value.isspace():
+            continue
+        elif token is Name.Attribute:
+            tokens.append(("op", "'"))
+            tokens.append(("name", value[1:]))
+        elif token is Name.Namespace:
+            # The lexer matches "use X;" after a semicolon in one go
+            tokens.append(("name", value.strip(" \t\r\n;")))
+            tokens.append(("op", ";"))
+        elif token in Name and tokens and tokens[-1][0] == "name" \
+             and last_end == pos:
+            # An attribute name that only starts like an Ada one
+            tokens[-1] = ("name", tokens[-1][1] + value)
+        elif token in Name or token in Keyword.Constant:
+            tokens.append(("name", value))
+        elif token in String:
+            tokens.append(("str", value[1:-1]))
+        elif token in Keyword:
+            tokens.append(("kw", value.strip().lower()))
+        else:
+            tokens.append(("op", value))
+        last_end = pos + len(value)
+    return tokens
+
+
+class Parser:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos    = 0
+
+    def peek(self, offset=0):
+        if self.pos + offset < len(self.tokens):
+            return self.tokens[self.pos + offset]
+        return (None, None)
+
+    def next(self):
+        token = self.peek()
+        if token[0] is None:
+            raise Parse_Error("unexpected end of file")
+        self.pos += 1
+        return token
+
+    def expect(self, kind, value=None):
+        token = self.next()
+        if token[0] != kind or (value is not None and token[1] != value):
+            raise Parse_Error("expected %s, found %s" % (value or kind,
+                                                         token[1]))
+        return token[1]
+
+    def accept(self, kind, value):
+        if self.peek() == (kind, value):
+            self.pos += 1
+            return True
+        return False
+
+    def until_semicolon(self):
+        # The tokens of an expression, up to the semicolon ending it
+        start = self.pos
+        depth = 0
+        while True:
+            kind, value = self.next()
+            if kind == "op" and value == "(":
+                depth += 1
+            elif kind == "op" and value == ")":
+                depth -= 1
+            elif kind == "op" and value == ";" and depth == 0:
+                return self.tokens[start:self.pos - 1]
+
+
+def parse(file_name, content, lexer):
+    model = {
+        "file"       : file_name,
+        "name"       : None,
+        "withs"      : [],
+        "extends"    : None,
+        "statements" : [],
+    }
+    parser   = Parser(tokenise(lexer, content))
+    package  = None
+    cases    = []
+
+    def condition():
+        return tuple(case for case in cases if case[1] is not None)
+
+    while parser.peek()[0] is not None:
+        kind, value = parser.next()
+
+        if (kind, value) == ("kw", "with"):
+            model["withs"].append(parser.expect("str"))
+            while parser.accept("op", ","):
+                model["withs"].append(parser.expect("str"))
+            parser.expect("op", ";")
+
+        elif kind in ("kw", "name") and value.lower() in QUALIFIERS:
+            # e.g. abstract project or aggregate library project
+            continue
+
+        elif (kind, value) == ("kw", "project"):
+            model["name"] = parser.expect("name")
+            if parser.accept("kw", "extends"):
+                parser.accept("kw", "all")
+                model["extends"] = parser.expect("str")
+            parser.expect("kw", "is")
+
+        elif (kind, value) == ("kw", "package"):
+            package = parser.expect("name").lower()
+            if parser.accept("kw", "renames"):
+                model["statements"].append(
+                    ("package", package, "renames", parser.expect("name")))
+                parser.expect("op", ";")
+                package = None
+            elif parser.accept("kw", "extends"):
+                model["statements"].append(
+                    ("package", package, "extends", parser.expect("name")))
+                parser.expect("kw", "is")
+            else:
+                model["statements"].append(("package", package, None, None))
+                parser.expect("kw", "is")
+
+        elif (kind, value) == ("kw", "end"):
+            name = parser.expect("name").lower()
+            parser.expect("op", ";")
+            if name == "case":
+                if not cases:
+                    raise Parse_Error("end case without case")
+                cases.pop()
+            elif name == package:
+                package = None
+
+        elif (kind, value) == ("kw", "case"):
+            cases.append((parser.expect("name").lower(), None))
+            parser.expect("kw", "is")
+
+        elif (kind, value) == ("kw", "when"):
+            if not cases:
+                raise Parse_Error("when outside of a case statement")
+            choices = []
+            while not parser.accept("op", "=>"):
+                kind, value = parser.next()
+                if kind in ("str", "kw"):
+                    choices.append(value)
+            cases[-1] = (cases[-1][0], "|".join(choices))
+
+        elif (kind, value) == ("kw", "for"):
+            attribute = parser.expect("name").lower()
+            index     = None
+            if parser.accept("op", "("):
+                index = parser.expect("str")
+                parser.expect("op", ")")
+            parser.expect("kw", "use")
+            model["statements"].append(("attr",
+                                        package,
+                                        attribute,
+                                        index,
+                                        parser.until_semicolon(),
+                                        condition()))
+
+        elif kind == "name" and parser.peek() in (("op", ":="),
+                                                  ("op", ":")):
+            if parser.accept("op", ":"):
+                parser.expect("name")
+            parser.expect("op", ":=")
+            model["statements"].append(("var",
+                                        package,
+                                        value.lower(),
+                                        parser.until_semicolon(),
+                                        condition()))
+
+        else:
+            # Type declarations, null statements and anything we do not
+            # care about
+            parser.until_semicolon()
+
+    if model["name"] is None:
+        raise Parse_Error("no project declaration")
+    return model
+
+
+def init_worker():
+    global worker_lexer
+    worker_lexer = ada_pygments.GNATProjectLexer()
+
+
+def parse_file(file_name):
+    try:
+        with open(file_name, "r", encoding="UTF-8", errors="replace") as fd:
+            return parse(file_name, fd.read(), worker_lexer)
+    except Parse_Error as err:
+        return {"file"  : file_name,
+                "error" : str(err)}
+
+
+##############################################################################
+# Evaluation
+##############################################################################
+
+def applies(entry_condition, current_condition):
+    # A value assigned under some case alternatives applies to
+    # everything nested within them
+    return current_condition[:len(entry_condition)] == entry_condition
+
+
+def fmt_condition(condition):
+    return " and ".join("%s=%s" % case for case in condition)
+
+
+class Project:
+    def __init__(self, model):
+        self.model      = model
+        self.file       = model["file"]
+        self.name       = model["name"]
+        self.withs      = {}
+        self.extends    = None
+        self.variables  = {}    # (package, name) -> [(condition, value)]
+        self.attributes = {}    # (package, attribute, index) -> ditto
+        self.packages   = {}    # package -> None, or (how, project, package)
+        self.unresolved = []
+        self.evaluated  = False
+        self.evaluating = False
+
+
+class Evaluator:
+    def __init__(self, models):
+        self.projects = {model["file"]: Project(model)
+                         for model in models
+                         if "error" not in model}
+        self.by_name  = {}
+        for project in self.projects.values():
+            self.by_name.setdefault(project.name.lower(), []).append(project)
+
+    def find(self, project, path):
+        # The project a with or extends clause refers to
+        if not path.lower().endswith(".gpr"):
+            path += ".gpr"
+        path = os.path.normpath(os.path.join(os.path.dirname(project.file),
+                                             path))
+        if path in self.projects:
+            return self.projects[path]
+        # Not relative to the project, so presumably found through the
+        # project path; fall back to the project name if unique.
+        candidates = self.by_name.get(
+            os.path.splitext(os.path.basename(path))[0].lower(), [])
+        if len(candidates) == 1:
+            return candidates[0]
+        return None
+
+    def evaluate(self, project):
+        if project.evaluated:
+            return project
+        if project.evaluating:
+            raise Unresolved("circular dependency on %s" % project.name)
+        project.evaluating = True
+        try:
+            for path in project.model["withs"]:
+                other = self.find(project, path)
+                if other:
+                    project.withs[other.name.lower()] = other
+                else:
+                    project.unresolved.append("with \"%s\"" % path)
+            if project.model["extends"]:
+                project.extends = self.find(project, project.model["extends"])
+                if project.extends:
+                    try:
+                        self.evaluate(project.extends)
+                    except Unresolved as err:
+                        # A cycle of extends; go on as if the extended
+                        # project was not found.
+                        project.extends = None
+                        project.unresolved.append(str(err))
+                else:
+                    project.unresolved.append("extends \"%s\"" %
+                                              project.model["extends"])
+
+            for statement in project.model["statements"]:
+                try:
+                    self.execute(project, statement)
+                except Unresolved as err:
+                    project.unresolved.append(str(err))
+        finally:
+            # Otherwise every later lookup of the project would be a
+            # circular dependency
+            project.evaluating = False
+
+        project.evaluated = True
+        return project
+
+    def execute(self, project, statement):
+        if statement[0] == "package":
+            _, package, how, other = statement
+            if how is None:
+                project.packages[package] = None
+                return
+            other_project, other_package = self.package_ref(project, other)
+            project.packages[package] = (how, other_project, other_package)
+
+        elif statement[0] == "var":
+            _, package, name, tokens, condition = statement
+            value = self.expression(project, package, tokens, condition)
+            project.variables.setdefault((package, name), []).append(
+                (condition, value))
+
+        else:
+            _, package, attribute, index, tokens, condition = statement
+            if index is not None and attribute in ("default_switches",
+                                                   "proof_switches"):
+                # Languages are case insensitive
+                index = index.lower()
+            value = self.expression(project, package, tokens, condition)
+            entries = project.attributes.setdefault(
+                (package, attribute, index), [])
+            entries[:] = [entry for entry in entries
+                          if entry[0] != condition]
+            entries.append((condition, value))
+
+    def package_ref(self, project, name):
+        # Resolve Other_Project.Package
+        if "." not in name:
+            raise Unresolved("package %s" % name)
+        other, package = name.lower().rsplit(".", 1)
+        return self.evaluate(self.project_ref(project, other)), package
+
+    def project_ref(self, project, name):
+        if name in ("project", project.name.lower()):
+            return project
+        if name in project.withs:
+            return self.evaluate(project.withs[name])
+        if project.extends and name == project.extends.name.lower():
+            return project.extends
+        raise Unresolved("project %s" % name)
+
+    def chain(self, project, package):
+        # The (project, package) pairs to search, in order, for the
+        # variables and attributes of a package: the package itself,
+        # then what it renames or extends. A package that a project does
+        # not declare is inherited from the project it extends.
+        chain = []
+        while project:
+            if package is None:
+                chain.append((project, package))
+                project = project.extends
+            elif package not in project.packages:
+                project = project.extends
+            else:
+                chain.append((project, package))
+                if project.packages[package] is None:
+                    break
+                _, project, package = project.packages[package]
+        return chain
+
+    def lookup(self, table_name, project, key, condition):
+        for other, package in self.chain(project, key[0]):
+            entries = [value
+                       for entry_condition, value in
+                       getattr(other, table_name).get((package,) + key[1:],
+                                                      [])
+                       if applies(entry_condition, condition)]
+            if entries:
+                return entries[-1]
+        return None
+
+    def variable(self, project, package, name, condition):
+        # Name, Package.Name, Project.Name or Project.Package.Name
+        parts = name.lower().split(".")
+        candidates = []
+        if len(parts) == 1:
+            candidates = [(project, package, parts[0]),
+                          (project, None, parts[0])]
+        elif len(parts) == 2:
+            candidates = [(project, parts[0], parts[1])]
+            try:
+                candidates.append((self.project_ref(project, parts[0]),
+                                   None,
+                                   parts[1]))
+            except Unresolved:
+                pass
+        elif len(parts) == 3:
+            candidates = [(self.project_ref(project, parts[0]),
+                           parts[1],
+                           parts[2])]
+        for other, other_package, other_name in candidates:
+            value = self.lookup("variables",
+                                other,
+                                (other_package, other_name),
+                                condition)
+            if value is not None:
+                return value
+        raise Unresolved("variable %s" % name)
+
+    def attribute(self, project, package, prefix, attribute, index,
+                  condition):
+        # Package'Attribute, Project'Attribute or
+        # Project.Package'Attribute
+        parts = prefix.lower().split(".")
+        if len(parts) == 2:
+            other, other_package = self.project_ref(project, parts[0]), \
+                                   parts[1]
+        else:
+            try:
+                other, other_package = self.project_ref(project, parts[0]), \
+                                       None
+            except Unresolved:
+                other, other_package = project, parts[0]
+        if index is not None and attribute in ("default_switches",
+                                               "proof_switches"):
+            index = index.lower()
+        value = self.lookup("attributes",
+                            other,
+                            (other_package, attribute, index),
+                            condition)
+        if value is None:
+            if attribute in SWITCH_ATTRIBUTES:
+                # List attributes that were never set are empty
+                return []
+            raise Unresolved("attribute %s'%s" % (prefix, attribute))
+        return value
+
+    def expression(self, project, package, tokens, condition):
+        # Terms joined by &; a term is a string, a list of expressions,
+        # a variable, an attribute reference or external (name, default).
+        parser = Parser(tokens)
+
+        def term():
+            kind, value = parser.next()
+            if kind == "str":
+                return value
+            elif (kind, value) == ("op", "("):
+                items = []
+                if parser.accept("op", ")"):
+                    return items
+                while True:
+                    item = concatenation()
+                    items += item if isinstance(item, list) else [item]
+                    if parser.accept("op", ")"):
+                        return items
+                    parser.expect("op", ",")
+            elif (kind, value) in (("kw", "external"),
+                                   ("kw", "external_as_list")):
+                parser.expect("op", "(")
+                name    = parser.expect("str")
+                default = None
+                while parser.accept("op", ","):
+                    default = concatenation()
+                parser.expect("op", ")")
+                if default is None:
+                    raise Unresolved("external (\"%s\")" % name)
+                return default
+            elif kind in ("name", "kw"):
+                if parser.accept("op", "'"):
+                    attribute = parser.expect("name").lower()
+                    index     = None
+                    if parser.accept("op", "("):
+                        index = parser.expect("str")
+                        parser.expect("op", ")")
+                    return self.attribute(project, package, value,
+                                          attribute, index, condition)
+                return self.variable(project, package, value, condition)
+            raise Unresolved("expression at %s" % value)
+
+        def concatenation():
+            result = term()
+            while parser.accept("op", "&"):
+                value = term()
+                if isinstance(result, str) and isinstance(value, str):
+                    result += value
+                else:
+                    result = (result if isinstance(result, list)
+                              else [result]) + \
+                             (value if isinstance(value, list) else [value])
+            return result
+
+        try:
+            value = concatenation()
+            if parser.peek()[0] is not None:
+                raise Unresolved("expression at %s" % parser.peek()[1])
+        except Parse_Error as err:
+            raise Unresolved("expression: %s" % err)
+        return value
+
+    def effective_switches(self, project):
+        # package -> "Attribute (index)[ when condition]" -> switches
+        result   = {}
+        packages = set()
+        other    = project
+        while other:
+            packages.update(other.packages)
+            other = other.extends
+
+        for package in sorted(packages):
+            # An attribute set in a package replaces the value it would
+            # otherwise get from what the package extends.
+            values = {}
+            for other, other_package in reversed(self.chain(project,
+                                                            package)):
+                for key, entries in other.attributes.items():
+                    if key[0] == other_package and \
+                       key[1] in SWITCH_ATTRIBUTES:
+                        values[key[1:]] = entries
+
+            for (attribute, index), entries in sorted(
+                    values.items(),
+                    key=lambda item: (item[0][0], item[0][1] or "")):
+                for condition, value in entries:
+                    name = attribute.title()
+                    if index is not None:
+                        name += " (%s)" % index
+                    if condition:
+                        name += " when %s" % fmt_condition(condition)
+                    result.setdefault(package.title(), {})[name] = \
+                        value if isinstance(value, list) else [value]
+        return result
+
+
+##############################################################################
+# Policy
+##############################################################################
+
+def check_policy(report, constraints):
+    tries, required, _ = switches.mk_tries(constraints)
+    messages = []
+    for file_name, project in sorted(report["projects"].items()):
+        for package, attributes in sorted(project.get("switches",
+                                                      {}).items()):
+            tool = PACKAGE_TOOLS.get(package.lower())
+            if tool is None:
+                continue
+            for attribute, values in sorted(attributes.items()):
+                seen = set()
+                for value in values:
+                    arg_seen, banned = switches.classify(tries[tool],
+                                                         tool,
+                                                         value)
+                    seen |= arg_seen
+                    for switch, constraint in banned:
+                        messages.append(
+                            "%s: package %s, %s: banned switch %s (%s)" %
+                            (file_name,
+                             package,
+                             attribute,
+                             switch,
+                             constraint.location()))
+
+                # Required compiler switches must be in the Compiler
+                # package; the others may also come from the command
+                # line.
+                if tool != "GNAT_Compiler" or \
+                   not attribute.startswith("Default_Switches (ada)"):
+                    continue
+                for pattern, constraint in required[tool]:
+                    if pattern not in seen:
+                        messages.append(
+                            "%s: package %s, %s: missing required switch"
+                            " %s (%s)" %
+                            (file_name,
+                             package,
+                             attribute,
+                             pattern,
+                             constraint.location()))
+    return messages
+
+
+def main():
+    profiling.profile_script()
+
+    ap = argparse.ArgumentParser(
+        description="report the effective switches of GPR projects")
+    ap.add_argument("roots",
+                    nargs="+",
+                    metavar="DIRECTORY",
+                    help="source trees to scan for .gpr files")
+    ap.add_argument("-o", "--output",
+                    metavar="FILENAME",
+                    help="write the report here (default: stdout)")
+    ap.add_argument("--check",
+                    action="store_true",
+                    default=False,
+                    help="check the switches against the switch policy")
+    ap.add_argument("--switch-dir",
+                    default=switches.SWITCH_DIR,
+                    help="directory with the switch tables")
+    ap.add_argument("-j", "--jobs",
+                    type=int,
+                    default=os.cpu_count(),
+                    help="number of worker processes (default: %(default)s)")
+    options = ap.parse_args()
+
+    if options.jobs < 1:
+        ap.error("--jobs must be at least 1")
+
+    worklist = []
+    for root in options.roots:
+        for path, dirs, files in os.walk(root):
+            dirs[:] = sorted(dir_name
+                             for dir_name in dirs
+                             if not dir_name.startswith("."))
+            worklist += [os.path.normpath(os.path.join(path, file_name))
+                         for file_name in sorted(files)
+                         if file_name.lower().endswith(".gpr")]
+    # Overlapping roots find the same projects again
+    worklist = list(dict.fromkeys(worklist))
+
+    if options.jobs == 1 or len(worklist) <= 1:
+        init_worker()
+        models = list(map(parse_file, worklist))
+    else:
+        with multiprocessing.Pool(options.jobs, init_worker) as pool:
+            models = pool.map(parse_file, worklist, chunksize=16)
+
+    evaluator = Evaluator(models)
+    report    = {"projects" : {},
+                 "index"    : {}}
+    for model in models:
+        entry = {}
+        report["projects"][model["file"]] = entry
+        if "error" in model:
+            entry["errors"] = [model["error"]]
+            continue
+
+        project = evaluator.projects[model["file"]]
+        try:
+            evaluator.evaluate(project)
+        except Unresolved as err:
+            project.unresolved.append(str(err))
+        entry["name"]     = project.name
+        entry["extends"]  = project.extends.file if project.extends else None
+        entry["switches"] = evaluator.effective_switches(project)
+        if project.unresolved:
+            entry["unresolved"] = sorted(set(project.unresolved))
+
+        # The index: package -> switch -> projects using it. Each
+        # project comes once, so it is only added once per switch.
+        used = set((package, value)
+                   for package, attributes in entry["switches"].items()
+                   for values in attributes.values()
+                   for value in values)
+        for package, value in sorted(used):
+            report["index"].setdefault(package, {}) \
+                           .setdefault(value, []) \
+                           .append(model["file"])
+
+    content = json.dumps(report, indent=1, sort_keys=True) + "\n"
+    if options.output:
+        common.write_if_changed(options.output, content)
+    else:
+        sys.stdout.write(content)
+
+    if options.check:
+        messages = check_policy(
+            report,
+            switches.load_constraints(options.switch_dir))
+        for message in messages:
+            print(message, file=sys.stderr)
+        if messages:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
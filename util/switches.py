@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+#
+# Ada/SPARK ISO 26262 Process Tools
+# Copyright (C) 2026 NVIDIA CORPORATION & AFFILIATES
+#
+# This file is part of the NVIDIA SPARK ISO 26262 Process.
+#
+# The NVIDIA SPARK ISO 26262 Process Tools are free software: you can
+# redistribute them and/or modify them under the terms of the GNU
+# General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later
+# version.
+#
+# The NVIDIA SPARK ISO 26262 Process Tools are distributed in the hope
+# that they will be useful, but WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with the NVIDIA SPARK ISO 26262 Process Tools. If not, see
+# <https://www.gnu.org/licenses/>.
+
+
+# The switch policy tables in source/process. The name of each table
+# encodes the tool and the status of its switches, and each row has
+# the switches (one per line, optionally followed by a note) and the
+# justification.
+
+import os
+import re
+import csv
+import pickle
+import hashlib
+import tempfile
+
+SWITCH_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                          "..", "source", "process")
+
+# Snapshots of the loaded switch tables are cached here. Set
+# SWITCH_CACHE_DIR to an empty string to disable the cache.
+SWITCH_CACHE_DIR = os.environ.get(
+    "SWITCH_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                 "..", "build", "switch-cache"))
+
+TOOLS = ("GNAT_Compiler", "GNAT_Check", "SPARK")
+
+
+def mk_context(filename):
+    base = os.path.splitext(os.path.basename(filename))[0]
+    context = {
+        "tool"            : None,
+        "status"          : None,
+        "is_switch"       : True,
+        "warning_related" : False,
+    }
+    if base.startswith("compiler_"):
+        context["tool"]            = "GNAT_Compiler"
+        context["warning_related"] = "warning_" in base
+    elif base.startswith("gnatcheck_"):
+        context["tool"] = "GNAT_Check"
+    elif base.startswith("gnatprove_"):
+        context["tool"] = "SPARK"
+    else:
+        assert False
+    if base.endswith("_required"):
+        context["status"] = "Required"
+    elif base.endswith("_required_rules"):
+        context["status"] = "Required"
+        context["is_switch"] = False
+    elif base.endswith("_optional"):
+        context["status"] = "Allowed"
+    elif base.endswith("_banned"):
+        context["status"] = "Banned"
+    else:
+        assert False
+
+    return context
+
+
+def split_switch(mixed_switch):
+    # A switch may be followed by a note, e.g. "-o <file>"
+    try:
+        switch, switch_note = mixed_switch.split(" ", 1)
+    except ValueError:
+        switch      = mixed_switch
+        switch_note = None
+    return switch, switch_note
+
+
+def pattern_prefix(switch):
+    # Placeholders such as --RTS=<dir> or --subdirs=... stand for any
+    # value, so the pattern is what comes before them.
+    for placeholder in ("<", "..."):
+        switch = switch.split(placeholder, 1)[0]
+    return switch
+
+
+class Constraint:
+    def __init__(self, context, file_name, row, switches, justification):
+        assert isinstance(context, dict)
+        assert isinstance(file_name, str)
+        assert isinstance(row, int)
+        assert isinstance(switches, str)
+        assert isinstance(justification, str)
+
+        self.tool            = context["tool"]
+        self.status          = context["status"]
+        self.is_switch       = context["is_switch"]
+        self.warning_related = context["warning_related"]
+        self.file_name       = file_name
+        self.row             = row
+        self.switches        = [split_switch(mixed_switch)
+                                for mixed_switch in switches.splitlines()]
+        self.justification   = justification
+
+    def location(self):
+        return "%s, row %u" % (self.file_name, self.row)
+
+    def patterns(self):
+        # The switches that are checkable at all; some rows describe a
+        # whole class of switches in prose instead.
+        return [pattern_prefix(switch)
+                for switch, _ in self.switches
+                if not self.is_switch or switch.startswith("-")]
+
+
+def load_constraints(directory=SWITCH_DIR):
+    constraints = []
+    for file_name in sorted(os.listdir(directory)):
+        if not file_name.endswith(".csv"):
+            continue
+        context = mk_context(file_name)
+        with open(os.path.join(directory, file_name),
+                  "r",
+                  encoding="UTF-8") as fd:
+            for row, (switches, justification) in enumerate(csv.reader(fd),
+                                                            1):
+                constraints.append(Constraint(context,
+                                              file_name,
+                                              row,
+                                              switches,
+                                              justification))
+    return constraints
+
+
+def insert(trie, pattern, value):
+    node = trie
+    for char in pattern:
+        node = node.setdefault(char, {})
+    node.setdefault(None, []).append(value)
+
+
+def mk_tries(constraints):
+    # For each tool, a trie of all its switch patterns. Each node maps
+    # a character to the next node, and None to the constraints whose
+    # pattern ends there.
+    tries    = {tool: {} for tool in TOOLS}
+    required = {tool: [] for tool in TOOLS}
+    rules    = []
+    for constraint in constraints:
+        if not constraint.is_switch:
+            rules += [(rule, constraint) for rule in constraint.patterns()]
+            continue
+        for pattern in constraint.patterns():
+            insert(tries[constraint.tool], pattern, constraint)
+            if constraint.status == "Required":
+                required[constraint.tool].append((pattern, constraint))
+    return tries, required, rules
+
+
+def lookup(trie, switch):
+    # All (pattern, constraints) whose pattern is a prefix of the
+    # switch, the longest (most specific) pattern last
+    matches = []
+    node    = trie
+    for n, char in enumerate(switch):
+        node = node.get(char)
+        if node is None:
+            break
+        if None in node:
+            matches.append((switch[:n + 1], node[None]))
+    return matches
+
+
+def expand(tool, switch):
+    # Combined warning and style switches, such as -gnatwa.Xe, are
+    # short for one switch per letter (-gnatwa -gnatw.X -gnatwe).
+    if tool != "GNAT_Compiler" or switch[:6] not in ("-gnatw", "-gnaty"):
+        return [switch]
+    if switch[:6] == "-gnatw":
+        letters = re.findall(r"[._]?.", switch[6:])
+    else:
+        letters = re.findall(r"[0-9]+|[A-Za-z][0-9]*|.", switch[6:])
+    return [switch[:6] + letter for letter in letters] or [switch]
+
+
+def classify(trie, tool, arg):
+    # The patterns matching the argument (after expansion), and the
+    # banned (switch, constraint) pairs among them
+    seen   = set()
+    banned = []
+    for switch in expand(tool, arg):
+        matches = lookup(trie, switch)
+        seen.update(pattern for pattern, _ in matches)
+        if matches:
+            for constraint in matches[-1][1]:
+                if constraint.status == "Banned":
+                    banned.append((switch, constraint))
+    return seen, banned
+
+
+class Switch_Database:
+    # All constraints, indexed by tool, status and warning-relatedness,
+    # and the tries to find the constraints covering a switch.
+    def __init__(self, constraints):
+        assert isinstance(constraints, list)
+
+        self.constraints = constraints
+        self.index       = {}
+        for constraint in constraints:
+            key = (constraint.tool,
+                   constraint.status,
+                   constraint.warning_related)
+            self.index.setdefault(key, []).append(constraint)
+        self.tries, self.required, self.rules = mk_tries(constraints)
+
+    def select(self, tool=None, status=None, warning_related=None):
+        # The constraints with the given properties (None for any), in
+        # table order
+        assert tool is None or tool in TOOLS
+
+        selected = []
+        for (c_tool, c_status, c_warning), constraints in self.index.items():
+            if tool is not None and c_tool != tool:
+                continue
+            if status is not None and c_status != status:
+                continue
+            if warning_related is not None and c_warning != warning_related:
+                continue
+            selected += constraints
+        selected.sort(key=lambda constraint: (constraint.file_name,
+                                              constraint.row))
+        return selected
+
+    def status(self, tool, arg):
+        # For each switch the argument stands for, the most specific
+        # pattern covering it and its constraints, or (switch, None,
+        # []) if the policy does not mention the switch.
+        assert tool in TOOLS
+
+        if arg.startswith("+R"):
+            matches = [(pattern, constraint)
+                       for pattern, constraint in self.rules
+                       if constraint.tool == tool and
+                       pattern.lower() == arg[2:].lower()]
+            if matches:
+                return [(arg,
+                         matches[0][0],
+                         [constraint for _, constraint in matches])]
+            return [(arg, None, [])]
+
+        rv = []
+        for switch in expand(tool, arg):
+            matches = lookup(self.tries[tool], switch)
+            if matches:
+                rv.append((switch,) + matches[-1])
+            else:
+                rv.append((switch, None, []))
+        return rv
+
+
+def load_database(directory=SWITCH_DIR):
+    # Like Switch_Database(load_constraints(directory)), but the result
+    # is cached on disk and re-used as long as the tables (and this
+    # module) are unchanged.
+    if not SWITCH_CACHE_DIR:
+        return Switch_Database(load_constraints(directory))
+
+    content_key = hashlib.sha256()
+    with open(__file__, "rb") as fd:
+        content_key.update(hashlib.sha256(fd.read()).digest())
+    for file_name in sorted(os.listdir(directory)):
+        if file_name.endswith(".csv"):
+            content_key.update(file_name.encode("UTF-8") + b"\0")
+            with open(os.path.join(directory, file_name), "rb") as fd:
+                content_key.update(hashlib.sha256(fd.read()).digest())
+
+    slot_key = hashlib.sha256(os.path.abspath(directory).encode("UTF-8"))
+    cache_file = os.path.join(SWITCH_CACHE_DIR,
+                              slot_key.hexdigest() + ".pickle")
+
+    try:
+        with open(cache_file, "rb") as fd:
+            if pickle.load(fd) == content_key.hexdigest():
+                return pickle.load(fd)
+    except Exception:
+        # Missing, stale, or unreadable; in all cases we just load the
+        # tables again and overwrite it.
+        pass
+
+    database = Switch_Database(load_constraints(directory))
+
+    os.makedirs(SWITCH_CACHE_DIR, exist_ok=True)
+    handle, tmp_file = tempfile.mkstemp(dir=SWITCH_CACHE_DIR, suffix=".tmp")
+    with os.fdopen(handle, "wb") as fd:
+        pickle.dump(content_key.hexdigest(), fd)
+        pickle.dump(database, fd, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_file, cache_file)
+
+    return database
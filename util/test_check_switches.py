@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+#
+# Ada/SPARK ISO 26262 Process Tools
+# Copyright (C) 2026 NVIDIA CORPORATION & AFFILIATES
+#
+# This file is part of the NVIDIA SPARK ISO 26262 Process.
+#
+# The NVIDIA SPARK ISO 26262 Process Tools are free software: you can
+# redistribute them and/or modify them under the terms of the GNU
+# General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later
+# version.
+#
+# The NVIDIA SPARK ISO 26262 Process Tools are distributed in the hope
+# that they will be useful, but WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with the NVIDIA SPARK ISO 26262 Process Tools. If not, see
+# <https://www.gnu.org/licenses/>.
+
+
+# Tests for util/check-switches.py; run them with `make test`.
+
+import os
+import sys
+import tempfile
+import unittest
+import importlib.util
+
+UTIL_DIR = os.path.dirname(os.path.abspath(__file__))
+
+sys.path.insert(0, UTIL_DIR)
+spec = importlib.util.spec_from_file_location(
+    "check_switches",
+    os.path.join(UTIL_DIR, "check-switches.py"))
+check_switches = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(check_switches)
+
+import switches
+
+
+class Test_Find_Command(unittest.TestCase):
+    def find(self, command):
+        return check_switches.find_command(command.split())
+
+    def test_command_word(self):
+        self.assertEqual(self.find("gnatprove -P p.gpr"),
+                         ("SPARK", ["-P", "p.gpr"]))
+        self.assertEqual(self.find("/usr/bin/x86_64-elf-gcc-12 -c x.adb"),
+                         ("GNAT_Compiler", ["-c", "x.adb"]))
+
+    def test_after_operator(self):
+        self.assertEqual(self.find("cd obj && gnatcheck -P p.gpr | tee log"),
+                         ("GNAT_Check", ["-P", "p.gpr"]))
+        self.assertEqual(self.find("cd obj; gnatprove -U"),
+                         ("SPARK", ["-U"]))
+
+    def test_after_assignments(self):
+        self.assertEqual(self.find("A=1 B=obj/gnatprove gnatprove -U"),
+                         ("SPARK", ["-U"]))
+
+    def test_path_argument(self):
+        self.assertEqual(self.find("cd /opt/gnatprove && make"),
+                         (None, None))
+        self.assertEqual(self.find("gprbuild -P p.gpr obj/gnatprove/x.ali"),
+                         (None, None))
+        self.assertEqual(self.find("rm -rf obj/gcc || true"),
+                         (None, None))
+
+
+class Test_Check_Log(unittest.TestCase):
+    def check(self, log):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_name = os.path.join(tmp_dir, "build.log")
+            with open(file_name, "w", encoding="UTF-8") as fd:
+                fd.write(log)
+            check_switches.init_worker(
+                switches.load_constraints(switches.SWITCH_DIR), ())
+            return check_switches.check_batch(
+                list(check_switches.read_log(file_name)))
+
+    def test_path_argument(self):
+        self.assertEqual(self.check("cd /opt/gnatprove && make\n"
+                                    "ls obj/gnatprove/gnatprove.out\n"),
+                         [])
+
+    def test_invocation(self):
+        messages = self.check("cd /opt/gnatprove && gnatprove -P p.gpr\n")
+        self.assertTrue(messages)
+        for message in messages:
+            self.assertIn(":1: SPARK: missing required switch", message)
+
+
+if __name__ == "__main__":
+    unittest.main()
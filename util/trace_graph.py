@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+#
+# Ada/SPARK ISO 26262 Process Tools
+# Copyright (C) 2026 NVIDIA CORPORATION & AFFILIATES
+#
+# This file is part of the NVIDIA SPARK ISO 26262 Process.
+#
+# The NVIDIA SPARK ISO 26262 Process Tools are free software: you can
+# redistribute them and/or modify them under the terms of the GNU
+# General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later
+# version.
+#
+# The NVIDIA SPARK ISO 26262 Process Tools are distributed in the hope
+# that they will be useful, but WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with the NVIDIA SPARK ISO 26262 Process Tools. If not, see
+# <https://www.gnu.org/licenses/>.
+
+
+
+# The traceability data of the process as one graph: process steps,
+# ISO 26262 clauses (ISO_26262_Tracing), GNATprove assumptions and the
+# arguments tracing them (Tracing), and checklist items (Checklist).
+#
+# Every edge points from the thing that is traced to what traces it
+# further, ending at the process steps: a clause to its steps and to
+# the clauses it refers to (ref_steps, same_as), an assumption to its
+# arguments, an argument to its steps (or to the assumptions it defers
+# to), and a checklist item to its steps.
+
+import os
+import glob
+import sqlite3
+import collections
+
+from trlc.errors import Message_Handler
+from trlc import ast
+
+import common
+
+PROCESS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                           "..", "source", "process")
+
+# The kinds of nodes, and the kinds of nodes that count as traced
+# to the process by themselves
+KINDS      = ("step", "iso", "assumption", "argument", "item")
+PROCESS    = "Process_Assumptions"
+COVERAGE   = ("step", "process")
+
+
+class Node:
+    __slots__ = ("kind", "name", "label", "file_name", "line")
+
+    def __init__(self, kind, name, label, file_name, line):
+        assert isinstance(kind, str)
+        assert isinstance(name, str)
+        assert isinstance(label, str)
+        assert file_name is None or isinstance(file_name, str)
+        assert line is None or isinstance(line, int)
+
+        self.kind      = kind
+        self.name      = name
+        self.label     = label
+        self.file_name = file_name
+        self.line      = line
+
+    def location(self):
+        if self.file_name is None:
+            return "-"
+        return "%s:%u" % (self.file_name, self.line)
+
+
+class Edge:
+    __slots__ = ("source", "target", "kind")
+
+    def __init__(self, source, target, kind):
+        assert isinstance(source, int)
+        assert isinstance(target, int)
+        assert isinstance(kind, str)
+
+        self.source = source
+        self.target = target
+        self.kind   = kind
+
+
+class Trace_Graph:
+    def __init__(self):
+        self.nodes     = []
+        self.edges     = []
+        self.out_edges = []
+        self.in_edges  = []
+        self.ids       = {}
+        self.by_name   = collections.defaultdict(list)
+        self.by_kind   = collections.defaultdict(list)
+        self.untraced  = None
+
+    def add_node(self, kind, name, label=None, file_name=None, line=None):
+        # Returns the id of the node, adding it if it is new
+        key = (kind, name)
+        if key in self.ids:
+            return self.ids[key]
+        node_id = len(self.nodes)
+        self.nodes.append(Node(kind, name, label or name, file_name, line))
+        self.out_edges.append([])
+        self.in_edges.append([])
+        self.ids[key] = node_id
+        self.by_name[name.lower()].append(node_id)
+        self.by_kind[kind].append(node_id)
+        return node_id
+
+    def add_edge(self, source, target, kind):
+        edge_id = len(self.edges)
+        self.edges.append(Edge(source, target, kind))
+        self.out_edges[source].append(edge_id)
+        self.in_edges[target].append(edge_id)
+
+    def finish(self):
+        # Index, by kind, the nodes that do not lead to any process
+        # step, so that coverage queries need not search the graph.
+        traced = self.reachable([node_id
+                                 for kind in COVERAGE
+                                 for node_id in self.by_kind[kind]],
+                                self.in_edges,
+                                lambda edge: edge.source)
+        self.untraced = collections.defaultdict(list)
+        for node_id, node in enumerate(self.nodes):
+            if node_id not in traced and node.kind not in COVERAGE:
+                self.untraced[node.kind].append(node_id)
+
+    def find(self, spec):
+        # The nodes named spec, which may be qualified with the kind
+        # (e.g. assumption:SPARK_EXTERNAL)
+        kind, _, name = spec.rpartition(":")
+        return [node_id
+                for node_id in self.by_name.get(name.lower(), [])
+                if not kind or self.nodes[node_id].kind == kind]
+
+    def reachable(self, start, adjacency, follow):
+        # All nodes reachable from start (including start), each
+        # visited once
+        seen  = set(start)
+        queue = collections.deque(start)
+        while queue:
+            for edge_id in adjacency[queue.popleft()]:
+                node_id = follow(self.edges[edge_id])
+                if node_id not in seen:
+                    seen.add(node_id)
+                    queue.append(node_id)
+        return seen
+
+    def traces_to(self, node_ids):
+        # Everything that (directly or not) traces to the given nodes
+        return sorted(self.reachable(node_ids,
+                                     self.in_edges,
+                                     lambda edge: edge.source) -
+                      set(node_ids))
+
+    def traced_by(self, node_ids):
+        # Everything the given nodes (directly or not) trace to
+        return sorted(self.reachable(node_ids,
+                                     self.out_edges,
+                                     lambda edge: edge.target) -
+                      set(node_ids))
+
+    def export_sqlite(self, file_name):
+        tmp_file = "%s.%u.tmp" % (file_name, os.getpid())
+        if os.path.exists(tmp_file):
+            os.unlink(tmp_file)
+        db = sqlite3.connect(tmp_file)
+        try:
+            db.executescript("""
+                CREATE TABLE nodes (id        INTEGER PRIMARY KEY,
+                                    kind      TEXT NOT NULL,
+                                    name      TEXT NOT NULL,
+                                    label     TEXT NOT NULL,
+                                    file_name TEXT,
+                                    line      INTEGER,
+                                    traced    INTEGER NOT NULL);
+                CREATE TABLE edges (source INTEGER NOT NULL
+                                      REFERENCES nodes (id),
+                                    target INTEGER NOT NULL
+                                      REFERENCES nodes (id),
+                                    kind   TEXT NOT NULL);
+                CREATE INDEX nodes_by_name ON nodes (kind, name);
+                CREATE INDEX edges_by_source ON edges (source);
+                CREATE INDEX edges_by_target ON edges (target);
+            """)
+            untraced = {node_id
+                        for node_ids in self.untraced.values()
+                        for node_id in node_ids}
+            db.executemany("INSERT INTO nodes VALUES (?, ?, ?, ?, ?, ?, ?)",
+                           ((node_id,
+                             node.kind,
+                             node.name,
+                             node.label,
+                             node.file_name,
+                             node.line,
+                             int(node_id not in untraced))
+                            for node_id, node in enumerate(self.nodes)))
+            db.executemany("INSERT INTO edges VALUES (?, ?, ?)",
+                           ((edge.source, edge.target, edge.kind)
+                            for edge in self.edges))
+            db.commit()
+        finally:
+            db.close()
+        os.replace(tmp_file, file_name)
+
+
+def location(n_obj, root_dir):
+    return (os.path.relpath(n_obj.location.file_name, root_dir),
+            n_obj.location.line_no)
+
+
+def iso_label(n_obj):
+    # As in iso-tracing.py, e.g. "Part 6 - Section 5.4.1 a)"
+    ref = n_obj.field["ref"].value
+    rv  = "Part %u - Section %u" % (ref["part"].value, ref["chapter"].value)
+    for field in ("sec", "subsec", "subsubsec"):
+        if not isinstance(ref[field], ast.Integer_Literal):
+            break
+        rv += ".%u" % ref[field].value
+    if isinstance(n_obj.field["subref"], ast.String_Literal):
+        rv += " %s" % n_obj.field["subref"].value
+    return rv
+
+
+def references(n_obj, field):
+    # The names of the records or literals in an optional field
+    value = n_obj.field[field]
+    if isinstance(value, ast.Array_Aggregate):
+        items = value.value
+    elif isinstance(value, (ast.Implicit_Null, ast.Null_Literal)):
+        items = []
+    else:
+        items = [value]
+    return [item.target.name if isinstance(item, ast.Record_Reference)
+            else item.value.name
+            for item in items]
+
+
+def load(mh, process_dir=PROCESS_DIR):
+    # The packages cannot all be processed together (Tracing is both a
+    # package and a type), so each part is processed with the steps on
+    # its own, as the generators do.
+    root_dir  = os.path.join(process_dir, "..", "..")
+    steps_rsl = os.path.join(process_dir, "steps.rsl")
+    iso_dir   = os.path.join(process_dir, "tracing", "iso_26262")
+    spark_dir = os.path.join(process_dir, "tracing", "spark_assumptions")
+    check_dir = os.path.join(process_dir, "checklist")
+
+    parts = []
+    for file_names in (
+            [os.path.join(iso_dir, "tracing.rsl")] +
+            sorted(glob.glob(os.path.join(iso_dir, "*.trlc"))),
+            [os.path.join(spark_dir, file_name)
+             for file_name in ("spark-assumptions.rsl",
+                               "spark-assumptions.trlc",
+                               "tracing.rsl",
+                               "tracing.trlc")],
+            [os.path.join(check_dir, "checklist.rsl"),
+             os.path.join(check_dir, "worksheet.rsl")] +
+            sorted(glob.glob(os.path.join(check_dir, "*.trlc")))):
+        stab = common.process_trlc_files(mh, [steps_rsl] + file_names)
+        if stab is None:
+            return None
+        parts.append(stab)
+    stab_iso, stab_spark, stab_check = parts
+
+    graph = Trace_Graph()
+
+    step_index = common.load_step_index(os.path.join(process_dir,
+                                                     "steps.json")) or {}
+    enum_steps = stab_iso.lookup_assuming(mh, "Steps").symbols.\
+        lookup_assuming(mh, "ID")
+    for step in enum_steps.literals.all_names():
+        if step in step_index:
+            graph.add_node("step", step,
+                           file_name=os.path.relpath(
+                               os.path.join(process_dir,
+                                            step_index[step]["file"]),
+                               root_dir),
+                           line=step_index[step]["line"])
+        else:
+            graph.add_node("step", step)
+    process = graph.add_node("process", PROCESS)
+
+    def step(name):
+        return graph.ids[("step", name)]
+
+    # Nodes first, so that references can be resolved in any order
+    pkg_iso = stab_iso.lookup_assuming(mh, "ISO_26262_Tracing")
+    for n_obj in pkg_iso.symbols.iter_record_objects():
+        graph.add_node("iso", n_obj.name, iso_label(n_obj),
+                       *location(n_obj, root_dir))
+    pkg_asm = stab_spark.lookup_assuming(mh, "Gnatprove_Assumptions")
+    for n_obj in pkg_asm.symbols.iter_record_objects():
+        graph.add_node("assumption", n_obj.name, None,
+                       *location(n_obj, root_dir))
+
+    for n_obj in pkg_iso.symbols.iter_record_objects():
+        source = graph.ids[("iso", n_obj.name)]
+        for name in references(n_obj, "steps"):
+            graph.add_edge(source, step(name), "steps")
+        for field in ("ref_steps", "same_as"):
+            for name in references(n_obj, field):
+                graph.add_edge(source, graph.ids[("iso", name)], field)
+
+    pkg_arg = stab_spark.lookup_assuming(mh, "Tracing")
+    for n_obj in pkg_arg.symbols.iter_record_objects():
+        source = graph.add_node("argument", n_obj.name, None,
+                                *location(n_obj, root_dir))
+        graph.add_edge(graph.ids[("assumption",
+                                  n_obj.field["assumption"].target.name)],
+                       source,
+                       "argument")
+        for name in references(n_obj, "process"):
+            graph.add_edge(source, step(name), "process")
+        for name in references(n_obj, "deferred_to"):
+            graph.add_edge(source, graph.ids[("assumption", name)],
+                           "deferred_to")
+        if n_obj.to_python_dict()["via_process_assumptions"]:
+            graph.add_edge(source, process, "via_process_assumptions")
+
+    pkg_check = stab_check.lookup_assuming(mh, "Checklist")
+    for n_obj in pkg_check.symbols.iter_record_objects():
+        source = graph.add_node("item", n_obj.name, None,
+                                *location(n_obj, root_dir))
+        for field in ("step", "step_to", "step_also"):
+            for name in references(n_obj, field):
+                graph.add_edge(source, step(name), field)
+
+    graph.finish()
+    return graph
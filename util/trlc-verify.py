@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+#
+# Ada/SPARK ISO 26262 Process Tools
+# Copyright (C) 2026 NVIDIA CORPORATION & AFFILIATES
+#
+# This file is part of the NVIDIA SPARK ISO 26262 Process.
+#
+# The NVIDIA SPARK ISO 26262 Process Tools are free software: you can
+# redistribute them and/or modify them under the terms of the GNU
+# General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later
+# version.
+#
+# The NVIDIA SPARK ISO 26262 Process Tools are distributed in the hope
+# that they will be useful, but WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with the NVIDIA SPARK ISO 26262 Process Tools. If not, see
+# <https://www.gnu.org/licenses/>.
+
+
+
+# A drop-in for "trlc --verify FILE|DIR...". The generators verify the
+# files they parse anyway (see common.process_trlc_files), so usually
+# the outcome is already recorded and we just report it; otherwise we
+# verify the files ourselves.
+
+import os
+import re
+import sys
+import argparse
+
+import trlc.trlc
+from trlc.errors import Message_Handler
+
+import common
+import profiling
+
+
+def expand(items):
+    # The files trlc would register for these files and directories,
+    # in the same order
+    file_names = []
+    for item in items:
+        if not os.path.isdir(item):
+            file_names.append(item)
+            continue
+        for path, dirs, files in os.walk(item):
+            dirs.sort()
+            dirs[:] = [dir_name
+                       for dir_name in dirs
+                       if not re.match("^bazel-.*$", dir_name)]
+            for file_name in sorted(files):
+                if os.path.splitext(file_name)[1] in (".rsl", ".trlc"):
+                    file_names.append(os.path.join(path, file_name))
+    return file_names
+
+
+def main():
+    profiling.profile_script()
+
+    ap = argparse.ArgumentParser(
+        description="trlc --verify, re-using the generators' results")
+    ap.add_argument("items",
+                    nargs="*",
+                    default=["."],
+                    metavar="DIR|FILE")
+    options = ap.parse_args()
+
+    for item in options.items:
+        if not (os.path.isdir(item) or os.path.isfile(item)):
+            ap.error("%s is not a file or directory" % item)
+    file_names = expand(options.items)
+
+    result = common.load_verify_result(file_names)
+    if result is None and common.TRLC_CACHE_DIR and \
+       trlc.trlc.VCG_API_AVAILABLE:
+        # The messages are printed as we go
+        common.process_trlc_files_verified(Message_Handler(), file_names)
+        result = common.load_verify_result(file_names)
+        if result is not None:
+            result = ("",) + result[1:]
+
+    if result is None:
+        sys.argv = ["trlc", "--verify"] + options.items
+        sys.exit(trlc.trlc.main())
+
+    messages, summary, returncode = result
+    sys.stdout.write(messages)
+    print(summary)
+    sys.exit(returncode)
+
+
+if __name__ == "__main__":
+    main()
@@ -23,7 +23,9 @@
 import argparse
 import csv
 import os
+import re
 import sys
+import multiprocessing
 
 
 REPL = {
@@ -41,40 +43,69 @@ REPL = {
     "•" : "*",
 }
 
+TRANSLATION = str.maketrans(dict(REPL,
+                                 **{"\ufeff" : None,   # byte order mark
+                                    "\u200b" : None})) # zero width space
+
+# Anything that is left after translation, other than the characters
+# we explicitly allow, needs a human to look at it.
+UNPRINTABLE = re.compile("[^\x00-\x7fÜ]")
+
+# Extensions we look at when given a directory, and whether they are
+# csv files
+EXTENSIONS = {
+    ".md"   : False,
+    ".rst"  : False,
+    ".rsl"  : False,
+    ".trlc" : False,
+    ".csv"  : True,
+}
 
-def process(file_name, content):
-    complaints = set()
-    tmp = ""
-
-    for c in content:
-        if c.isascii():
-            pass
 
-        elif c in "Ü":
-            pass
+def process(content, complaints):
+    rv = content.translate(TRANSLATION)
+    complaints.update(UNPRINTABLE.findall(rv))
+    return rv
 
-        elif c == "\ufeff":
-            continue
 
-        elif c == "\u200b":
-            # zero width space
-            continue
+def process_text_file(input_file, output_file, complaints):
+    with open(input_file, "r", encoding="UTF-8") as fd:
+        content = process(fd.read(), complaints)
 
-        elif c in REPL:
-            c = REPL[c]
+    if not complaints:
+        with open(output_file, "w", encoding="UTF-8") as fd:
+            fd.write(content)
 
-        elif c not in complaints:
-            complaints.add(c)
-            print("unprintable", repr(c), ord(c), c)
-            c = ""
 
-        tmp += c
+def process_csv_file(input_file, output_file, complaints):
+    tmp_file = output_file + ".tmp"
+    with open(input_file, "r", encoding="UTF-8") as fd_in, \
+         open(tmp_file, "w", encoding="UTF-8") as fd_out:
+        writer = csv.writer(fd_out, lineterminator="\n")
+        for row in csv.reader(fd_in):
+            writer.writerow([process(item, complaints) for item in row])
 
     if complaints:
-        print("please fix %s or script to deal with the problems" % file_name)
-        sys.exit(1)
+        os.unlink(tmp_file)
+    else:
+        os.replace(tmp_file, output_file)
+
+
+def sanitise(job):
+    input_file, output_file, is_csv = job
+    complaints = set()
 
-    return tmp
+    if output_file == input_file:
+        with open(input_file, "rb") as fd:
+            if fd.read().isascii():
+                return complaints
+
+    if is_csv:
+        process_csv_file(input_file, output_file, complaints)
+    else:
+        process_text_file(input_file, output_file, complaints)
+
+    return complaints
 
 
 def main():
@@ -82,46 +113,66 @@ def main():
 
     ap.add_argument("-o",
                     metavar="FILENAME",
-                    help="output filename, otherwise overwrite input file")
-    ap.add_argument("input_file")
+                    help=("output filename, otherwise overwrite input file"
+                          " (only for a single input file)"))
+    ap.add_argument("inputs",
+                    nargs="+",
+                    metavar="input",
+                    help=("files to sanitise; directories are searched"
+                          " for %s files" % ", ".join(sorted(EXTENSIONS))))
     ap.add_argument("--csv",
                     action="store_true",
                     default=False,
-                    help="treat input as a csv file")
+                    help="treat input files as csv files")
+    ap.add_argument("-j", "--jobs",
+                    type=int,
+                    default=os.cpu_count(),
+                    help="number of worker processes (default: %(default)s)")
 
     options = ap.parse_args()
 
-    if not os.path.isfile(options.input_file):
-        ap.error("%s is not a file" % options.input_file)
-
-    if options.o and \
-       os.path.exists(options.o) and \
-       not os.path.isfile(options.o):
-        ap.error("output file %s already exists and is not a file" %
-                 options.o)
-
-    with open(options.input_file, "r", encoding="UTF-8") as fd:
-        if options.csv:
-            reader = csv.reader(fd)
-            content = [row for row in reader]
+    if options.jobs < 1:
+        ap.error("--jobs must be at least 1")
+
+    jobs = []
+    for item in options.inputs:
+        if os.path.isdir(item):
+            for path, dirs, files in os.walk(item):
+                dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+                for file_name in sorted(files):
+                    ext = os.path.splitext(file_name)[1]
+                    if ext in EXTENSIONS:
+                        file_name = os.path.join(path, file_name)
+                        jobs.append((file_name, file_name, EXTENSIONS[ext]))
+        elif os.path.isfile(item):
+            jobs.append((item, item, options.csv))
         else:
-            content = fd.read()
-
-    if options.csv:
-        content = [[process(options.input_file, item) for item in row]
-                   for row in content]
+            ap.error("%s is not a file or directory" % item)
+
+    if options.o:
+        if len(jobs) != 1 or jobs[0][0] != options.inputs[0]:
+            ap.error("-o can only be used with a single input file")
+        if os.path.exists(options.o) and not os.path.isfile(options.o):
+            ap.error("output file %s already exists and is not a file" %
+                     options.o)
+        jobs = [(jobs[0][0], options.o, jobs[0][2])]
+
+    if options.jobs == 1 or len(jobs) <= 1:
+        results = list(map(sanitise, jobs))
     else:
-        content = process(options.input_file, content)
-
-    with open(options.o if options.o else options.input_file,
-              "w",
-              encoding="UTF-8") as fd:
-        if options.csv:
-            writer = csv.writer(fd, lineterminator="\n")
-            for row in content:
-                writer.writerow(row)
-        else:
-            fd.write(content)
+        with multiprocessing.Pool(options.jobs) as pool:
+            results = pool.map(sanitise, jobs, chunksize=16)
+
+    ok = True
+    for (file_name, _, _), complaints in zip(jobs, results):
+        if complaints:
+            ok = False
+            for c in sorted(complaints):
+                print("unprintable", repr(c), ord(c), c)
+            print("please fix %s or script to deal with the problems" %
+                  file_name)
+
+    sys.exit(0 if ok else 1)
 
 
 if __name__ == "__main__":